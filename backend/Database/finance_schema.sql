@@ -29,6 +29,25 @@ CREATE TABLE preferences (
 );
 
 
+-- 3a. Receipt table (Metadata for content-addressed receipt files stored on disk)
+CREATE TABLE receipt (
+    receipt_id CHAR(64) PRIMARY KEY, -- SHA-256 hex digest of the file; also its storage key
+    content_type VARCHAR(100) NOT NULL,
+    size_bytes BIGINT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+
+-- 3b. ReceiptOwner table (Users who uploaded each receipt; only they can attach it to a transaction)
+CREATE TABLE receipt_owner (
+    receipt_id CHAR(64) NOT NULL,
+    user_id VARCHAR(50) NOT NULL,
+    PRIMARY KEY (receipt_id, user_id),
+    FOREIGN KEY (receipt_id) REFERENCES receipt(receipt_id),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+);
+
+
 -- 3. Transaction table (Core financial movements)
 CREATE TABLE transaction (
     transaction_id VARCHAR(50) PRIMARY KEY,
@@ -39,9 +58,16 @@ CREATE TABLE transaction (
     date DATE NOT NULL,
     category VARCHAR(50),
     description TEXT,
-    receipt_data LONGTEXT, -- Stores base64 encoded image or URL
+    receipt_id CHAR(64), -- Reference into the receipt store (file bytes live outside the table)
+    import_hash CHAR(64), -- Content hash of (date, amount, name) for rows created by a bulk import
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6), -- Delta-sync watermark
     FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
-    INDEX idx_user_type (user_id, type)
+    FOREIGN KEY (receipt_id) REFERENCES receipt(receipt_id),
+    INDEX idx_user_type (user_id, type),
+    INDEX idx_user_date_id (user_id, date, transaction_id), -- Keyset pagination and date-range scans
+    INDEX idx_user_category_date (user_id, category, date), -- Budget spend within a category window
+    INDEX idx_user_updated (user_id, updated_at), -- Rows changed since a sync watermark
+    UNIQUE KEY uq_user_import_hash (user_id, import_hash) -- Re-importing a statement skips known rows
 );
 
 
@@ -55,8 +81,10 @@ CREATE TABLE budget (
     start_date DATE NOT NULL,
     end_date DATE NOT NULL,
     is_exceeded BOOLEAN DEFAULT FALSE,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
-    INDEX idx_user_period (user_id, period)
+    INDEX idx_user_period (user_id, period),
+    INDEX idx_user_updated (user_id, updated_at)
 );
 
 
@@ -69,8 +97,10 @@ CREATE TABLE goal (
     target_amount DECIMAL(15, 2) NOT NULL,
     current_amount DECIMAL(15, 2) DEFAULT 0,
     deadline DATE,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
-    INDEX idx_user_deadline (user_id, deadline)
+    INDEX idx_user_deadline (user_id, deadline),
+    INDEX idx_user_updated (user_id, updated_at)
 );
 
 
@@ -94,8 +124,11 @@ CREATE TABLE notification (
     type ENUM('info', 'alert', 'budget_exceeded', 'goal_achieved') NOT NULL,
     is_read BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
-    INDEX idx_user_read (user_id, is_read)
+    INDEX idx_user_read_created (user_id, is_read, created_at), -- Unread counts and unread pages, index-only
+    INDEX idx_user_created (user_id, created_at),
+    INDEX idx_user_updated (user_id, updated_at)
 );
 
 
@@ -111,6 +144,19 @@ CREATE TABLE financial_overview (
 );
 
 
+-- 8a. MonthlyRollup table (Per-month aggregates kept current on every transaction write)
+CREATE TABLE monthly_rollup (
+    user_id VARCHAR(50) NOT NULL,
+    month DATE NOT NULL, -- First day of the month
+    type ENUM('expense', 'income') NOT NULL,
+    category VARCHAR(50) NOT NULL DEFAULT '', -- '' for uncategorized transactions
+    total_amount DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, type, category),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+);
+
+
 -- 9. Insight table (System-generated financial tips and observations)
 CREATE TABLE insight (
     insight_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -131,7 +177,36 @@ CREATE TABLE reminder (
     amount DECIMAL(15, 2) NOT NULL,
     due_date DATE NOT NULL,
     recurring ENUM('Monthly', 'Weekly', 'Yearly', 'One-time') NOT NULL,
+    due_day TINYINT UNSIGNED, -- Day of month monthly/yearly occurrences return to after a shorter month; NULL means due_date's day
+    next_fire_at DATETIME, -- Next due-soon/overdue check by the reminder scheduler; NULL when nothing is left to fire
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+    INDEX idx_user_due (user_id, due_date),
+    INDEX idx_next_fire (next_fire_at),
+    INDEX idx_user_updated (user_id, updated_at)
 );
 
+-- 11. SyncTombstone table (Deleted rows reported by the delta-sync endpoint)
+CREATE TABLE sync_tombstone (
+    tombstone_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL,
+    entity VARCHAR(20) NOT NULL, -- 'transaction', 'reminder', 'budget', 'goal' or 'notification'
+    entity_id VARCHAR(50) NOT NULL,
+    deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+    INDEX idx_user_deleted (user_id, deleted_at)
+);
+
+-- 12. TokenRevocation table (Logged-out tokens and per-user "revoke everything before" cutoffs)
+-- No foreign key: a deleted user's revocation must outlive the user row.
+CREATE TABLE token_revocation (
+    revocation_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL,
+    token_id VARCHAR(64), -- Set for a single revoked token (its jti)
+    revoked_before DATETIME(6), -- Set to revoke every token of the user issued before it (UTC)
+    expires_at DATETIME NOT NULL, -- UTC; after this every token the row covers has expired anyway
+    created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6), -- Workers re-read recent rows, which can commit out of id order
+    INDEX idx_expires (expires_at),
+    INDEX idx_created (created_at)
+);
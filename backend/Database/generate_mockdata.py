@@ -0,0 +1,664 @@
+"""Personal Finance and Budget Management System - Synthetic Data Generator
+
+Generates reproducible, realistic data for every table in finance_schema.sql:
+users with salary cycles, recurring bills and long-tail discretionary
+spending, optional receipts, budgets, goals, reminders, notifications, saved
+monthly reports and the financial_overview / monthly_rollup aggregates that
+match the generated transactions. Each user is generated from its own
+seeded random stream, so the same --seed and arguments give the same rows
+regardless of --workers.
+
+Write LOAD DATA files (fastest, needs local_infile enabled on the server):
+    python backend/Database/generate_mockdata.py --users 25000 --transactions-per-user 400 --out /tmp/pfbms-data --workers 8
+    mysql --local-infile=1 -u root -p personal_finance < /tmp/pfbms-data/load.sql
+
+Or insert directly (multi-row INSERTs, MYSQL_* environment variables as for the API):
+    python backend/Database/generate_mockdata.py --users 1000 --load
+
+Every generated user has the password of the users in mockdata.sql.
+"""
+
+import calendar
+import click
+from datetime import date, datetime, timedelta
+import hashlib
+from itertools import accumulate
+import json
+import math
+import multiprocessing
+import os
+import random
+
+# Same hash as mockdata.sql, so generated users can sign in with the same password
+DEFAULT_PASSWORD_HASH = 'scrypt:32768:8:1$NFZEfBLzHiQgm1Zf$905076c43b194870fe9ac579e43d01dbcdd52dd29d92b1b60f435b0136433a0db4bed05eb8003021d218c1e25ff72ae8acd698ce50bfd05c7e5289b2a9a22ced'
+
+# Columns written per table, in load order (parents before children)
+TABLE_COLUMNS = (
+    ('user', ('user_id', 'name', 'email', 'password_hash', 'created_at')),
+    ('preferences', ('user_id', 'currency', 'theme', 'notifications')),
+    ('receipt', ('receipt_id', 'content_type', 'size_bytes', 'created_at')),
+    ('receipt_owner', ('receipt_id', 'user_id')),
+    ('transaction', ('transaction_id', 'user_id', 'name', 'amount', 'type', 'date', 'category', 'description', 'receipt_id')),
+    ('budget', ('budget_id', 'user_id', 'category', 'amount', 'period', 'start_date', 'end_date', 'is_exceeded')),
+    ('goal', ('goal_id', 'user_id', 'name', 'target_amount', 'current_amount', 'deadline')),
+    ('report', ('report_id', 'user_id', 'type', 'data', 'created_at')),
+    ('notification', ('user_id', 'content', 'type', 'is_read', 'created_at')),
+    ('financial_overview', ('user_id', 'total_income', 'total_expenses', 'net_worth')),
+    ('monthly_rollup', ('user_id', 'month', 'type', 'category', 'total_amount', 'transaction_count')),
+    ('reminder', ('reminder_id', 'user_id', 'title', 'category', 'description', 'amount', 'due_date', 'recurring', 'due_day', 'next_fire_at')),
+)
+
+FIRST_NAMES = (
+    'Ava', 'Liam', 'Maya', 'Noah', 'Zara', 'Ethan', 'Priya', 'Lucas', 'Elara', 'Mateo', 'Chloe', 'Omar',
+    'Hana', 'Leo', 'Isla', 'Kai', 'Nora', 'Ravi', 'Sofia', 'Jonah', 'Amara', 'Felix', 'Lina', 'Zackary',
+)
+LAST_NAMES = (
+    'Nguyen', 'Garcia', 'Smith', 'Patel', 'Kim', 'Johnson', 'Okafor', 'Muller', 'Rossi', 'Tanaka',
+    'Silva', 'Brown', 'Cohen', 'Haddad', 'Larsen', 'Lopez', 'Novak', 'Singh', 'Walker', 'Young',
+)
+EMPLOYERS = ('Acme Corp', 'Globex', 'Initech', 'Northwind', 'Umbrella Health', 'City Schools', 'Stark Industries', 'Hooli')
+CURRENCIES = (('USD', 70), ('EUR', 15), ('GBP', 8), ('CAD', 4), ('INR', 3))
+
+# (category, weight, median amount in cents, spread, merchants). Weights are
+# re-drawn per user around these, so each user has their own spending mix.
+DISCRETIONARY_CATEGORIES = (
+    ('Groceries', 30, 6500, 0.6, ('Whole Foods', "Trader Joe's", 'Safeway', 'Costco', 'Aldi', 'Kroger')),
+    ('Food', 24, 1800, 0.7, ('Starbucks', 'Chipotle', 'Corner Diner', 'Sushi Bar', 'Pizza Place', 'Food Truck')),
+    ('Transport', 14, 2500, 0.8, ('Uber', 'Lyft', 'Shell', 'Chevron', 'Metro Card', 'City Parking')),
+    ('Shopping', 10, 4500, 1.0, ('Amazon', 'Target', 'Walmart', 'Best Buy', 'IKEA', 'Etsy')),
+    ('Entertainment', 7, 3000, 0.8, ('AMC Theatres', 'Steam', 'Ticketmaster', 'Bowling Alley', 'Museum')),
+    ('Health', 4, 4000, 1.0, ('CVS Pharmacy', 'Walgreens', 'Dental Care', 'Urgent Care')),
+    ('Personal Care', 3, 3500, 0.7, ('Hair Salon', 'Barber Shop', 'Sephora', 'Spa')),
+    ('Travel', 2, 25000, 1.0, ('Delta Airlines', 'Airbnb', 'Marriott', 'Amtrak', 'Hertz')),
+    ('Gifts', 2, 5000, 0.9, ('Gift Shop', 'Florist', 'Amazon Gift')),
+    ('Education', 1.5, 8000, 1.0, ('Coursera', 'Bookstore', 'Udemy')),
+    ('Pets', 1.5, 4000, 0.8, ('Petco', 'Vet Clinic', 'Chewy')),
+    ('Home Improvement', 1, 9000, 1.1, ('Home Depot', "Lowe's", 'Hardware Store')),
+    ('Charity', 0.7, 5000, 0.8, ('Red Cross', 'Food Bank', 'Local Shelter')),
+    ('Fees', 0.5, 1500, 0.6, ('Bank Fee', 'ATM Fee', 'Late Fee')),
+    ('Other', 0.3, 2500, 1.0, ('Misc Purchase',)),
+)
+# Rare per-user hobby categories that make up the long tail
+HOBBY_CATEGORIES = (
+    'Photography', 'Cycling', 'Gaming', 'Gardening', 'Music Lessons', 'Crafts', 'Board Games',
+    'Climbing', 'Coffee Beans', 'Wine', 'Fishing', 'Golf', 'Skiing', 'Model Trains', 'Pottery',
+)
+SUBSCRIPTIONS = (('Netflix', 1549), ('Spotify', 1099), ('Disney+', 1399), ('iCloud', 299), ('NYT', 1700), ('Gym Membership', 4500))
+GOAL_NAMES = (
+    'Emergency Fund', 'Vacation', 'New Car', 'Home Downpayment', 'Wedding', 'New Laptop',
+    'Retirement Boost', 'Education Fund', 'Home Renovation',
+)
+REMINDER_DUE_SOON_DAYS = 7  # As in flask_api.py
+
+def cents_to_str(cents):
+    return f"{cents // 100}.{cents % 100:02d}"
+
+def format_usd(cents):
+    return f"${cents / 100:,.2f}"
+
+def random_id(rng, prefix=''):
+    """A uuid4-shaped id drawn from rng, so ids are reproducible but spread like the API's."""
+    h = f"{rng.getrandbits(128):032x}"
+    return f"{prefix}{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+def month_starts(start, end):
+    """First days of every month from start's month to end's month."""
+    months = []
+    current = start.replace(day=1)
+    while current <= end:
+        months.append(current)
+        current = (current + timedelta(days=32)).replace(day=1)
+    return months
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def receipt_pdf(merchant, amount, day, tag):
+    """
+    A small, valid one-page PDF receipt, so receipt downloads work when
+    --receipt-dir is given. `tag` goes in a comment to make every file unique.
+    """
+    def pdf_text(value):
+        return value.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    lines = (merchant, day.isoformat(), f"TOTAL {format_usd(amount)}")
+    stream = 'BT /F1 12 Tf ' + ' '.join(
+        f"1 0 0 1 12 {90 - 30 * i} Tm ({pdf_text(line)}) Tj" for i, line in enumerate(lines)
+    ) + ' ET'
+    objects = (
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        '<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 240 120] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>',
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        '<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>',
+    )
+    pdf = f"%PDF-1.4\n% {tag}\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    pdf += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return pdf.encode('latin-1', errors='replace')
+
+
+class UserGenerator:
+    """Generates one user's rows from a random stream seeded by (seed, user index)."""
+
+    def __init__(self, options, index, write):
+        self.options = options
+        self.index = index
+        self.write = write
+        self.rng = random.Random(f"{options['seed']}-{index}")
+        self.end = options['end_date']
+        self.months = month_starts(add_months(self.end.replace(day=1), 1 - options['months']), self.end)
+        self.start = self.months[0]
+        self.rollups = {}  # (month, type, category) -> [cents, count]
+        self.biggest = {}  # month -> (cents, transaction dict) of the largest expense
+        self.transaction_count = 0
+
+    def generate(self):
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        self.user_id = random_id(rng)
+        created = datetime.combine(self.start - timedelta(days=rng.randrange(1, 60)), datetime.min.time())
+        created += timedelta(seconds=rng.randrange(86400))
+        self.write('user', (
+            self.user_id, f"{first} {last}", f"{first.lower()}.{last.lower()}.{self.index}@example.com",
+            self.options['password_hash'], created.isoformat(' '),
+        ))
+        self.write('preferences', (
+            self.user_id,
+            rng.choices([c for c, _ in CURRENCIES], [w for _, w in CURRENCIES])[0],
+            'dark' if rng.random() < 0.35 else 'light',
+            int(rng.random() < 0.85),
+        ))
+
+        self.plan_income()
+        self.plan_bills()
+        self.plan_spending()
+        self.generate_transactions()
+        budgets = self.generate_budgets()
+        self.generate_goals()
+        self.generate_reminders()
+        self.generate_notifications(budgets)
+        self.generate_reports()
+        self.generate_aggregates()
+        return self.transaction_count
+
+    # --- Plans ---
+
+    def plan_income(self):
+        rng = self.rng
+        annual = max(18000, rng.lognormvariate(math.log(60000), 0.5))
+        self.employer = rng.choice(EMPLOYERS)
+        self.pay_cycle = rng.choices(('monthly', 'biweekly', 'semimonthly'), (35, 45, 20))[0]
+        periods = {'monthly': 12, 'biweekly': 26, 'semimonthly': 24}[self.pay_cycle]
+        self.paycheck = int(annual * 0.75 / periods * 100)  # Net of tax, in cents
+        self.monthly_income = self.paycheck * periods // 12
+        self.payday = rng.choice((1, 15, 25, 28))
+        self.side_income_rate = rng.choice((0, 0, 0, 0.5, 1.5))  # Freelance payments per month
+
+    def plan_bills(self):
+        """Recurring bills as (name, category, cents, day of month, month of year or None, varies)."""
+        rng = self.rng
+        bills = [('Rent Payment', 'Housing', int(self.monthly_income * rng.uniform(0.22, 0.38)), rng.randint(1, 3), None, False)]
+        bills.append(('Electric Bill', 'Utilities', rng.randint(6000, 18000), rng.randint(5, 25), None, True))
+        bills.append(('Internet', 'Utilities', rng.choice((4999, 6499, 7999)), rng.randint(5, 25), None, False))
+        bills.append(('Phone Plan', 'Utilities', rng.choice((3500, 5500, 8000)), rng.randint(5, 25), None, False))
+        for name, cents in rng.sample(SUBSCRIPTIONS, rng.randint(0, 4)):
+            bills.append((name, 'Subscriptions', cents, rng.randint(1, 28), None, False))
+        if rng.random() < 0.6:
+            bills.append(('Car Insurance', 'Insurance', rng.randint(40000, 120000), rng.randint(1, 28), rng.randint(1, 12), False))
+        if rng.random() < 0.4:
+            bills.append(('Student Loan Payment', 'Debt', rng.randint(15000, 60000), rng.randint(1, 28), None, False))
+        self.bills = bills
+
+    def plan_spending(self):
+        rng = self.rng
+        categories = [
+            (category, weight * rng.gammavariate(2.0, 0.5), median, spread, merchants)
+            for category, weight, median, spread, merchants in DISCRETIONARY_CATEGORIES
+        ]
+        for hobby in rng.sample(HOBBY_CATEGORIES, rng.randint(0, 3)):
+            categories.append((hobby, rng.uniform(0.2, 1.5), rng.randint(1500, 12000), 0.9, (f"{hobby} Shop",)))
+        self.categories = categories
+        self.cum_weights = list(accumulate(weight for _, weight, _, _, _ in categories))
+        recurring_per_month = len([bill for bill in self.bills if bill[4] is None]) + 2
+        # Per-user volume: lognormal around the requested mean (mu chosen so the mean is preserved)
+        volume = rng.lognormvariate(-0.125, 0.5) * self.options['transactions_per_user']
+        self.spending_per_month = max(3.0, volume / len(self.months) - recurring_per_month)
+
+    # --- Transactions ---
+
+    def add_transaction(self, day, name, cents, kind, category, description=None, receipt_id=None):
+        transaction_id = random_id(self.rng, 'txn-')
+        self.write('transaction', (
+            transaction_id, self.user_id, name, cents_to_str(cents), kind, day.isoformat(),
+            category, description, receipt_id,
+        ))
+        self.transaction_count += 1
+        month = day.replace(day=1)
+        entry = self.rollups.get((month, kind, category))
+        if entry is None:
+            self.rollups[(month, kind, category)] = [cents, 1]
+        else:
+            entry[0] += cents
+            entry[1] += 1
+        if kind == 'expense' and cents > self.biggest.get(month, (0,))[0]:
+            self.biggest[month] = (cents, {
+                'id': transaction_id, 'name': name, 'amount': cents / 100, 'category': category,
+                'date': day.isoformat(), 'description': description,
+            })
+
+    def paydays(self):
+        rng = self.rng
+        if self.pay_cycle == 'biweekly':
+            day = self.start + timedelta(days=rng.randrange(14))
+            while day <= self.end:
+                yield day
+                day += timedelta(days=14)
+            return
+        for month in self.months:
+            last_day = calendar.monthrange(month.year, month.month)[1]
+            days = (1, 15) if self.pay_cycle == 'semimonthly' else (min(self.payday, last_day),)
+            for day_of_month in days:
+                day = month.replace(day=day_of_month)
+                if day <= self.end:
+                    yield day
+
+    def generate_transactions(self):
+        rng = self.rng
+        for day in self.paydays():
+            years = (day - self.start).days // 365  # Paychecks step up ~3% a year
+            cents = int(self.paycheck * (1.03 ** years) * rng.uniform(0.99, 1.01))
+            self.add_transaction(day, f"{self.employer} Payroll", cents, 'income', 'Salary', 'Direct deposit')
+
+        receipt_rate = self.options['receipt_rate']
+        for month in self.months:
+            last_day = calendar.monthrange(month.year, month.month)[1]
+            days = min(last_day, (self.end - month).days + 1)
+            label = month.strftime('%B %Y')
+
+            for name, category, cents, day_of_month, month_of_year, varies in self.bills:
+                if month_of_year is not None and month.month != month_of_year:
+                    continue
+                if day_of_month > days:
+                    continue
+                if varies:
+                    seasonal = 1 + 0.25 * math.cos((month.month - 1) / 12 * 2 * math.pi)  # Peaks in winter
+                    cents = int(cents * seasonal * rng.uniform(0.85, 1.15))
+                self.add_transaction(month.replace(day=day_of_month), name, cents, 'expense', category, f"{label} {name.lower()}")
+
+            for _ in range(int(rng.random() * 2 * self.side_income_rate + 0.5)):
+                day = month.replace(day=rng.randint(1, days))
+                self.add_transaction(day, 'Freelance Payment', int(rng.lognormvariate(math.log(60000), 0.7)), 'income', 'Side Hustle')
+
+            # Poisson-distributed count (normal approximation), scaled to the part of the month generated
+            expected = self.spending_per_month * days / last_day
+            count = max(0, round(rng.gauss(expected, math.sqrt(expected))))
+            picks = rng.choices(self.categories, cum_weights=self.cum_weights, k=count)
+            for category, _, median, spread, merchants in picks:
+                day = month.replace(day=rng.randint(1, days))
+                merchant = rng.choice(merchants)
+                cents = max(100, int(rng.lognormvariate(math.log(median), spread)))
+                receipt_id = None
+                if receipt_rate and rng.random() < receipt_rate:
+                    receipt_id = self.add_receipt(merchant, cents, day)
+                self.add_transaction(day, merchant, cents, 'expense', category, None, receipt_id)
+
+    def add_receipt(self, merchant, cents, day):
+        content = receipt_pdf(merchant, cents, day, f"{self.user_id} {self.transaction_count}")
+        receipt_id = hashlib.sha256(content).hexdigest()
+        receipt_dir = self.options['receipt_dir']
+        if receipt_dir:
+            # Same layout as ReceiptStore.path_for
+            path = os.path.join(receipt_dir, receipt_id[:2], receipt_id[2:4], receipt_id)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(content)
+        self.write('receipt', (receipt_id, 'application/pdf', len(content), f"{day.isoformat()} 12:00:00"))
+        self.write('receipt_owner', (receipt_id, self.user_id))
+        return receipt_id
+
+    # --- Other tables ---
+
+    def category_spend(self, month, category):
+        return self.rollups.get((month, 'expense', category), (0, 0))[0]
+
+    def generate_budgets(self):
+        """Monthly budgets for the user's biggest discretionary categories, sized near typical spend."""
+        rng = self.rng
+        totals = {}
+        for (month, kind, category), (cents, _) in self.rollups.items():
+            if kind == 'expense' and category not in ('Housing', 'Subscriptions', 'Insurance', 'Debt'):
+                totals[category] = totals.get(category, 0) + cents
+        top = sorted(totals, key=totals.get, reverse=True)[:rng.randint(2, 6)]
+        current = self.months[-1]
+        budgets = []
+        for category in top:
+            typical = totals[category] / len(self.months)
+            cents = max(1000, int(typical * rng.uniform(0.8, 1.3)) // 500 * 500)
+            budgets.append((category, cents))
+            self.write('budget', (
+                random_id(rng, 'budget-'), self.user_id, category, cents_to_str(cents), 'monthly',
+                self.start.isoformat(), add_months(current, 12).isoformat(),
+                int(self.category_spend(current, category) > cents),
+            ))
+        if rng.random() < 0.3:
+            yearly = max(20000, int(totals.get('Travel', 0) * rng.uniform(0.9, 1.5)))
+            self.write('budget', (
+                random_id(rng, 'budget-'), self.user_id, 'Travel', cents_to_str(yearly), 'yearly',
+                date(self.end.year, 1, 1).isoformat(), date(self.end.year, 12, 31).isoformat(), 0,
+            ))
+        return budgets
+
+    def generate_goals(self):
+        rng = self.rng
+        self.achieved_goals = []
+        for name in rng.sample(GOAL_NAMES, rng.randint(1, 4)):
+            target = int(rng.lognormvariate(math.log(800000), 0.9)) // 10000 * 10000 + 10000
+            progress = min(1.0, rng.betavariate(1.5, 1.5) * 1.2)
+            current = int(target * progress)
+            deadline = self.end + timedelta(days=rng.randint(-180, 1100)) if rng.random() < 0.85 else None
+            if current >= target:
+                self.achieved_goals.append((name, target))
+            self.write('goal', (
+                random_id(rng, 'goal-'), self.user_id, name, cents_to_str(target), cents_to_str(current),
+                deadline.isoformat() if deadline else None,
+            ))
+
+    def generate_reminders(self):
+        """One reminder per recurring bill (rolled forward like the scheduler does), plus a few one-offs."""
+        rng = self.rng
+        self.due_soon = []
+        reminders = []
+        for name, category, cents, day_of_month, month_of_year, _ in self.bills:
+            if category == 'Subscriptions' and rng.random() < 0.6:
+                continue
+            step = 12 if month_of_year is not None else 1
+            # Step from the 1st so the bill keeps its day of month (due_day) through shorter months
+            first = self.end.replace(day=1)
+            if month_of_year is not None:
+                first = add_months(first, (month_of_year - self.end.month) % 12)
+            while True:
+                due = first.replace(day=min(day_of_month, calendar.monthrange(first.year, first.month)[1]))
+                if due >= self.end:
+                    break
+                first = add_months(first, step)
+            reminders.append((name, category, cents, due, day_of_month, 'Yearly' if step == 12 else 'Monthly'))
+        if rng.random() < 0.5:
+            due = date(self.end.year + (self.end.month > 4), 4, 15)
+            reminders.append(('Tax Filing', 'Taxes', rng.randint(0, 200000), due, None, 'One-time'))
+        if rng.random() < 0.3:
+            due = self.end + timedelta(days=rng.randint(1, 200))
+            reminders.append(('Car Registration', 'Transport', rng.randint(5000, 30000), due, due.day, 'Yearly'))
+
+        for title, category, cents, due, due_day, recurring in reminders:
+            if (due - self.end).days <= REMINDER_DUE_SOON_DAYS:
+                next_fire = due + timedelta(days=1)
+                self.due_soon.append((title, cents, due))
+            else:
+                next_fire = due - timedelta(days=REMINDER_DUE_SOON_DAYS)
+            self.write('reminder', (
+                random_id(rng, 'rem-'), self.user_id, title, category, f"{recurring} {title.lower()}",
+                cents_to_str(cents), due.isoformat(), recurring, due_day, f"{next_fire.isoformat()} 00:00:00",
+            ))
+
+    def generate_notifications(self, budgets):
+        rng = self.rng
+        read_before = self.end - timedelta(days=14)
+
+        def notify(content, kind, day):
+            at = datetime.combine(day, datetime.min.time()) + timedelta(seconds=rng.randrange(8 * 3600, 21 * 3600))
+            is_read = (day < read_before and rng.random() < 0.95) or rng.random() < 0.3
+            self.write('notification', (self.user_id, content, kind, int(is_read), at.isoformat(' ')))
+
+        for month in self.months:
+            for category, cents in budgets:
+                spent = self.category_spend(month, category)
+                if spent > cents:
+                    day = min(self.end, add_months(month, 1) - timedelta(days=rng.randint(1, 10)))
+                    pct = round(spent / cents * 100)
+                    notify(f"You have used {pct}% of your {category} budget ({format_usd(cents)} limit).", 'budget_exceeded', day)
+            if month != self.months[-1] and rng.random() < 0.5:
+                income = sum(entry[0] for (m, kind, _), entry in self.rollups.items() if m == month and kind == 'income')
+                expenses = sum(entry[0] for (m, kind, _), entry in self.rollups.items() if m == month and kind == 'expense')
+                if income > expenses:
+                    notify(f"You saved {format_usd(income - expenses)} this month! 🎉", 'info', add_months(month, 1))
+        for name, target in self.achieved_goals:
+            notify(f"Goal achieved: {name} reached its target of {cents_to_str(target)}",
+                   'goal_achieved', self.end - timedelta(days=rng.randint(0, 120)))
+        for title, cents, due in self.due_soon:
+            days = (due - self.end).days
+            label = 'is due today' if days == 0 else f"is due in {days} day{'' if days == 1 else 's'}"
+            notify(f"{title} ({format_usd(cents)}) {label}.", 'alert', self.end)
+
+    def generate_reports(self):
+        """Saved 'monthly_summary' reports in the shape POST /api/reports/monthly/<month> stores."""
+        rng = self.rng
+        completed = self.months[:-1]
+        for month in completed[-self.options['report_months']:]:
+            if rng.random() < 0.4:
+                continue
+            previous = add_months(month, -1)
+            totals = {}
+            categories = {}
+            for (m, kind, category), (cents, _) in self.rollups.items():
+                if m in (month, previous):
+                    totals[(m, kind)] = totals.get((m, kind), 0) + cents
+                if m == month and kind == 'expense':
+                    categories[category or 'Uncategorized'] = categories.get(category or 'Uncategorized', 0) + cents
+            savings = totals.get((month, 'income'), 0) - totals.get((month, 'expense'), 0)
+            previous_savings = totals.get((previous, 'income'), 0) - totals.get((previous, 'expense'), 0)
+            breakdown = {category: cents / 100 for category, cents in sorted(categories.items(), key=lambda item: item[1], reverse=True)}
+            biggest = self.biggest.get(month, (0, None))[1]
+            summary = {
+                'income': totals.get((month, 'income'), 0) / 100,
+                'expenses': totals.get((month, 'expense'), 0) / 100,
+                'savings': savings / 100,
+                'categories': breakdown,
+                'biggest': biggest,
+                'trend': (savings - previous_savings) / 100,
+            }
+            data = {'month': month.strftime('%Y-%m'), 'summary': summary, 'categoryBreakdown': breakdown, 'biggestExpense': biggest}
+            created = datetime.combine(add_months(month, 1), datetime.min.time()) + timedelta(hours=rng.randint(8, 20))
+            self.write('report', (f"report-{random_id(rng)}", self.user_id, 'monthly_summary', json.dumps(data), created.isoformat(' ')))
+
+    def generate_aggregates(self):
+        """financial_overview and monthly_rollup exactly as the API maintains them for these transactions."""
+        income = expenses = 0
+        for (month, kind, category), (cents, count) in sorted(self.rollups.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or '')):
+            if kind == 'income':
+                income += cents
+            else:
+                expenses += cents
+            self.write('monthly_rollup', (self.user_id, month.isoformat(), kind, category or '', cents_to_str(cents), count))
+        self.write('financial_overview', (self.user_id, cents_to_str(income), cents_to_str(expenses), cents_to_str(income - expenses)))
+
+
+# ==================== OUTPUT ====================
+
+def tsv_field(value):
+    """One field in MySQL's default LOAD DATA format (tab separated, backslash escapes, \\N for NULL)."""
+    if value is None:
+        return '\\N'
+    value = str(value)
+    if '\\' in value or '\t' in value or '\n' in value:
+        value = value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return value
+
+
+class TsvWriter:
+    """Writes each table's rows of one part to <out>/<table>.<part>.tsv."""
+
+    def __init__(self, out_dir, part):
+        self.out_dir = out_dir
+        self.part = part
+        self.files = {}
+        self.counts = {}
+
+    def write(self, table, row):
+        f = self.files.get(table)
+        if f is None:
+            f = self.files[table] = open(os.path.join(self.out_dir, f"{table}.{self.part:05d}.tsv"), 'w', encoding='utf-8', newline='\n')
+            self.counts[table] = 0
+        f.write('\t'.join(map(tsv_field, row)) + '\n')
+        self.counts[table] += 1
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        return self.counts
+
+
+class InsertWriter:
+    """
+    Buffers rows per table and inserts them batch_size at a time with
+    executemany, which PyMySQL sends as multi-row INSERT statements.
+    Foreign key and unique checks are off for the session, as for a dump load.
+    """
+
+    def __init__(self, batch_size):
+        import pymysql  # Only needed for --load
+        self.connection = pymysql.connect(
+            host=os.getenv('MYSQL_HOST', 'localhost'),
+            user=os.getenv('MYSQL_USER', 'root'),
+            password=os.getenv('MYSQL_PASSWORD', 'password'),
+            database=os.getenv('MYSQL_DB', 'personal_finance'),
+            charset='utf8mb4',
+            autocommit=False,
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        self.batch_size = batch_size
+        self.buffers = {table: [] for table, _ in TABLE_COLUMNS}
+        self.statements = {
+            table: f"INSERT INTO `{table}` ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+            for table, columns in TABLE_COLUMNS
+        }
+        self.counts = {}
+
+    def write(self, table, row):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table):
+        buffer = self.buffers[table]
+        if buffer:
+            with self.connection.cursor() as cursor:
+                cursor.executemany(self.statements[table], buffer)
+            self.connection.commit()
+            self.counts[table] = self.counts.get(table, 0) + len(buffer)
+            buffer.clear()
+
+    def close(self):
+        for table, _ in TABLE_COLUMNS:
+            self.flush(table)
+        self.connection.close()
+        return self.counts
+
+
+def generate_part(task):
+    """Generates users [first, last) into one writer. Runs in a worker process when --workers > 1."""
+    options, part, first, last = task
+    if options['out']:
+        writer = TsvWriter(options['out'], part)
+    else:
+        writer = InsertWriter(options['batch_size'])
+    try:
+        for index in range(first, last):
+            UserGenerator(options, index, writer.write).generate()
+    finally:
+        counts = writer.close()
+    return part, counts
+
+
+def write_load_script(out_dir, parts):
+    """load.sql: LOAD DATA LOCAL INFILE for every part file, parents first."""
+    lines = ['USE personal_finance;', 'SET foreign_key_checks = 0;', 'SET unique_checks = 0;']
+    for table, columns in TABLE_COLUMNS:
+        for part in parts:
+            path = os.path.abspath(os.path.join(out_dir, f"{table}.{part:05d}.tsv"))
+            if os.path.exists(path):
+                lines.append(
+                    f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE `{table}` CHARACTER SET utf8mb4 ({', '.join(columns)});"
+                )
+    lines.extend(['SET unique_checks = 1;', 'SET foreign_key_checks = 1;'])
+    with open(os.path.join(out_dir, 'load.sql'), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+@click.command()
+@click.option('--users', default=100, show_default=True, help='Users to generate.')
+@click.option('--months', default=24, show_default=True, help='Months of history per user, ending at --end-date.')
+@click.option('--transactions-per-user', default=400, show_default=True, help='Mean transactions per user (varies per user).')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Last day of generated history [default: today]. Fix it for byte-identical output.')
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed and options give the same data.')
+@click.option('--receipt-rate', default=0.05, show_default=True, help='Fraction of discretionary expenses with a receipt.')
+@click.option('--receipt-dir', type=click.Path(file_okay=False), default=None,
+              help='Also write receipt files here (RECEIPT_STORAGE_DIR layout).')
+@click.option('--report-months', default=3, show_default=True, help='Recent months that may have a saved monthly report.')
+@click.option('--password-hash', default=DEFAULT_PASSWORD_HASH, help='password_hash for every user.')
+@click.option('--out', type=click.Path(file_okay=False), default=None, help='Write LOAD DATA files and load.sql here.')
+@click.option('--load', is_flag=True, help='Insert straight into MySQL (MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DB).')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows per executemany with --load.')
+@click.option('--chunk-size', default=500, show_default=True, help='Users per part file / work unit.')
+@click.option('--workers', default=1, show_default=True, help='Processes generating parts in parallel.')
+def main(users, months, transactions_per_user, end_date, seed, receipt_rate, receipt_dir, report_months,
+         password_hash, out, load, batch_size, chunk_size, workers):
+    """Generate realistic synthetic data for the personal_finance schema."""
+    if bool(out) == load:
+        raise click.UsageError('Pass exactly one of --out DIR or --load.')
+    if months < 1:
+        raise click.UsageError('--months must be at least 1.')
+    if out:
+        os.makedirs(out, exist_ok=True)
+    options = {
+        'seed': seed,
+        'months': months,
+        'transactions_per_user': transactions_per_user,
+        'end_date': end_date.date() if end_date else date.today(),
+        'receipt_rate': receipt_rate,
+        'receipt_dir': receipt_dir,
+        'report_months': report_months,
+        'password_hash': password_hash,
+        'out': out,
+        'batch_size': batch_size,
+    }
+    tasks = [
+        (options, part, first, min(first + chunk_size, users))
+        for part, first in enumerate(range(0, users, chunk_size))
+    ]
+
+    totals = {}
+    started = datetime.now()
+    if workers > 1:
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            results = list(pool.imap_unordered(generate_part, tasks))
+    else:
+        results = [generate_part(task) for task in tasks]
+    for _, counts in results:
+        for table, count in counts.items():
+            totals[table] = totals.get(table, 0) + count
+    if out:
+        write_load_script(out, sorted(part for part, _ in results))
+
+    elapsed = (datetime.now() - started).total_seconds()
+    for table, _ in TABLE_COLUMNS:
+        click.echo(f"{table:20} {totals.get(table, 0):>12,}")
+    click.echo(f"Generated {sum(totals.values()):,} rows in {elapsed:.1f}s"
+               + (f"; load them with: mysql --local-infile=1 personal_finance < {os.path.join(out, 'load.sql')}" if out else '.'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+-- Adds the composite index behind keyset pagination of transactions
+-- (GET /api/transactions/<user_id>/page). Already included in finance_schema.sql
+-- for fresh installs; run this once against existing databases.
+
+USE personal_finance;
+
+ALTER TABLE transaction
+    ADD INDEX idx_user_date_id (user_id, date, transaction_id);
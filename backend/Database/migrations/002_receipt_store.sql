@@ -0,0 +1,16 @@
+-- Moves receipt images out of transaction rows into the content-addressed
+-- receipt store. Run this first, then move existing data and drop the old column:
+--   flask --app backend/Flask/flask_api.py migrate-receipts --drop-column
+
+USE personal_finance;
+
+CREATE TABLE IF NOT EXISTS receipt (
+    receipt_id CHAR(64) PRIMARY KEY,
+    content_type VARCHAR(100) NOT NULL,
+    size_bytes BIGINT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE transaction
+    ADD COLUMN receipt_id CHAR(64) AFTER description,
+    ADD CONSTRAINT fk_transaction_receipt FOREIGN KEY (receipt_id) REFERENCES receipt(receipt_id);
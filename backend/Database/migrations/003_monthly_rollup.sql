@@ -0,0 +1,16 @@
+-- Adds the per-month aggregate table read by the dashboard. After running this,
+-- populate it from existing transactions:
+--   flask --app backend/Flask/flask_api.py backfill-rollups
+
+USE personal_finance;
+
+CREATE TABLE IF NOT EXISTS monthly_rollup (
+    user_id VARCHAR(50) NOT NULL,
+    month DATE NOT NULL,
+    type ENUM('expense', 'income') NOT NULL,
+    category VARCHAR(50) NOT NULL DEFAULT '',
+    total_amount DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, type, category),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+);
@@ -0,0 +1,7 @@
+-- Supports per-budget spend aggregation over a category + date window
+-- (GET /api/alerts/<user_id>). Already included in finance_schema.sql for fresh installs.
+
+USE personal_finance;
+
+ALTER TABLE transaction
+    ADD INDEX idx_user_category_date (user_id, category, date);
@@ -0,0 +1,36 @@
+-- Adds updated_at change tracking and delete tombstones for GET /api/sync.
+-- Existing rows get the migration time as their updated_at, so clients
+-- should start with a full sync (no ?since=). Already included in
+-- finance_schema.sql for fresh installs.
+
+USE personal_finance;
+
+ALTER TABLE transaction
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_user_updated (user_id, updated_at);
+
+ALTER TABLE budget
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_user_updated (user_id, updated_at);
+
+ALTER TABLE goal
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_user_updated (user_id, updated_at);
+
+ALTER TABLE notification
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_user_updated (user_id, updated_at);
+
+ALTER TABLE reminder
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_user_updated (user_id, updated_at);
+
+CREATE TABLE sync_tombstone (
+    tombstone_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL,
+    entity VARCHAR(20) NOT NULL,
+    entity_id VARCHAR(50) NOT NULL,
+    deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+    INDEX idx_user_deleted (user_id, deleted_at)
+);
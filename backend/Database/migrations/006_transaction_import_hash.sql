@@ -0,0 +1,8 @@
+-- Adds the content hash used by POST /api/transactions/import to skip rows that
+-- were already imported. Already included in finance_schema.sql for fresh installs.
+
+USE personal_finance;
+
+ALTER TABLE transaction
+    ADD COLUMN import_hash CHAR(64) AFTER receipt_id,
+    ADD UNIQUE KEY uq_user_import_hash (user_id, import_hash);
@@ -0,0 +1,16 @@
+-- Adds the fire time used by the reminder scheduler and the (user_id, due_date)
+-- index behind the dashboard's upcoming-reminders range scan. Already included in
+-- finance_schema.sql for fresh installs.
+
+USE personal_finance;
+
+ALTER TABLE reminder
+    ADD COLUMN next_fire_at DATETIME AFTER recurring,
+    ADD INDEX idx_user_due (user_id, due_date),
+    ADD INDEX idx_next_fire (next_fire_at);
+
+-- Upcoming reminders start at their due-soon window. Past recurring reminders fire
+-- once (one overdue notice) and roll forward; past one-time reminders stay quiet.
+UPDATE reminder
+SET next_fire_at = DATE_SUB(due_date, INTERVAL 7 DAY)
+WHERE due_date >= CURDATE() OR recurring <> 'One-time';
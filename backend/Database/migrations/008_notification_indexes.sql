@@ -0,0 +1,10 @@
+-- Indexes behind the notification pages (keyset on created_at, notification_id)
+-- and the index-only unread count. Already included in finance_schema.sql for
+-- fresh installs.
+
+USE personal_finance;
+
+ALTER TABLE notification
+    DROP INDEX idx_user_read,
+    ADD INDEX idx_user_read_created (user_id, is_read, created_at),
+    ADD INDEX idx_user_created (user_id, created_at);
@@ -0,0 +1,16 @@
+-- Persisted token revocations (logout, password change, user deletion) that
+-- every API worker mirrors in memory. Already included in finance_schema.sql
+-- for fresh installs.
+
+USE personal_finance;
+
+CREATE TABLE token_revocation (
+    revocation_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL,
+    token_id VARCHAR(64),
+    revoked_before DATETIME(6),
+    expires_at DATETIME NOT NULL,
+    created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    INDEX idx_expires (expires_at),
+    INDEX idx_created (created_at)
+);
@@ -0,0 +1,12 @@
+-- Remembers the day of month a recurring reminder is due on, so the scheduler
+-- moves a bill due on the 31st back to the 31st after rolling it through a
+-- shorter month. Already included in finance_schema.sql for fresh installs.
+
+USE personal_finance;
+
+ALTER TABLE reminder
+    ADD COLUMN due_day TINYINT UNSIGNED AFTER recurring;
+
+UPDATE reminder
+SET due_day = DAY(due_date)
+WHERE recurring IN ('Monthly', 'Yearly');
@@ -0,0 +1,19 @@
+-- Records who uploaded each receipt, so a receipt_id can only be attached to a
+-- transaction by its uploader. Existing receipts belong to the users whose
+-- transactions already reference them. Already included in finance_schema.sql
+-- for fresh installs.
+
+USE personal_finance;
+
+CREATE TABLE receipt_owner (
+    receipt_id CHAR(64) NOT NULL,
+    user_id VARCHAR(50) NOT NULL,
+    PRIMARY KEY (receipt_id, user_id),
+    FOREIGN KEY (receipt_id) REFERENCES receipt(receipt_id),
+    FOREIGN KEY (user_id) REFERENCES user(user_id) ON DELETE CASCADE
+);
+
+INSERT IGNORE INTO receipt_owner (receipt_id, user_id)
+SELECT DISTINCT receipt_id, user_id
+FROM transaction
+WHERE receipt_id IS NOT NULL;
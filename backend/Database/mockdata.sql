@@ -44,10 +44,17 @@ INSERT INTO reminder (reminder_id, user_id, title, category, description, amount
 ('r-loan-e', 'a9c1b2d3-4e5f-6g7h-8i9j-0k1l2m3n4o5p', 'Student Loan Payment', 'Debt', 'Minimum monthly payment', 450.00, '2025-12-15', 'Monthly'),
 ('r-sub-e', 'a9c1b2d3-4e5f-6g7h-8i9j-0k1l2m3n4o5p', 'Software Subscription', 'Subscriptions', 'Annual license renewal', 120.00, '2026-01-05', 'Yearly');
 
+-- Schedule the reminders the way the API does (start of the due-soon window); like migrations/007,
+-- past recurring reminders fire once and roll forward, past one-time reminders stay quiet
+UPDATE reminder
+SET next_fire_at = DATE_SUB(due_date, INTERVAL 7 DAY)
+WHERE reminder_id IN ('r-rent-z', 'r-ins-z', 'r-loan-e', 'r-sub-e')
+    AND (due_date >= CURDATE() OR recurring <> 'One-time');
+
 
 -- 3. TRANSACTION TABLE DATA (1 Year of Data for Both Users)
 
-INSERT INTO transaction (transaction_id, user_id, name, amount, type, date, category, description, receipt_data) VALUES
+INSERT INTO transaction (transaction_id, user_id, name, amount, type, date, category, description, receipt_id) VALUES
 -- ZACKARY'S TRANSACTIONS (f3582516-009b-4ff3-8e5f-efb2c4a4880d)
 ('t-z-dec24-01', 'f3582516-009b-4ff3-8e5f-efb2c4a4880d', 'December Paycheck', 4500.00, 'income', '2024-12-01', 'Salary', 'Monthly paycheck', NULL),
 ('t-z-dec24-02', 'f3582516-009b-4ff3-8e5f-efb2c4a4880d', 'Rent Payment', 1500.00, 'expense', '2024-12-02', 'Housing', 'December Rent', NULL),
@@ -73,16 +80,24 @@ INSERT INTO transaction (transaction_id, user_id, name, amount, type, date, cate
 ('t-e-nov25-01', 'a9c1b2d3-4e5f-6g7h-8i9j-0k1l2m3n4o5p', 'November Salary', 6200.00, 'income', '2025-11-01', 'Salary', 'Monthly Pay', NULL);
 
 
+-- 8a. MONTHLY ROLLUP TABLE DATA (Derived from the transactions above)
+INSERT INTO monthly_rollup (user_id, month, type, category, total_amount, transaction_count)
+SELECT user_id, DATE_FORMAT(date, '%Y-%m-01'), type, COALESCE(category, ''), SUM(amount), COUNT(*)
+FROM transaction
+GROUP BY user_id, DATE_FORMAT(date, '%Y-%m-01'), type, COALESCE(category, '');
+
+
 -- 8. FINANCIAL OVERVIEW TABLE DATA (Calculated Summaries)
+-- All-time totals of the transactions above; the API maintains these incrementally
+-- (flask reconcile-overview rebuilds them from the transaction table)
 
--- Zackary's Calculations (using previous logic: 56000 income, 24190 expenses)
+-- Zackary: 4500 + 4500 + 2000 income; 1500 + 170 + 600 + 200 + 1000 + 350 expenses
 INSERT INTO financial_overview (user_id, total_income, total_expenses, net_worth, last_updated) VALUES
-('f3582516-009b-4ff3-8e5f-efb2c4a4880d', 56000.00, 24190.00, 31810.00, CURRENT_TIMESTAMP());
+('f3582516-009b-4ff3-8e5f-efb2c4a4880d', 11000.00, 3820.00, 7180.00, CURRENT_TIMESTAMP());
 
--- Elara's Estimated 1-Year Totals (12 * 6200 Salary + 5000 Bonus = 79400 Income)
--- (12 * 2100 Rent + 12 * 250 Utilities + 1500 Taxes + 500 Clothing + 12 * 450 Loan + 1500 + 2000 Savings) = 40500 Expenses (Estimated)
+-- Elara: 6200 + 5000 + 6200 income; 2100 + 280 + 1500 + 450 + 500 + 1500 + 30 + 2000 expenses
 INSERT INTO financial_overview (user_id, total_income, total_expenses, net_worth, last_updated) VALUES
-('a9c1b2d3-4e5f-6g7h-8i9j-0k1l2m3n4o5p', 79400.00, 40500.00, 38900.00, CURRENT_TIMESTAMP());
+('a9c1b2d3-4e5f-6g7h-8i9j-0k1l2m3n4o5p', 17400.00, 8360.00, 9040.00, CURRENT_TIMESTAMP());
 
 
 -- 7. NOTIFICATION TABLE DATA
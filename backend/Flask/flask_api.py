@@ -1,16 +1,47 @@
 """Personal Finance and Budget Management System - Flask API Backend (PyMySQL Version)"""
 
-from flask import Flask, request, jsonify, current_app, g
+from flask import Flask, Response, request, jsonify, current_app, g, has_request_context, send_file
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.test import EnvironBuilder
+from array import array
+import atexit
+import base64
+import binascii
+from bisect import bisect_left
 import calendar
+import click
+import csv
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import contextvars
 from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
+import hashlib
+import heapq
+import hmac
+import html
+import io
+from itertools import accumulate, compress
 import json
+import math
+import multiprocessing
+import operator
 import os
+import queue
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
 from functools import wraps
 import uuid
-import jwt 
+import zlib
 import pymysql.cursors
 
 app = Flask(__name__)
@@ -23,35 +54,858 @@ app.config['MYSQL_HOST'] = os.getenv('MYSQL_HOST', 'localhost')
 app.config['MYSQL_USER'] = os.getenv('MYSQL_USER', 'root')
 app.config['MYSQL_PASSWORD'] = os.getenv('MYSQL_PASSWORD', 'password') # IMPORTANT: Replace with your actual password
 app.config['MYSQL_DB'] = os.getenv('MYSQL_DB', 'personal_finance')
-app.config['DATABASE_POOL_SIZE'] = 10 # For demonstration, though PyMySQL doesn't handle pooling directly in this setup
+
+# Connection pool configuration (see ConnectionPool below)
+app.config['DATABASE_POOL_SIZE'] = int(os.getenv('DATABASE_POOL_SIZE', 10)) # Max open connections per worker process
+app.config['DATABASE_POOL_MIN_SIZE'] = int(os.getenv('DATABASE_POOL_MIN_SIZE', 1)) # Connections kept open even when idle
+app.config['DATABASE_POOL_TIMEOUT'] = float(os.getenv('DATABASE_POOL_TIMEOUT', 10)) # Seconds to wait for a free connection
+app.config['DATABASE_POOL_MAX_IDLE'] = float(os.getenv('DATABASE_POOL_MAX_IDLE', 300)) # Close surplus connections idle this long
+app.config['DATABASE_POOL_MAX_LIFETIME'] = float(os.getenv('DATABASE_POOL_MAX_LIFETIME', 3600)) # Recycle connections older than this
+app.config['DATABASE_POOL_PING_INTERVAL'] = float(os.getenv('DATABASE_POOL_PING_INTERVAL', 1)) # Ping on checkout if idle longer than this
+
+# Receipt storage (content-addressed files on local disk, see ReceiptStore)
+app.config['RECEIPT_STORAGE_DIR'] = os.getenv(
+    'RECEIPT_STORAGE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'receipts')
+)
+app.config['RECEIPT_MAX_BYTES'] = int(os.getenv('RECEIPT_MAX_BYTES', 10 * 1024 * 1024))
+
+# Dashboard summary cache (invalidated on every write that feeds the summary)
+app.config['DASHBOARD_CACHE_TTL'] = float(os.getenv('DASHBOARD_CACHE_TTL', 30))
+
+# Parallel read fan-out (see fetch_concurrently)
+app.config['QUERY_FANOUT_WORKERS'] = int(os.getenv('QUERY_FANOUT_WORKERS', 8)) # Threads shared by all requests in a worker
+app.config['DASHBOARD_QUERY_TIMEOUT'] = float(os.getenv('DASHBOARD_QUERY_TIMEOUT', 5)) # Per-section budget before it is dropped
+
+# Delta sync (see /api/sync)
+app.config['SYNC_COMMIT_GRACE'] = float(os.getenv('SYNC_COMMIT_GRACE', 5)) # Seconds re-sent on every poll to cover in-flight commits
+app.config['SYNC_TOMBSTONE_RETENTION_DAYS'] = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', 30)) # Older watermarks get a full resync
+
+# Bulk transaction import (see /api/transactions/import)
+app.config['IMPORT_BATCH_SIZE'] = int(os.getenv('IMPORT_BATCH_SIZE', 1000)) # Rows per multi-row INSERT and per commit
+
+# Streaming transaction export (see /api/transactions/<user_id>/export)
+app.config['EXPORT_NET_WRITE_TIMEOUT'] = int(os.getenv('EXPORT_NET_WRITE_TIMEOUT', 600)) # Seconds MySQL waits on a slow download
+
+# Server-Sent Events push channel (see /api/events)
+app.config['EVENT_STREAM_MAX_PER_WORKER'] = int(os.getenv('EVENT_STREAM_MAX_PER_WORKER', 100)) # Each open stream holds a worker thread
+app.config['EVENT_STREAM_HEARTBEAT'] = float(os.getenv('EVENT_STREAM_HEARTBEAT', 15)) # Seconds between keep-alive comments
+app.config['EVENT_BACKLOG_SIZE'] = int(os.getenv('EVENT_BACKLOG_SIZE', 100)) # Recent events kept per user for Last-Event-ID resume
+app.config['EVENT_PUBLISHER'] = os.getenv('EVENT_PUBLISHER', 'local') # 'local' (single process) or 'loopback' (all workers on this host)
+app.config['EVENT_BROKER_DIR'] = os.getenv(
+    'EVENT_BROKER_DIR', os.path.join(tempfile.gettempdir(), 'pfbms-event-broker')
+) # Where loopback workers register their ports
+
+# Recurring reminder scheduler (see ReminderScheduler)
+app.config['REMINDER_SCHEDULER_ENABLED'] = os.getenv('REMINDER_SCHEDULER_ENABLED', 'true').lower() == 'true' # Run the scheduler thread in each worker
+app.config['REMINDER_SCAN_INTERVAL'] = float(os.getenv('REMINDER_SCAN_INTERVAL', 300)) # Seconds of upcoming fire times loaded per scan
+app.config['REMINDER_BATCH_SIZE'] = int(os.getenv('REMINDER_BATCH_SIZE', 500)) # Reminders fired per transaction
+
+# Batch endpoint (see /api/batch)
+app.config['BATCH_MAX_REQUESTS'] = int(os.getenv('BATCH_MAX_REQUESTS', 20)) # Sub-requests accepted per batch
+app.config['BATCH_WORKERS'] = int(os.getenv('BATCH_WORKERS', 8)) # Threads running batched reads concurrently, per worker
+
+# Password hashing process pool (see PasswordHasher)
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1') # Full werkzeug method; other hashes are upgraded on login
+app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 2)) # Hashing processes per worker
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 16)) # Calls running or queued before new ones get 429
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_TIMEOUT', 5)) # Seconds a call may wait before it gets 503
+
+# Request and query instrumentation (see RequestMetrics and /api/metrics)
+app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200)) # Statements this slow are logged; 0 disables the log
+app.config['METRICS_MAX_STATEMENTS'] = int(os.getenv('METRICS_MAX_STATEMENTS', 500)) # Distinct normalized statements tracked; the rest share one series
+
+# On-demand request profiling (see RequestProfiler)
+app.config['PROFILE_DIR'] = os.getenv(
+    'PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'pfbms-profiles')
+) # Where collapsed stacks and summaries are written
+app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', 0)) # Fraction of requests profiled without a header
+app.config['PROFILE_MAX_PER_MINUTE'] = int(os.getenv('PROFILE_MAX_PER_MINUTE', 6)) # Profiles started per worker per minute, signed or sampled
+app.config['PROFILE_INTERVAL_MS'] = float(os.getenv('PROFILE_INTERVAL_MS', 2)) # Stack sampling period
+
+# ==================== REQUEST METRICS ====================
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+ROW_COUNT_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+METRICS_STATEMENT_OVERFLOW = 'other'
+METRICS_FINGERPRINT_CACHE_SIZE = 4096
+
+SQL_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+SQL_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+SQL_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+SQL_VALUE_LIST_RE = re.compile(r"\(\?(?:, \?)*\)")
+SQL_TUPLE_LIST_RE = re.compile(r"\(\.\.\.\)(?:, \(\.\.\.\))+")
+SQL_UNION_RE = re.compile(r"(SELECT .+?)(?: UNION ALL \1)+")
+
+def normalize_sql(query):
+    """
+    Reduces a statement to its shape, so executions that differ only in values,
+    IN-list length, VALUES rows or UNION ALL rows share one fingerprint.
+    """
+    text = ' '.join(query.split())
+    text = SQL_STRING_RE.sub('?', text)
+    text = SQL_NUMBER_RE.sub('?', text)
+    text = SQL_PLACEHOLDER_RE.sub('?', text)
+    text = SQL_VALUE_LIST_RE.sub('(...)', text)
+    text = SQL_TUPLE_LIST_RE.sub('(...), ...', text)
+    return SQL_UNION_RE.sub(r'\1 UNION ALL ...', text)
+
+
+class Histogram:
+    """Fixed-bucket histogram in Prometheus layout. Not locked; callers hold the owner's lock."""
+
+    __slots__ = ('bounds', 'counts', 'total')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+
+class RequestStats:
+    """Counters for one request, shared with the fan-out threads it starts."""
+
+    __slots__ = ('started', 'queries', 'rows', 'db_seconds', 'pool_wait', 'status', 'parent', 'token')
+
+    def __init__(self, parent):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.rows = 0
+        self.db_seconds = 0.0
+        self.pool_wait = 0.0
+        self.status = None
+        self.parent = parent  # The /api/batch request a sub-request belongs to
+        self.token = None
+
+
+_current_request_stats = contextvars.ContextVar('current_request_stats', default=None)
+
+
+class RequestMetrics:
+    """
+    Process-wide request and query instrumentation, rendered by /api/metrics.
+
+    Every statement run through an instrumented cursor is timed and counted
+    under its normalize_sql() fingerprint (cached per query string, so the
+    regexes only run the first time a string is seen) and added to the
+    current request's RequestStats. Statements at or over
+    slow_query_threshold seconds are logged. Distinct fingerprints are capped
+    at max_statements; the rest share the 'other' series.
+    """
+
+    def __init__(self, slow_query_threshold, max_statements):
+        self.slow_query_threshold = slow_query_threshold
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._fingerprints = {}  # query string -> fingerprint
+        self._statements = {}  # fingerprint -> [calls, errors, seconds, rows, max_seconds]
+        self._endpoints = {}  # (method, endpoint) -> Histogram of seconds
+        self._responses = {}  # (method, endpoint, status) -> count
+        self._query_seconds = Histogram(LATENCY_BUCKETS)
+        self._pool_wait = Histogram(POOL_WAIT_BUCKETS)
+        self._queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+        self._rows_per_request = Histogram(ROW_COUNT_BUCKETS)
+        self._slow_queries = 0
+
+    def fingerprint(self, query):
+        fingerprint = self._fingerprints.get(query)
+        if fingerprint is None:
+            if isinstance(query, bytes):
+                query = query.decode(errors='replace')
+            fingerprint = normalize_sql(query)
+            if len(self._fingerprints) >= METRICS_FINGERPRINT_CACHE_SIZE:
+                self._fingerprints.clear()  # Only grows this far when queries embed literal values
+            self._fingerprints[query] = fingerprint
+        return fingerprint
+
+    def observe_query(self, query, seconds, rows, failed=False):
+        fingerprint = self.fingerprint(query)
+        stats = _current_request_stats.get()
+        with self._lock:
+            entry = self._statements.get(fingerprint)
+            if entry is None:
+                if len(self._statements) >= self.max_statements:
+                    fingerprint = METRICS_STATEMENT_OVERFLOW
+                entry = self._statements.setdefault(fingerprint, [0, 0, 0.0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += failed
+            entry[2] += seconds
+            entry[3] += rows
+            if seconds > entry[4]:
+                entry[4] = seconds
+            self._query_seconds.observe(seconds)
+            if stats is not None:
+                stats.queries += 1
+                stats.rows += rows
+                stats.db_seconds += seconds
+            slow = seconds >= self.slow_query_threshold > 0
+            if slow:
+                self._slow_queries += 1
+        if slow:
+            endpoint = request.endpoint if has_request_context() else None
+            app.logger.warning(
+                "Slow query (%.1f ms, %d rows, endpoint %s): %s",
+                seconds * 1000, rows, endpoint, fingerprint
+            )
+
+    def observe_pool_wait(self, seconds):
+        stats = _current_request_stats.get()
+        with self._lock:
+            self._pool_wait.observe(seconds)
+            if stats is not None:
+                stats.pool_wait += seconds
+
+    def begin_request(self):
+        stats = RequestStats(_current_request_stats.get())
+        stats.token = _current_request_stats.set(stats)
+
+    def end_request(self, method, endpoint, status):
+        stats = _current_request_stats.get()
+        if stats is None:
+            return
+        _current_request_stats.reset(stats.token)
+        elapsed = time.perf_counter() - stats.started
+        status = str(stats.status or status)
+        with self._lock:
+            histogram = self._endpoints.get((method, endpoint))
+            if histogram is None:
+                histogram = self._endpoints[(method, endpoint)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(elapsed)
+            key = (method, endpoint, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+            self._queries_per_request.observe(stats.queries)
+            self._rows_per_request.observe(stats.rows)
+            if stats.parent is not None:
+                # A batch sub-request's queries also count toward the batch
+                stats.parent.queries += stats.queries
+                stats.parent.rows += stats.rows
+                stats.parent.db_seconds += stats.db_seconds
+                stats.parent.pool_wait += stats.pool_wait
+
+    def render(self, pool_stats=None):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines.extend(metric_header('pfbms_http_request_duration_seconds', 'histogram',
+                                       'Time from routing to the end of the view, per endpoint.'))
+            for (method, endpoint), histogram in sorted(self._endpoints.items()):
+                lines.extend(histogram_lines('pfbms_http_request_duration_seconds', histogram,
+                                             {'method': method, 'endpoint': endpoint}))
+            lines.extend(metric_header('pfbms_http_responses_total', 'counter', 'Responses by endpoint and status.'))
+            for (method, endpoint, status), count in sorted(self._responses.items()):
+                lines.append(metric_line('pfbms_http_responses_total', count,
+                                         {'method': method, 'endpoint': endpoint, 'status': status}))
+            lines.extend(metric_header('pfbms_http_request_queries', 'histogram', 'SQL statements per request.'))
+            lines.extend(histogram_lines('pfbms_http_request_queries', self._queries_per_request))
+            lines.extend(metric_header('pfbms_http_request_rows', 'histogram', 'Rows returned by SQL per request.'))
+            lines.extend(histogram_lines('pfbms_http_request_rows', self._rows_per_request))
+
+            lines.extend(metric_header('pfbms_db_query_duration_seconds', 'histogram', 'Duration of every SQL statement.'))
+            lines.extend(histogram_lines('pfbms_db_query_duration_seconds', self._query_seconds))
+            statement_series = (
+                ('pfbms_db_statement_calls_total', 'counter', 'Executions per normalized statement.', 0),
+                ('pfbms_db_statement_errors_total', 'counter', 'Failed executions per normalized statement.', 1),
+                ('pfbms_db_statement_seconds_total', 'counter', 'Time spent per normalized statement.', 2),
+                ('pfbms_db_statement_rows_total', 'counter', 'Rows returned per normalized statement.', 3),
+                ('pfbms_db_statement_max_seconds', 'gauge', 'Slowest execution per normalized statement.', 4),
+            )
+            for name, kind, help_text, index in statement_series:
+                lines.extend(metric_header(name, kind, help_text))
+                for fingerprint, entry in self._statements.items():
+                    lines.append(metric_line(name, entry[index], {'statement': fingerprint}))
+            lines.extend(metric_header('pfbms_db_slow_queries_total', 'counter',
+                                       'Statements over SLOW_QUERY_THRESHOLD_MS.'))
+            lines.append(metric_line('pfbms_db_slow_queries_total', self._slow_queries))
+
+            lines.extend(metric_header('pfbms_db_pool_wait_seconds', 'histogram',
+                                       'Time spent waiting for a pooled connection per checkout.'))
+            lines.extend(histogram_lines('pfbms_db_pool_wait_seconds', self._pool_wait))
+
+        if pool_stats is not None:
+            lines.extend(metric_header('pfbms_db_pool_connections', 'gauge', 'Open pooled connections by state.'))
+            for state in ('in_use', 'idle'):
+                lines.append(metric_line('pfbms_db_pool_connections', pool_stats[state], {'state': state}))
+            for key in ('checkouts', 'waits', 'timeouts', 'created', 'closed'):
+                name = f'pfbms_db_pool_{key}_total'
+                lines.extend(metric_header(name, 'counter', f"Connection pool {key.replace('_', ' ')}."))
+                lines.append(metric_line(name, pool_stats[key]))
+        return '\n'.join(lines) + '\n'
+
+
+def metric_header(name, kind, help_text):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def metric_line(name, value, labels=None):
+    if labels:
+        rendered = ','.join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+        return f"{name}{{{rendered}}} {value}"
+    return f"{name} {value}"
+
+def histogram_lines(name, histogram, labels=None):
+    labels = labels or {}
+    lines = []
+    for bound, cumulative in zip(histogram.bounds + ('+Inf',), accumulate(histogram.counts)):
+        lines.append(metric_line(f"{name}_bucket", cumulative, dict(labels, le=bound)))
+    lines.append(metric_line(f"{name}_sum", round(histogram.total, 6), labels))
+    lines.append(metric_line(f"{name}_count", sum(histogram.counts), labels))
+    return lines
+
+
+request_metrics = RequestMetrics(
+    slow_query_threshold=app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000,
+    max_statements=app.config['METRICS_MAX_STATEMENTS'],
+)
+
+
+class QueryTimingMixin:
+    """Times execute()/executemany() into request_metrics; rows are counted for buffered result sets."""
+
+    _in_executemany = False
+
+    def execute(self, query, args=None):
+        if self._in_executemany:
+            # executemany() falls back to one execute() per row for non-INSERT statements
+            return super().execute(query, args)
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, args)
+        except Exception:
+            request_metrics.observe_query(query, time.perf_counter() - started, 0, failed=True)
+            raise
+        request_metrics.observe_query(query, time.perf_counter() - started, self._returned_rows())
+        return result
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        self._in_executemany = True
+        try:
+            result = super().executemany(query, args)
+        except Exception:
+            request_metrics.observe_query(query, time.perf_counter() - started, 0, failed=True)
+            raise
+        finally:
+            self._in_executemany = False
+        request_metrics.observe_query(query, time.perf_counter() - started, 0)
+        return result
+
+    def _returned_rows(self):
+        # Unbuffered cursors do not know their row count until the rows are read
+        if self.description is None or isinstance(self, pymysql.cursors.SSCursor):
+            return 0
+        return self.rowcount
+
+
+class InstrumentedDictCursor(QueryTimingMixin, pymysql.cursors.DictCursor):
+    pass
+
+
+class InstrumentedSSDictCursor(QueryTimingMixin, pymysql.cursors.SSDictCursor):
+    pass
+
+
+@app.before_request
+def start_request_metrics():
+    request_metrics.begin_request()
+
+@app.after_request
+def record_response_status(response):
+    stats = _current_request_stats.get()
+    if stats is not None:
+        stats.status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exception):
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    request_metrics.end_request(request.method, endpoint, 500 if exception is not None else 200)
+
+
+# ==================== REQUEST PROFILING ====================
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_WINDOW = 60  # Seconds PROFILE_MAX_PER_MINUTE is counted over
+PROFILE_SERIALIZATION_MODULES = ('json', 'flask.json', 'simplejson')
+PROFILE_ROOT_FUNCTION = 'full_dispatch_request'
+QUERY_TIMING_CODES = {QueryTimingMixin.execute.__code__, QueryTimingMixin.executemany.__code__}
+
+def sign_profile_token(expires):
+    """Header value that enables profiling until `expires` (epoch seconds): '<expires>.<HMAC>'."""
+    digest = hmac.new(app.config['SECRET_KEY'].encode(), f"profile:{expires}".encode(), hashlib.sha256).digest()
+    return f"{expires}.{b64url_encode(digest)}"
+
+def verify_profile_token(value):
+    expires, _, signature = value.partition('.')
+    try:
+        expires = int(expires)
+    except ValueError:
+        return False
+    return expires > time.time() and hmac.compare_digest(value, sign_profile_token(expires))
+
+def profile_frame_phase(frame):
+    """Which part of the request a sampled frame belongs to: 'sql', 'serialization', 'view' or 'framework'."""
+    phase = 'framework'
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('pymysql') or frame.f_code in QUERY_TIMING_CODES:
+            return 'sql'
+        if phase == 'framework':
+            if module.startswith(PROFILE_SERIALIZATION_MODULES):
+                phase = 'serialization'
+            elif frame.f_code.co_name == 'dispatch_request' and module.startswith('flask'):
+                phase = 'view'
+        frame = frame.f_back
+    return phase
+
+
+class RequestProfile:
+    """
+    Samples one request thread's Python stack every `interval` seconds from a
+    helper thread (via sys._current_frames, so the request itself runs
+    unmodified) and, once the request ends, writes the stacks in collapsed
+    format (<id>.folded, rooted at the phase) plus a summary (<id>.json) to
+    the profile directory. Work the request hands to fan-out or batch threads
+    shows up as the request thread waiting on them.
+    """
+
+    def __init__(self, profiler, thread_id, reason):
+        self.profiler = profiler
+        self.thread_id = thread_id
+        self.reason = reason
+        self.profile_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.stacks = {}  # (phase, frame labels...) -> samples
+        self.status = None
+        self.request_info = {}
+        self._stop = threading.Event()
+        self._started = time.perf_counter()
+        self._duration = None
+
+    def start(self):
+        threading.Thread(target=self._run, name='request-profiler', daemon=True).start()
+
+    def finish(self, method, endpoint):
+        self._duration = time.perf_counter() - self._started
+        self.request_info = {'method': method, 'endpoint': endpoint, 'status': self.status}
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.profiler.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._sample(frame)
+            del frame
+        try:
+            self._write()
+        except Exception as e:
+            self.profiler.record_error()
+            app.logger.error(f"Could not write profile {self.profile_id}: {e}")
+
+    def _sample(self, frame):
+        phase = profile_frame_phase(frame)
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            labels.append(f"{code.co_name} ({frame.f_globals.get('__name__', '?')})")
+            if code.co_name == PROFILE_ROOT_FUNCTION:
+                break  # Server and WSGI frames below the dispatch are the same for every request
+            frame = frame.f_back
+        key = (phase, *reversed(labels))
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def _write(self):
+        directory = self.profiler.directory
+        os.makedirs(directory, exist_ok=True)
+        samples = sum(self.stacks.values())
+        phases = {}
+        for key, count in self.stacks.items():
+            phases[key[0]] = phases.get(key[0], 0) + count
+        with open(os.path.join(directory, f"{self.profile_id}.folded"), 'w') as f:
+            for key, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(label.replace(';', ':') for label in key)} {count}\n")
+        summary = dict(
+            self.request_info,
+            profile_id=self.profile_id,
+            reason=self.reason,
+            duration_ms=round(self._duration * 1000, 3),
+            interval_ms=self.profiler.interval * 1000,
+            samples=samples,
+            # Sample share of each phase, scaled to the measured duration
+            phase_ms={
+                phase: round(self._duration * 1000 * count / samples, 3) for phase, count in phases.items()
+            },
+        )
+        with open(os.path.join(directory, f"{self.profile_id}.json"), 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile: those carrying a valid signed
+    X-Profile-Token header (see the profile-token command) and a random
+    sample_rate fraction of the rest. Both count toward max_per_minute per
+    worker; past it requests run unprofiled. An unprofiled request costs one
+    header lookup (and one random() call when sampling is on).
+    """
+
+    def __init__(self, directory, sample_rate, max_per_minute, interval):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_per_minute = max_per_minute
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._recent = deque()  # Start times within the last PROFILE_WINDOW seconds
+        self._active = set()  # Request threads being sampled
+        self._stats = {'profiles': 0, 'rate_limited': 0, 'invalid_tokens': 0, 'write_errors': 0}
+
+    def maybe_start(self):
+        """Starts a RequestProfile for the current request if it is selected and within the limit."""
+        token = request.headers.get(PROFILE_HEADER)
+        if token is not None:
+            if not verify_profile_token(token):
+                with self._lock:
+                    self._stats['invalid_tokens'] += 1
+                return None
+            reason = 'header'
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            reason = 'sampled'
+        else:
+            return None
+
+        thread_id = threading.get_ident()
+        now = time.monotonic()
+        with self._lock:
+            if thread_id in self._active:
+                return None  # A batch sub-request inside a profiled batch
+            while self._recent and now - self._recent[0] > PROFILE_WINDOW:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_per_minute:
+                self._stats['rate_limited'] += 1
+                return None
+            self._recent.append(now)
+            self._active.add(thread_id)
+            self._stats['profiles'] += 1
+        profile = RequestProfile(self, thread_id, reason)
+        profile.start()
+        return profile
+
+    def finish(self, profile, method, endpoint):
+        profile.finish(method, endpoint)
+        with self._lock:
+            self._active.discard(profile.thread_id)
+
+    def record_error(self):
+        with self._lock:
+            self._stats['write_errors'] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, active=len(self._active), directory=self.directory)
+
+
+request_profiler = RequestProfiler(
+    directory=app.config['PROFILE_DIR'],
+    sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+    max_per_minute=app.config['PROFILE_MAX_PER_MINUTE'],
+    interval=app.config['PROFILE_INTERVAL_MS'] / 1000,
+)
+
+@app.before_request
+def start_request_profile():
+    profile = request_profiler.maybe_start()
+    if profile is not None:
+        request.environ['pfbms.profile'] = profile
+
+@app.after_request
+def add_profile_header(response):
+    profile = request.environ.get('pfbms.profile')
+    if profile is not None:
+        profile.status = response.status_code
+        response.headers['X-Profile-Id'] = profile.profile_id
+    return response
+
+@app.teardown_request
+def finish_request_profile(exception):
+    profile = request.environ.pop('pfbms.profile', None)
+    if profile is not None:
+        if exception is not None:
+            profile.status = 500
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_profiler.finish(profile, request.method, endpoint)
+
+@app.cli.command('profile-token')
+@click.option('--ttl', default=900, show_default=True, help='Seconds the token stays valid.')
+def profile_token(ttl):
+    """Print an X-Profile-Token header value that profiles requests on every worker until it expires."""
+    click.echo(f"{PROFILE_HEADER}: {sign_profile_token(int(time.time()) + ttl)}")
+
 
 # ==================== DATABASE CONNECTION UTILITIES ====================
 
+class PoolTimeoutError(ConnectionError):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe, bounded pool of PyMySQL connections.
+
+    Connections are handed out LIFO so the hottest connection is reused first, and
+    surplus idle connections age out from the other end. A connection is recycled
+    once it exceeds max_lifetime, and is pinged on checkout when it has been idle
+    longer than ping_interval (a COM_PING round trip, no query parsing).
+    on_checkout, if given, is called with the seconds each checkout waited.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=10.0,
+                 max_idle=300.0, max_lifetime=3600.0, ping_interval=1.0, on_checkout=None):
+        self._connect = connect
+        self.on_checkout = on_checkout
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at, returned_at), most recently returned on the right
+        self._created_at = {}  # id(conn) -> creation time, for every open connection
+        self._size = 0  # open connections, idle + in use + being created
+        self._in_use = 0
+        self._stats = {
+            'created': 0, 'closed': 0, 'recycled': 0, 'ping_failures': 0,
+            'checkouts': 0, 'waits': 0, 'wait_time': 0.0, 'timeouts': 0,
+        }
+        self.pid = os.getpid()
+
+    def fill(self):
+        """Opens connections until min_size are available."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.appendleft((conn, self._created_at[id(conn)], time.monotonic()))
+                self._cond.notify()
+
+    def acquire(self):
+        """Checks a connection out of the pool, blocking up to `timeout` seconds."""
+        wait_started = None
+        reaped = []
+        with self._cond:
+            while True:
+                reaped.extend(self._reap_idle())
+                if self._idle:
+                    conn, created_at, returned_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+
+                # Pool exhausted: wait for a release
+                if wait_started is None:
+                    wait_started = time.monotonic()
+                    self._stats['waits'] += 1
+                remaining = wait_started + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    self._stats['wait_time'] += time.monotonic() - wait_started
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError("Timed out waiting for a database connection.")
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+            waited = time.monotonic() - wait_started if wait_started is not None else 0.0
+            self._stats['wait_time'] += waited
+        if self.on_checkout is not None:
+            self.on_checkout(waited)
+
+        # Socket teardown happens outside the lock
+        for stale in reaped:
+            self._close(stale)
+
+        # Liveness check only for connections that sat idle for a while
+        if conn is not None and time.monotonic() - returned_at > self.ping_interval:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._stats['ping_failures'] += 1
+                self._close(conn)
+                conn = None
+
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def release(self, conn, discard=False):
+        """Returns a connection to the pool, or closes it if broken, discarded or past its lifetime."""
+        created_at = self._created_at.get(id(conn))
+        if created_at is None:
+            # Not one of ours (e.g. checked out before a fork rebuilt the pool)
+            self._close(conn)
+            return
+
+        if not discard:
+            try:
+                # End any implicit read transaction so the next borrower gets a fresh snapshot
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        now = time.monotonic()
+        expired = now - created_at > self.max_lifetime
+        if discard or expired:
+            self._close(conn)
+            with self._cond:
+                if expired and not discard:
+                    self._stats['recycled'] += 1
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append((conn, created_at, now))
+            self._in_use -= 1
+            self._cond.notify()
+
+    def stats(self):
+        """Returns a snapshot of pool counters."""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+        snapshot['wait_time'] = round(snapshot['wait_time'], 6)
+        return snapshot
+
+    def _reap_idle(self):
+        """
+        Removes expired connections and surplus idle ones from the idle queue and
+        returns them for closing. Caller must hold the lock.
+        """
+        now = time.monotonic()
+        survivors = deque()
+        reaped = []
+        for entry in self._idle:
+            conn, created_at, returned_at = entry
+            lifetime_exceeded = now - created_at > self.max_lifetime
+            idle_exceeded = now - returned_at > self.max_idle
+            if lifetime_exceeded or (idle_exceeded and self._size - len(reaped) > self.min_size):
+                reaped.append(conn)
+            else:
+                survivors.append(entry)
+        if reaped:
+            self._idle = survivors
+            self._size -= len(reaped)
+            self._stats['recycled'] += len(reaped)
+        return reaped
+
+    def _open(self):
+        conn = self._connect()
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats['created'] += 1
+        return conn
+
+    def _close(self, conn):
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._stats['closed'] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    """
+    Returns the process-wide connection pool, creating it on first use.
+    The pool is rebuilt after a fork so workers never share sockets.
+    """
+    global _db_pool
+    pool = _db_pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool.pid != os.getpid():
+            config = current_app.config
+            logger = current_app.logger
+
+            def connect():
+                try:
+                    return pymysql.connect(
+                        host=config['MYSQL_HOST'],
+                        user=config['MYSQL_USER'],
+                        password=config['MYSQL_PASSWORD'],
+                        database=config['MYSQL_DB'],
+                        cursorclass=InstrumentedDictCursor
+                    )
+                except Exception as e:
+                    logger.error(f"Database connection failed: {e}")
+                    raise ConnectionError("Could not connect to the database.") from e
+
+            pool = ConnectionPool(
+                connect,
+                min_size=config['DATABASE_POOL_MIN_SIZE'],
+                max_size=config['DATABASE_POOL_SIZE'],
+                timeout=config['DATABASE_POOL_TIMEOUT'],
+                max_idle=config['DATABASE_POOL_MAX_IDLE'],
+                max_lifetime=config['DATABASE_POOL_MAX_LIFETIME'],
+                ping_interval=config['DATABASE_POOL_PING_INTERVAL'],
+                on_checkout=request_metrics.observe_pool_wait,
+            )
+            pool.fill()
+            _db_pool = pool
+        return _db_pool
+
 def get_db():
     """
-    Establishes a connection to the MySQL database and stores it on Flask's g object.
+    Checks a connection out of the pool and stores it on Flask's g object.
     Uses DictCursor to fetch results as dictionaries.
     """
     if 'db_conn' not in g:
-        try:
-            g.db_conn = pymysql.connect(
-                host=current_app.config['MYSQL_HOST'],
-                user=current_app.config['MYSQL_USER'],
-                password=current_app.config['MYSQL_PASSWORD'],
-                database=current_app.config['MYSQL_DB'],
-                cursorclass=pymysql.cursors.DictCursor
-            )
-        except Exception as e:
-            current_app.logger.error(f"Database connection failed: {e}")
-            raise ConnectionError("Could not connect to the database.") from e
+        g.db_conn = get_db_pool().acquire()
     return g.db_conn
 
 @app.teardown_appcontext
 def close_db_connection(exception):
-    """Closes the database connection at the end of the request."""
+    """Returns the request's database connection to the pool."""
     db_conn = g.pop('db_conn', None)
     if db_conn is not None:
-        db_conn.close()
+        # A failed request may have left the connection in an unknown state
+        get_db_pool().release(db_conn, discard=isinstance(exception, pymysql.Error))
 
 def execute_db_query(query, params=None, fetch_one=False, commit=False):
     """
@@ -84,6 +938,89 @@ def execute_db_query(query, params=None, fetch_one=False, commit=False):
         # Re-raise to be caught by the decorator
         raise e
 
+@contextmanager
+def db_transaction():
+    """
+    Runs several statements on the request's connection as one atomic unit.
+    Yields a cursor; commits when the block exits cleanly, rolls back otherwise.
+    """
+    conn = get_db()
+    try:
+        with conn.cursor() as cursor:
+            yield cursor
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def run_pooled_query(pool, query, params=None, fetch_one=False):
+    """Runs one read query on its own pooled connection (safe to call off the request thread)."""
+    conn = pool.acquire()
+    discard = False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone() if fetch_one else cursor.fetchall()
+    except pymysql.Error:
+        discard = True
+        raise
+    finally:
+        pool.release(conn, discard=discard)
+
+_query_executor = None
+_query_executor_pid = None
+
+def get_query_executor():
+    """Returns the process-wide bounded thread pool used by fetch_concurrently."""
+    global _query_executor, _query_executor_pid
+    with _db_pool_lock:
+        if _query_executor is None or _query_executor_pid != os.getpid():
+            _query_executor = ThreadPoolExecutor(
+                max_workers=current_app.config['QUERY_FANOUT_WORKERS'],
+                thread_name_prefix='query-fanout'
+            )
+            _query_executor_pid = os.getpid()
+        return _query_executor
+
+def fetch_concurrently(queries, timeout=None):
+    """
+    Fans independent read queries out across pooled connections and gathers the results.
+
+    `queries` maps a name to (query, params) or (query, params, fetch_one).
+    Returns (results, errors): results maps each successful name to its rows,
+    errors maps each failed or timed-out name to a short message. A query that
+    overruns `timeout` keeps its connection until it finishes, but the caller
+    stops waiting for it.
+    """
+    pool = get_db_pool()
+    executor = get_query_executor()
+    # Each task runs in a copy of this context so its queries count toward this request's metrics
+    futures = {
+        executor.submit(contextvars.copy_context().run, run_pooled_query, pool, *spec): name
+        for name, spec in queries.items()
+    }
+    finished, unfinished = wait_futures(futures, timeout=timeout)
+
+    results = {}
+    errors = {}
+    for future in finished:
+        name = futures[future]
+        try:
+            results[name] = future.result()
+        except (ConnectionError, pymysql.Error) as e:
+            current_app.logger.error(f"Concurrent query '{name}' failed: {e}")
+            errors[name] = 'A database error occurred.'
+        except Exception as e:
+            # Anything else (e.g. a row that fails to decode) only costs this one result
+            current_app.logger.error(f"Concurrent query '{name}' failed: {e}", exc_info=e)
+            errors[name] = 'An unexpected error occurred.'
+    for future in unfinished:
+        name = futures[future]
+        future.cancel()  # Only helps if it never got a worker thread
+        current_app.logger.warning(f"Concurrent query '{name}' timed out after {timeout}s")
+        errors[name] = 'Timed out'
+    return results, errors
+
 def handle_db_error(func):
     """
     Decorator for handling database errors (ConnectionError or PyMySQL.Error).
@@ -98,6 +1035,9 @@ def handle_db_error(func):
             # Optionally log the exception details
             current_app.logger.error(error_message, exc_info=True)
             return jsonify({'error': 'A database error occurred.', 'detail': str(e)}), 500
+        except PasswordHasherBusy as e:
+            # Shed load fast instead of queueing more CPU-heavy hashing
+            return jsonify({'error': str(e)}), e.status, {'Retry-After': str(e.retry_after)}
         except Exception as e:
             # Catch other unexpected errors
             current_app.logger.error(f"Unexpected Error: {e}", exc_info=True)
@@ -107,32 +1047,396 @@ def handle_db_error(func):
 
 # --- Configuration for Token (You need to set a SECRET_KEY) ---
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'your_strong_secret_key') 
+app.config['TOKEN_CACHE_SIZE'] = int(os.getenv('TOKEN_CACHE_SIZE', 10000)) # Max verified tokens kept in memory
+app.config['TOKEN_CACHE_TTL'] = float(os.getenv('TOKEN_CACHE_TTL', 300)) # Seconds before a cached token is re-checked against the DB
+# Stateless mode trusts a valid, unrevoked signature and skips the user existence query entirely
+app.config['AUTH_STATELESS_TOKENS'] = os.getenv('AUTH_STATELESS_TOKENS', 'true').lower() == 'true'
+app.config['AUTH_TOKEN_TTL'] = int(os.getenv('AUTH_TOKEN_TTL', 86400)) # Seconds a login token stays valid
+app.config['TOKEN_CLOCK_LEEWAY'] = int(os.getenv('TOKEN_CLOCK_LEEWAY', 30)) # Clock skew tolerated on exp/iat
+app.config['TOKEN_REVOCATION_REFRESH'] = float(os.getenv('TOKEN_REVOCATION_REFRESH', 5)) # Seconds between pulls of other workers' revocations
+app.config['TOKEN_REVOCATION_CAPACITY'] = int(os.getenv('TOKEN_REVOCATION_CAPACITY', 100000)) # Revoked tokens the bloom filter is sized for
+
+
+class TokenCache:
+    """
+    In-process LRU cache of verified tokens, keyed by the JWT signature segment.
+
+    Each entry lives for at most `ttl` seconds and never beyond the token's own
+    exp claim. A per-user index allows every token of a user to be dropped when
+    that user is updated or deleted.
+    """
+
+    def __init__(self, max_size=10000, ttl=300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # signature -> (token, user_data, expires_at)
+        self._by_user = {}  # user_id -> set of signatures
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, token):
+        """Returns the cached user data for a token, or None on a miss."""
+        signature = token.rpartition('.')[2]
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is not None:
+                cached_token, user_data, expires_at = entry
+                if cached_token == token and time.time() < expires_at:
+                    self._entries.move_to_end(signature)
+                    self.hits += 1
+                    return user_data
+                self._remove(signature)
+            self.misses += 1
+            return None
+
+    def put(self, token, user_data, token_exp=None):
+        """Caches user data for a verified token, bounded by the token's exp (epoch seconds)."""
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        signature = token.rpartition('.')[2]
+        with self._lock:
+            self._remove(signature)
+            self._entries[signature] = (token, user_data, expires_at)
+            self._by_user.setdefault(user_data['user_id'], set()).add(signature)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id):
+        """Drops every cached token belonging to user_id."""
+        with self._lock:
+            for signature in list(self._by_user.get(user_id, ())):
+                self._remove(signature)
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'invalidations': self.invalidations,
+            }
+
+    def _remove(self, signature):
+        """Removes one entry and its user index reference. Caller must hold the lock."""
+        entry = self._entries.pop(signature, None)
+        if entry is None:
+            return
+        user_id = entry[1]['user_id']
+        signatures = self._by_user.get(user_id)
+        if signatures is not None:
+            signatures.discard(signature)
+            if not signatures:
+                del self._by_user[user_id]
+
+
+token_cache = TokenCache(app.config['TOKEN_CACHE_SIZE'], app.config['TOKEN_CACHE_TTL'])
+
+class TokenError(ValueError):
+    """Raised by verify_token for a malformed, forged or expired token."""
+
+
+def b64url_encode(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+def b64url_decode(segment):
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+def sign_token(claims, secret):
+    """Encodes claims as a compact HS256 JWT, using only hmac/hashlib."""
+    header = b64url_encode(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = b64url_encode(json.dumps(claims, separators=(',', ':')).encode())
+    signing_input = f"{header}.{payload}".encode()
+    signature = hmac.new(secret.encode(), signing_input, hashlib.sha256).digest()
+    return f"{header}.{payload}.{b64url_encode(signature)}"
+
+def verify_token(token, secret, leeway=0):
+    """
+    Checks an HS256 JWT (ours or one issued earlier by PyJWT) and returns its
+    claims. Requires a constant-time signature match, an exp in the future, an
+    iat that is not in the future and a user_id, each with `leeway` seconds of
+    clock skew. Raises TokenError.
+    """
+    try:
+        header_segment, payload_segment, signature_segment = token.split('.')
+        header = json.loads(b64url_decode(header_segment))
+        signature = b64url_decode(signature_segment)
+    except ValueError as e:
+        raise TokenError('Malformed token') from e
+    if not isinstance(header, dict) or header.get('alg') != 'HS256':
+        raise TokenError('Unsupported token algorithm')
+
+    expected = hmac.new(secret.encode(), f"{header_segment}.{payload_segment}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise TokenError('Invalid token signature')
+
+    try:
+        claims = json.loads(b64url_decode(payload_segment))
+    except ValueError as e:
+        raise TokenError('Malformed token') from e
+    if not isinstance(claims, dict) or not isinstance(claims.get('user_id'), str):
+        raise TokenError('Token has no user')
+
+    def numeric(name):
+        value = claims.get(name)
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    now = time.time()
+    if not numeric('exp') or claims['exp'] <= now - leeway:
+        raise TokenError('Token expired')
+    if 'iat' in claims and (not numeric('iat') or claims['iat'] > now + leeway):
+        raise TokenError('Token issued in the future')
+    return claims
+
+def token_identifier(token, claims):
+    """The id a single token is revoked under: its jti, or a digest of the signature for older tokens."""
+    return claims.get('jti') or hashlib.sha256(token.rpartition('.')[2].encode()).hexdigest()[:32]
+
+def issue_token(user_id):
+    """A signed login token for user_id, valid for AUTH_TOKEN_TTL seconds."""
+    now = time.time()
+    claims = {
+        'user_id': user_id,
+        'iat': round(now, 3),  # Sub-second, so a revocation and a fresh login in the same second stay ordered
+        'exp': int(now + current_app.config['AUTH_TOKEN_TTL']),
+        'jti': uuid.uuid4().hex,
+    }
+    return sign_token(claims, current_app.config['SECRET_KEY'])
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (k positions by double hashing one blake2b digest)."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenRevocations:
+    """
+    In-memory view of the token_revocation table, so checking a token costs no
+    query. Single tokens (logout) are looked up in a bloom filter first; only
+    its rare positives touch the exact set. Whole users (password change,
+    deletion) are a per-user cutoff compared with the token's iat.
+
+    Revocations made in this process apply immediately; a background thread
+    pulls other workers' revocations every refresh_interval seconds by
+    revocation_id, and rebuilds everything from unexpired rows once an hour so
+    the filter does not fill up with entries for long-expired tokens. Each
+    pull also re-reads rows created in the last few intervals, because
+    AUTO_INCREMENT ids can commit out of order: a row with a lower id than one
+    already seen would otherwise be missed until the next rebuild.
+    """
+
+    FULL_RELOAD_INTERVAL = 3600
+    REREAD_INTERVALS = 3 # Refresh intervals of recent rows every pull re-reads
+    MIN_REREAD_WINDOW = 60 # Seconds
+
+    def __init__(self, app, refresh_interval, capacity):
+        self.app = app
+        self.refresh_interval = refresh_interval
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset()
+        self._stats = {'checks': 0, 'revoked_hits': 0, 'bloom_false_positives': 0, 'refresh_errors': 0}
+
+    def _reset(self):
+        self._filter = BloomFilter(self.capacity)
+        self._token_ids = set()
+        self._user_cutoffs = {}  # user_id -> epoch seconds; tokens issued before are revoked
+        self._last_id = 0
+        self._loaded_at = 0.0
+
+    def ensure_started(self):
+        """Loads the table and starts the refresh thread, once per process (one query at startup, none per request)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._reset()
+        try:
+            self.refresh(full=True)
+        except Exception as e:
+            with self._lock:
+                self._stats['refresh_errors'] += 1
+            current_app.logger.error(f"Could not load token revocations: {e}")
+        threading.Thread(target=self._run, name='token-revocations', daemon=True).start()
+
+    def is_revoked(self, token, claims):
+        with self._lock:
+            self._stats['checks'] += 1
+            cutoff = self._user_cutoffs.get(claims['user_id'])
+            if cutoff is not None and claims.get('iat', 0) < cutoff:
+                self._stats['revoked_hits'] += 1
+                return True
+            token_id = token_identifier(token, claims)
+            if token_id not in self._filter:
+                return False
+            if token_id in self._token_ids:
+                self._stats['revoked_hits'] += 1
+                return True
+            self._stats['bloom_false_positives'] += 1
+            return False
+
+    def revoke_token(self, token, claims):
+        """Revokes one token (logout) until it would have expired anyway."""
+        token_id = token_identifier(token, claims)
+        execute_db_query(
+            "INSERT INTO token_revocation (user_id, token_id, expires_at) VALUES (%s, %s, %s)",
+            (claims['user_id'], token_id, datetime.utcfromtimestamp(claims['exp'])), commit=True
+        )
+        with self._lock:
+            self._add_token(token_id)
+
+    def revoke_user(self, user_id):
+        """Revokes every token user_id holds now (password change, deletion)."""
+        now = time.time()
+        execute_db_query(
+            "INSERT INTO token_revocation (user_id, revoked_before, expires_at) VALUES (%s, %s, %s)",
+            (user_id, datetime.utcfromtimestamp(now),
+             datetime.utcfromtimestamp(now + current_app.config['AUTH_TOKEN_TTL'])),
+            commit=True
+        )
+        with self._lock:
+            self._add_cutoff(user_id, now)
+
+    def refresh(self, full=False):
+        """Applies rows added since the last refresh (re-reading recent ones), or rebuilds from every unexpired row."""
+        if full:
+            rows = execute_db_query("""
+                SELECT revocation_id, user_id, token_id, revoked_before
+                FROM token_revocation
+                WHERE expires_at > UTC_TIMESTAMP()
+                ORDER BY revocation_id
+            """)
+        else:
+            reread_window = max(self.MIN_REREAD_WINDOW, self.refresh_interval * self.REREAD_INTERVALS)
+            rows = execute_db_query("""
+                SELECT revocation_id, user_id, token_id, revoked_before
+                FROM token_revocation
+                WHERE revocation_id > %s OR created_at >= NOW(6) - INTERVAL %s SECOND
+                ORDER BY revocation_id
+            """, (self._last_id, reread_window))
+        with self._lock:
+            if full:
+                local_cutoffs = self._user_cutoffs
+                self._filter = BloomFilter(max(self.capacity, len(rows) * 2))
+                self._token_ids = set()
+                self._user_cutoffs = {}
+                # Keep this process's own revocations if their rows are not visible yet
+                for user_id, cutoff in local_cutoffs.items():
+                    self._add_cutoff(user_id, cutoff)
+                self._loaded_at = time.monotonic()
+            for row in rows:
+                if row['token_id']:
+                    self._add_token(row['token_id'])
+                elif row['revoked_before'] is not None:
+                    self._add_cutoff(row['user_id'], calendar.timegm(row['revoked_before'].timetuple())
+                                     + row['revoked_before'].microsecond / 1e6)
+                self._last_id = max(self._last_id, row['revocation_id'])
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self._stats,
+                revoked_tokens=len(self._token_ids),
+                revoked_users=len(self._user_cutoffs),
+                filter_bits=self._filter.size,
+                filter_hashes=self._filter.hashes,
+            )
+
+    def _add_token(self, token_id):
+        # Caller holds the lock. Past capacity, grow the filter so its error rate holds.
+        if len(self._token_ids) >= self._filter.capacity:
+            self._filter = BloomFilter(self._filter.capacity * 2)
+            for existing in self._token_ids:
+                self._filter.add(existing)
+        self._token_ids.add(token_id)
+        self._filter.add(token_id)
+
+    def _add_cutoff(self, user_id, cutoff):
+        # Caller holds the lock
+        self._user_cutoffs[user_id] = max(cutoff, self._user_cutoffs.get(user_id, cutoff))
+
+    def _run(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                with self.app.app_context():
+                    self.refresh(full=time.monotonic() - self._loaded_at > self.FULL_RELOAD_INTERVAL)
+            except Exception as e:
+                with self._lock:
+                    self._stats['refresh_errors'] += 1
+                self.app.logger.error(f"Token revocation refresh failed: {e}")
+
+
+token_revocations = TokenRevocations(
+    app, app.config['TOKEN_REVOCATION_REFRESH'], app.config['TOKEN_REVOCATION_CAPACITY']
+)
+
+@app.cli.command('prune-token-revocations')
+def prune_token_revocations():
+    """Delete revocations whose tokens have all expired."""
+    result = execute_db_query(
+        "DELETE FROM token_revocation WHERE expires_at <= UTC_TIMESTAMP()", commit=True
+    )
+    click.echo(f"Removed {result['rowcount']} expired token revocations.")
 
 # --- Helper Function for Token Validation ---
 def get_user_by_token(token):
     """
-    Decodes the token and attempts to retrieve the user_id. 
-    (Assuming token is a simple JWT for a slightly more robust example)
+    Verifies the token's signature and exp/iat and checks it against the
+    in-memory revocation list, with no database query. Only with
+    AUTH_STATELESS_TOKENS=false is the user also looked up (results are kept
+    in token_cache until they expire or the user changes).
     """
     try:
-        # Decode the token using your secret key
-        payload = jwt.decode(token, app.config['SECRET_KEY'], algorithms=["HS256"])
-        # In a real system, you'd check token expiration here
-        
-        # Check if the user exists in the database
-        user_query = "SELECT user_id, email FROM user WHERE user_id = %s"
-        user_data = execute_db_query(user_query, (payload['user_id'],), fetch_one=True)
-        return user_data 
-        
-    except jwt.ExpiredSignatureError:
-        # Handle expired token
+        claims = verify_token(token, app.config['SECRET_KEY'], app.config['TOKEN_CLOCK_LEEWAY'])
+    except TokenError:
         return None
-    except jwt.InvalidTokenError:
-        # Handle invalid signature or malformed token
+    token_revocations.ensure_started()
+    if token_revocations.is_revoked(token, claims):
         return None
+
+    if app.config['AUTH_STATELESS_TOKENS']:
+        return {'user_id': claims['user_id'], 'email': None}
+
+    user_data = token_cache.get(token)
+    if user_data is not None:
+        return user_data
+    try:
+        user_query = "SELECT user_id, email FROM user WHERE user_id = %s"
+        user_data = execute_db_query(user_query, (claims['user_id'],), fetch_one=True)
     except Exception:
         # Handle other errors (e.g., database connection issues)
         return None
+    if user_data:
+        token_cache.put(token, user_data, claims['exp'])
+    return user_data
 
 
 # --- Security Decorator ---
@@ -140,6 +1444,12 @@ def require_token(f):
     """Decorator to require a valid Bearer Token for API access and set g.user_id."""
     @wraps(f)
     def decorated(*args, **kwargs):
+        # Sub-requests of /api/batch were authenticated once by the batch itself
+        batch_user_id = g.get('batch_user_id')
+        if batch_user_id is not None:
+            g.authenticated_user_id = batch_user_id
+            return f(*args, **kwargs)
+
         auth_header = request.headers.get('Authorization')
         
         if not auth_header or not auth_header.startswith('Bearer '):
@@ -159,6 +1469,129 @@ def require_token(f):
     return decorated
 
 
+# ==================== PASSWORD HASHING ====================
+
+class PasswordHasherBusy(Exception):
+    """Raised when a hash cannot be computed now; handle_db_error turns it into `status` with Retry-After."""
+
+    def __init__(self, message, status, retry_after):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs werkzeug's password hashing and verification in a process pool, so
+    the ~100ms of CPU (and tens of MB) per scrypt call neither holds the GIL
+    nor piles up in request threads. Admission is bounded: past max_pending
+    calls in flight (running or queued) a call fails fast with 429, and a call
+    that waits longer than `timeout` fails with 503. Tracks call latency
+    (queue wait included) and the current queue depth.
+    """
+
+    def __init__(self, workers, max_pending, timeout, latency_window=1000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._latencies = {'hash': deque(maxlen=latency_window), 'verify': deque(maxlen=latency_window)}
+        self._stats = {'calls': 0, 'rejected': 0, 'timeouts': 0, 'rehashed': 0}
+
+    def hash(self, password, method):
+        return self._run('hash', generate_password_hash, password, method)
+
+    def verify(self, password_hash, password):
+        return self._run('verify', check_password_hash, password_hash, password)
+
+    def _get_executor(self):
+        # Caller holds the lock. Workers are spawned, not forked, so they never
+        # inherit the server's threads, sockets or locks.
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            self._pid = os.getpid()
+        return self._executor
+
+    def _run(self, kind, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise PasswordHasherBusy('Too many sign-in attempts in progress, retry shortly', 429, 1)
+            self._pending += 1
+            self._stats['calls'] += 1
+            executor = self._get_executor()
+        started = time.perf_counter()
+        try:
+            future = executor.submit(func, *args)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FuturesTimeoutError:
+                future.cancel()
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                raise PasswordHasherBusy('Password service is busy, retry shortly', 503, 5)
+            except BrokenProcessPool:
+                with self._lock:
+                    self._executor = None  # Rebuilt by the next call
+                raise PasswordHasherBusy('Password service is restarting, retry shortly', 503, 1)
+        finally:
+            with self._lock:
+                self._pending -= 1
+        with self._lock:
+            self._latencies[kind].append(time.perf_counter() - started)
+        return result
+
+    def record_rehash(self):
+        with self._lock:
+            self._stats['rehashed'] += 1
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        with self._lock:
+            latency = {}
+            for kind, samples in self._latencies.items():
+                ordered = sorted(samples)
+                latency[kind] = {
+                    'count': len(ordered),
+                    'p50_ms': round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+                    'p95_ms': round(ordered[int(len(ordered) * 0.95)] * 1000, 1) if ordered else None,
+                    'max_ms': round(ordered[-1] * 1000, 1) if ordered else None,
+                }
+            return dict(
+                self._stats,
+                workers=self.workers,
+                queue_depth=self._pending,
+                max_pending=self.max_pending,
+                latency=latency,
+            )
+
+
+password_hasher = PasswordHasher(
+    workers=app.config['PASSWORD_HASH_WORKERS'],
+    max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+    timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+)
+atexit.register(password_hasher.shutdown)
+
+def hash_password(password):
+    """Hashes a new password with the configured PASSWORD_HASH_METHOD, off the request thread."""
+    return password_hasher.hash(password, current_app.config['PASSWORD_HASH_METHOD'])
+
+def password_needs_rehash(password_hash):
+    """True when a stored hash was made with other parameters than PASSWORD_HASH_METHOD."""
+    return password_hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
+
+
 # ==================== AUTH ENDPOINTS ====================
 
 # FIXED: Changed paths from /auth/... to /api/auth/...
@@ -174,13 +1607,14 @@ def signup():
     
     user_id = str(uuid.uuid4())
     name = data.get('name', data['email'].split('@')[0]) # Default name to email prefix
-    password_hash = generate_password_hash(data['password'])
 
-    # Check if email already exists
+    # Check if email already exists (before spending a hash on it)
     check_query = "SELECT user_id FROM user WHERE email = %s"
     if execute_db_query(check_query, (data['email'],), fetch_one=True):
         return jsonify({'error': 'Email already registered'}), 409
 
+    password_hash = hash_password(data['password'])
+
     insert_query = """
         INSERT INTO user (user_id, name, email, password_hash)
         VALUES (%s, %s, %s, %s)
@@ -190,10 +1624,10 @@ def signup():
     result = execute_db_query(insert_query, params, commit=True)
     
     if result.get('rowcount', 0) > 0:
-        # Successful signup returns user info and a 'token' (which is the user_id for simplicity)
+        # Successful signup signs the user in straight away
         return jsonify({
             'message': 'User created successfully',
-            'token': user_id,
+            'token': issue_token(user_id),
             'user': {'user_id': user_id, 'email': data['email'], 'name': name}
         }), 201
     return jsonify({'error': 'Failed to create user'}), 500
@@ -219,17 +1653,22 @@ def login():
         return jsonify({'error': 'Invalid credentials'}), 401
 
     # 2. Check password
-    if check_password_hash(user['password_hash'], password):
+    if password_hasher.verify(user['password_hash'], password):
+        # Upgrade hashes made with older cost parameters while the password is at hand
+        if password_needs_rehash(user['password_hash']):
+            try:
+                new_hash = hash_password(password)
+            except PasswordHasherBusy:
+                pass  # Upgraded on a later login
+            else:
+                execute_db_query(
+                    "UPDATE user SET password_hash = %s WHERE user_id = %s AND password_hash = %s",
+                    (new_hash, user['user_id'], user['password_hash']), commit=True
+                )
+                password_hasher.record_rehash()
         
-        # 3. JWT GENERATION (NEW)
-        payload = {
-            'user_id': user['user_id'],
-            # Token expires 24 hours from now
-            'exp': datetime.utcnow() + timedelta(hours=24), 
-            'iat': datetime.utcnow()
-        }
-        # Encode the payload into a token
-        token = jwt.encode(payload, current_app.config['SECRET_KEY'], algorithm="HS256")
+        # 3. JWT GENERATION (expires after AUTH_TOKEN_TTL, 24 hours by default)
+        token = issue_token(user['user_id'])
         
         # 4. Return the token and essential user details
         return jsonify({
@@ -241,25 +1680,30 @@ def login():
         return jsonify({'error': 'Invalid credentials'}), 401
 
 
+@app.route('/api/auth/logout', methods=['POST'])
+@handle_db_error
+@require_token
+def logout():
+    """Revoke the bearer token, on every worker, until it would have expired."""
+    token = request.headers['Authorization'].split(' ')[1]
+    claims = verify_token(token, current_app.config['SECRET_KEY'], current_app.config['TOKEN_CLOCK_LEEWAY'])
+    token_revocations.revoke_token(token, claims)
+    token_cache.invalidate_user(claims['user_id'])
+    return jsonify({'message': 'Logged out'}), 200
+
+
 @app.route('/api/auth/me', methods=['GET'])
 @handle_db_error
+@require_token
 def me():
-    """Retrieve current user info based on Authorization header (User ID as Bearer Token)."""
-    # We assume the Bearer token IS the user_id for simple session management
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return jsonify({'error': 'Authorization token required'}), 401
-    
-    # Extract user_id from "Bearer <user_id>"
-    user_id = auth_header.split(' ')[1]
-    
+    """Retrieve current user info for the signed Bearer token."""
     query = "SELECT user_id, name, email FROM user WHERE user_id = %s"
-    user = execute_db_query(query, (user_id,), fetch_one=True)
+    user = execute_db_query(query, (g.authenticated_user_id,), fetch_one=True)
 
     if user:
         return jsonify({'user': user}), 200
     
-    # If the user_id from the token is invalid
+    # The token is valid but its user no longer exists
     return jsonify({'error': 'Invalid or expired token'}), 401
 
 
@@ -294,7 +1738,7 @@ def create_user():
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    password_hash = generate_password_hash(data['password'])
+    password_hash = hash_password(data['password'])
     
     query = """
         INSERT INTO user (user_id, name, email, password_hash)
@@ -327,7 +1771,7 @@ def update_user(user_id):
     if 'password' in data:
         # Only update password if a new one is provided
         update_fields.append("password_hash = %s")
-        values.append(generate_password_hash(data['password']))
+        values.append(hash_password(data['password']))
     
     if not update_fields:
         return jsonify({'error': 'No fields to update'}), 400
@@ -337,21 +1781,673 @@ def update_user(user_id):
     query = f"UPDATE user SET {', '.join(update_fields)} WHERE user_id = %s"
     
     result = execute_db_query(query, tuple(values), commit=True)
+    if 'password' in data and result.get('rowcount', 0) > 0:
+        # Sign out every session that was opened with the old password
+        token_revocations.revoke_user(user_id)
+    token_cache.invalidate_user(user_id)
     
     if result.get('rowcount', 0) > 0:
         return jsonify({'message': 'User updated successfully'}), 200
     return jsonify({'error': 'User not found or no changes made'}), 404
 
-@app.route('/api/users/<user_id>', methods=['DELETE'])
-@handle_db_error
-def delete_user(user_id):
-    """Delete user"""
-    query = "DELETE FROM user WHERE user_id = %s"
-    result = execute_db_query(query, (user_id,), commit=True)
-    
-    if result.get('rowcount', 0) > 0:
-        return jsonify({'message': 'User deleted successfully'}), 200
-    return jsonify({'error': 'User not found'}), 404
+@app.route('/api/users/<user_id>', methods=['DELETE'])
+@handle_db_error
+def delete_user(user_id):
+    """Delete user"""
+    query = "DELETE FROM user WHERE user_id = %s"
+    result = execute_db_query(query, (user_id,), commit=True)
+    if result.get('rowcount', 0) > 0:
+        token_revocations.revoke_user(user_id)
+    token_cache.invalidate_user(user_id)
+    
+    if result.get('rowcount', 0) > 0:
+        return jsonify({'message': 'User deleted successfully'}), 200
+    return jsonify({'error': 'User not found'}), 404
+
+
+# ==================== CHANGE HOOKS ====================
+
+def on_user_data_changed(user_id, entity):
+    """
+    Called after a committed write to one of a user's rows (entity is the table
+    name, e.g. 'transaction'). Drops derived state that depends on that data.
+    """
+    if entity in DASHBOARD_ENTITIES:
+        dashboard_cache.invalidate(user_id)
+    event_hub.publish(user_id, 'change', {'entity': entity})
+
+
+# ==================== EVENT STREAM ====================
+
+class StreamLimitError(Exception):
+    """Raised when a worker already serves EVENT_STREAM_MAX_PER_WORKER streams."""
+
+
+class LocalEventPublisher:
+    """Delivers published events straight to this process's hub."""
+
+    def __init__(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, user_id, event):
+        self._deliver(user_id, event)
+
+    def close(self):
+        pass
+
+
+class LoopbackBrokerPublisher:
+    """
+    Stand-in for an external broker that fans events out to every worker on
+    this host. Each worker binds an ephemeral UDP port on 127.0.0.1 and
+    registers it as a file in a shared directory; publish() sends one datagram
+    per registered port (its own included) and a listener thread hands
+    received events to the hub.
+    """
+
+    def __init__(self, deliver, directory):
+        self._deliver = deliver
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(('127.0.0.1', 0))
+        self._registration = os.path.join(directory, f"{self._sock.getsockname()[1]}.port")
+        open(self._registration, 'w').close()
+        threading.Thread(target=self._listen, name='event-broker', daemon=True).start()
+        atexit.register(self.close)
+
+    def publish(self, user_id, event):
+        payload = json.dumps({'user_id': user_id, 'event': event}).encode()
+        for name in os.listdir(self._directory):
+            port, _, suffix = name.partition('.')
+            if suffix != 'port' or not port.isdigit():
+                continue
+            try:
+                self._sock.sendto(payload, ('127.0.0.1', int(port)))
+            except OSError:
+                pass  # A worker that exited without unregistering
+
+    def _listen(self):
+        while True:
+            try:
+                payload, _ = self._sock.recvfrom(65535)
+            except ConnectionResetError:
+                continue  # Windows reports an unreachable peer on the next recv
+            except OSError:
+                return  # Socket closed
+            try:
+                message = json.loads(payload)
+                self._deliver(message['user_id'], message['event'])
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def close(self):
+        try:
+            os.remove(self._registration)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class Subscription:
+    """One open event stream: a bounded queue of events for a single user."""
+
+    def __init__(self, user_id, queue_size):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class EventHub:
+    """
+    In-process pub/sub of per-user change events. publish() goes through a
+    swappable publisher (LocalEventPublisher for one process,
+    LoopbackBrokerPublisher or a real broker for several), which calls
+    dispatch() in every worker. dispatch() records the event in a short
+    per-user backlog for Last-Event-ID resume and queues it for that user's
+    open streams. A stream that falls too far behind is told to resync.
+    """
+
+    def __init__(self, publisher_factory, max_streams, backlog_size, queue_size=256, max_users=10000):
+        self._publisher_factory = publisher_factory
+        self._publisher = None
+        self._publisher_pid = None
+        self.max_streams = max_streams
+        self.backlog_size = backlog_size
+        self.queue_size = queue_size
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user_id -> set of Subscription
+        self._backlogs = OrderedDict()  # user_id -> deque of events, LRU by activity
+        self._origin = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._streams = 0
+        self._published = 0
+        self._delivered = 0
+        self._rejected = 0
+        self._overflows = 0
+
+    def _get_publisher(self):
+        # Publishers own sockets/threads, so each forked worker builds its own
+        with self._lock:
+            if self._publisher is None or self._publisher_pid != os.getpid():
+                self._publisher = self._publisher_factory(self.dispatch)
+                self._publisher_pid = os.getpid()
+            return self._publisher
+
+    def publish(self, user_id, event_type, data):
+        """Publishes an event to all of the user's streams, on every worker."""
+        with self._lock:
+            self._seq += 1
+            self._published += 1
+            event = {'id': f"{self._origin}-{self._seq}", 'type': event_type, 'data': data}
+        try:
+            self._get_publisher().publish(user_id, event)
+        except Exception:
+            # Push is best effort; clients still converge through /api/sync
+            app.logger.warning("Event publish failed for user %s", user_id, exc_info=True)
+
+    def dispatch(self, user_id, event):
+        """Delivers an event received from the publisher to local streams."""
+        with self._lock:
+            backlog = self._backlogs.get(user_id)
+            if backlog is None:
+                backlog = self._backlogs[user_id] = deque(maxlen=self.backlog_size)
+                if len(self._backlogs) > self.max_users:
+                    self._backlogs.popitem(last=False)
+            else:
+                self._backlogs.move_to_end(user_id)
+            backlog.append(event)
+            subscribers = list(self._subscribers.get(user_id, ()))
+        delivered = overflows = 0
+        for sub in subscribers:
+            try:
+                sub.queue.put_nowait(event)
+                delivered += 1
+            except queue.Full:
+                sub.overflowed = True
+                overflows += 1
+        with self._lock:
+            self._delivered += delivered
+            self._overflows += overflows
+
+    def subscribe(self, user_id):
+        """Opens a stream for the user. Raises StreamLimitError at the cap."""
+        self._get_publisher()
+        with self._lock:
+            if self._streams >= self.max_streams:
+                self._rejected += 1
+                raise StreamLimitError(f"{self.max_streams} event streams already open")
+            sub = Subscription(user_id, self.queue_size)
+            self._subscribers.setdefault(user_id, set()).add(sub)
+            self._streams += 1
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs and sub in subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+                self._streams -= 1
+
+    def replay(self, user_id, last_event_id):
+        """
+        Returns the user's events after last_event_id, or None when that id is
+        no longer (or was never) in the backlog and the client must resync.
+        """
+        with self._lock:
+            events = list(self._backlogs.get(user_id, ()))
+        for index, event in enumerate(events):
+            if event['id'] == last_event_id:
+                return events[index + 1:]
+        return None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'streams': self._streams,
+                'max_streams': self.max_streams,
+                'published': self._published,
+                'delivered': self._delivered,
+                'rejected': self._rejected,
+                'overflows': self._overflows,
+                'users_with_backlog': len(self._backlogs),
+            }
+
+
+def create_event_publisher(deliver):
+    """Builds the publisher selected by EVENT_PUBLISHER."""
+    if app.config['EVENT_PUBLISHER'] == 'loopback':
+        return LoopbackBrokerPublisher(deliver, app.config['EVENT_BROKER_DIR'])
+    return LocalEventPublisher(deliver)
+
+event_hub = EventHub(
+    create_event_publisher,
+    max_streams=app.config['EVENT_STREAM_MAX_PER_WORKER'],
+    backlog_size=app.config['EVENT_BACKLOG_SIZE'],
+)
+
+def format_sse(event):
+    """Serialises an event in text/event-stream framing."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+@app.route('/api/events', methods=['GET'])
+@handle_db_error
+def stream_events():
+    """
+    Long-lived Server-Sent Events stream of the authenticated user's change
+    events ({"entity": "transaction"} etc.). EventSource cannot send headers,
+    so the token may also be passed as ?token=. On reconnect the browser's
+    Last-Event-ID header resumes from the backlog; if the id is too old a
+    'resync' event tells the client to catch up through /api/sync.
+    """
+    auth_header = request.headers.get('Authorization', '')
+    token = auth_header[len('Bearer '):] if auth_header.startswith('Bearer ') else request.args.get('token')
+    user_data = get_user_by_token(token) if token else None
+    if not user_data:
+        return jsonify({'error': 'Invalid or expired token'}), 401
+    user_id = user_data['user_id']
+
+    try:
+        sub = event_hub.subscribe(user_id)
+    except StreamLimitError:
+        return jsonify({'error': 'Too many open event streams, retry later'}), 503, {'Retry-After': '30'}
+
+    # Subscribe before reading the backlog so nothing published in between is lost
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    backlog = event_hub.replay(user_id, last_event_id) if last_event_id else []
+    heartbeat = current_app.config['EVENT_STREAM_HEARTBEAT']
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            replayed = set()
+            if backlog is None:
+                yield format_sse({'id': '', 'type': 'resync', 'data': {}})
+            else:
+                for event in backlog:
+                    replayed.add(event['id'])
+                    yield format_sse(event)
+            while True:
+                if sub.overflowed:
+                    yield format_sse({'id': '', 'type': 'resync', 'data': {}})
+                    return
+                try:
+                    event = sub.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Keeps proxies from timing out and surfaces closed connections
+                    yield ": heartbeat\n\n"
+                    continue
+                if event['id'] not in replayed:
+                    yield format_sse(event)
+        finally:
+            event_hub.unsubscribe(sub)
+
+    # Not wrapped in stream_with_context: the request's pooled DB connection is
+    # released as soon as this view returns instead of being held by the stream.
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    # A response closed before its first chunk never runs generate()'s cleanup
+    response.call_on_close(lambda: event_hub.unsubscribe(sub))
+    return response
+
+
+# ==================== DELTA SYNC ====================
+
+# entity -> (table, primary key, columns sent to clients). The primary key is
+# always sent as `id`, and only client-facing columns are listed, so internal
+# ones (import_hash, next_fire_at, due_day, ...) never leave the server. Every
+# synced table carries updated_at (bumped by MySQL on insert/update) and an
+# idx_user_updated index; deletes leave a row in sync_tombstone.
+SYNC_ENTITIES = {
+    'transaction': ('transaction', 'transaction_id',
+                    "transaction_id AS id, user_id, name, type, amount, date, category, description, receipt_id, updated_at"),
+    'reminder': ('reminder', 'reminder_id',
+                 "reminder_id AS id, user_id, title, category, description, amount, due_date, recurring, created_at, updated_at"),
+    'budget': ('budget', 'budget_id',
+               "budget_id AS id, user_id, category, amount, period, start_date, end_date, is_exceeded, updated_at"),
+    'goal': ('goal', 'goal_id',
+             "goal_id AS id, user_id, name, target_amount, current_amount, deadline, updated_at"),
+    'notification': ('notification', 'notification_id',
+                     "notification_id AS id, user_id, content, type, is_read, created_at, updated_at"),
+}
+
+def record_tombstones(cursor, user_id, entity, entity_ids):
+    """
+    Records deleted rows of a synced entity so /api/sync can tell clients to
+    drop them. Runs on the caller's cursor, inside the deleting transaction.
+    """
+    cursor.executemany(
+        "INSERT INTO sync_tombstone (user_id, entity, entity_id) VALUES (%s, %s, %s)",
+        [(user_id, entity, str(entity_id)) for entity_id in entity_ids]
+    )
+
+def delete_tracked_row(entity, entity_id, user_id=None):
+    """
+    Deletes one row of a synced entity and records its tombstone atomically,
+    optionally scoped to an owner. Returns the owner's user_id, or None if no
+    row matched.
+    """
+    table, key, _ = SYNC_ENTITIES[entity]
+    condition = f"{key} = %s"
+    params = (entity_id,)
+    if user_id is not None:
+        condition += " AND user_id = %s"
+        params += (user_id,)
+
+    with db_transaction() as cursor:
+        cursor.execute(f"SELECT user_id FROM {table} WHERE {condition} FOR UPDATE", params)
+        row = cursor.fetchone()
+        if not row:
+            return None
+        cursor.execute(f"DELETE FROM {table} WHERE {condition}", params)
+        record_tombstones(cursor, row['user_id'], entity, [entity_id])
+    return row['user_id']
+
+@app.route('/api/sync', methods=['GET'])
+@handle_db_error
+@require_token
+def sync_changes():
+    """
+    Returns the authenticated user's transactions, reminders, budgets, goals
+    and notifications changed since ?since=<watermark> (everything when it is
+    omitted or older than the tombstone retention), the ids deleted since then
+    and the watermark for the next call. Changes close to the watermark are
+    sent again on the next poll, so clients must apply them as upserts by id.
+    """
+    user_id = g.authenticated_user_id
+    now = execute_db_query("SELECT NOW(6) AS now", fetch_one=True)['now']
+
+    since = None
+    if request.args.get('since'):
+        try:
+            (raw,) = decode_cursor(request.args['since'])
+            since = datetime.fromisoformat(raw)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid watermark'}), 400
+
+    retention = timedelta(days=current_app.config['SYNC_TOMBSTONE_RETENTION_DAYS'])
+    full = since is None or since < now - retention
+
+    queries = {}
+    for entity, (table, _, columns) in SYNC_ENTITIES.items():
+        query = f"SELECT {columns} FROM {table} WHERE user_id = %s"
+        params = (user_id,)
+        if not full:
+            query += " AND updated_at >= %s"
+            params += (since,)
+        queries[entity] = (query, params)
+    if not full:
+        queries['deleted'] = (
+            "SELECT entity, entity_id FROM sync_tombstone WHERE user_id = %s AND deleted_at >= %s",
+            (user_id, since)
+        )
+
+    results, errors = fetch_concurrently(queries)
+    if errors:
+        # Advancing the watermark past a failed entity would lose its changes
+        raise ConnectionError(f"Sync queries failed: {', '.join(sorted(errors))}")
+
+    deleted = {entity: [] for entity in SYNC_ENTITIES}
+    for row in results.get('deleted', []):
+        deleted[row['entity']].append(row['entity_id'])
+
+    # Rows stamped just before NOW(6) may belong to transactions that had not
+    # committed yet, so the next poll starts a grace period earlier.
+    watermark = now - timedelta(seconds=current_app.config['SYNC_COMMIT_GRACE'])
+    return jsonify({
+        'changes': {entity: results[entity] for entity in SYNC_ENTITIES},
+        'deleted': deleted,
+        'full': full,
+        'watermark': encode_cursor(watermark),
+    }), 200
+
+@app.cli.command('prune-tombstones')
+def prune_tombstones():
+    """Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."""
+    days = app.config['SYNC_TOMBSTONE_RETENTION_DAYS']
+    result = execute_db_query(
+        "DELETE FROM sync_tombstone WHERE deleted_at < NOW(6) - INTERVAL %s DAY", (days,), commit=True
+    )
+    click.echo(f"Removed {result['rowcount']} tombstones older than {days} days.")
+
+
+# ==================== AGGREGATE MAINTENANCE ====================
+
+def month_start(value):
+    """Returns the first day of the month for a date or a 'YYYY-MM-DD...' string."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.replace(day=1)
+
+def apply_transaction_deltas(cursor, user_id, transactions, sign=1):
+    """
+    Folds added (sign=1) or removed (sign=-1) transactions into the maintained
+    aggregate tables (financial_overview and monthly_rollup) with delta
+    arithmetic. Runs on the caller's cursor so the aggregates commit atomically
+    with the transaction write itself. Every write path that touches the
+    transaction table must call this.
+    """
+    income = Decimal(0)
+    expenses = Decimal(0)
+    rollup = {}  # (month, type, category) -> [amount delta, count delta]
+    for txn in transactions:
+        amount = Decimal(str(txn['amount'])) * sign
+        if txn['type'] == 'income':
+            income += amount
+        else:
+            expenses += amount
+        key = (month_start(txn['date']), txn['type'], txn.get('category') or '')
+        bucket = rollup.setdefault(key, [Decimal(0), 0])
+        bucket[0] += amount
+        bucket[1] += sign
+
+    if rollup:
+        cursor.executemany(
+            """
+            INSERT INTO monthly_rollup (user_id, month, type, category, total_amount, transaction_count)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_amount = total_amount + VALUES(total_amount),
+                transaction_count = transaction_count + VALUES(transaction_count)
+            """,
+            [(user_id, month, txn_type, category, amount, count)
+             for (month, txn_type, category), (amount, count) in rollup.items()]
+        )
+
+    if income or expenses:
+        cursor.execute(
+            """
+            INSERT INTO financial_overview (user_id, total_income, total_expenses, net_worth)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_income = total_income + VALUES(total_income),
+                total_expenses = total_expenses + VALUES(total_expenses),
+                net_worth = net_worth + VALUES(net_worth)
+            """,
+            (user_id, income, expenses, income - expenses)
+        )
+
+    expense_dates = {}  # category -> (earliest date, latest date)
+    for txn in transactions:
+        if txn['type'] != 'expense' or not txn.get('category'):
+            continue
+        txn_date = txn['date']
+        if isinstance(txn_date, str):
+            txn_date = date.fromisoformat(txn_date[:10])
+        earliest, latest = expense_dates.get(txn['category'], (txn_date, txn_date))
+        expense_dates[txn['category']] = (min(earliest, txn_date), max(latest, txn_date))
+    for category, (earliest, latest) in expense_dates.items():
+        # Only budgets whose window overlaps the written dates can flip
+        refresh_budget_exceeded(
+            cursor,
+            "b.user_id = %s AND b.category = %s AND b.start_date <= %s AND b.end_date >= %s",
+            (user_id, category, latest, earliest)
+        )
+
+def current_period_window(period, today):
+    """
+    Returns (start, end) of the current calendar period for a recurring budget
+    (weeks start on Sunday, as on the Budgets page), or None for one-time
+    budgets, which are measured over their own start_date..end_date.
+    """
+    if period == 'monthly':
+        start = today.replace(day=1)
+        return start, start + relativedelta(months=1) - timedelta(days=1)
+    if period == 'weekly':
+        start = today - timedelta(days=(today.weekday() + 1) % 7)
+        return start, start + timedelta(days=6)
+    if period == 'yearly':
+        return date(today.year, 1, 1), date(today.year, 12, 31)
+    return None
+
+BUDGET_PERIODS = ('monthly', 'weekly', 'yearly')
+
+# A budget is measured over its current period clamped to its own date range
+# (p is the derived table from budget_periods_sql, b the budget row).
+BUDGET_WINDOW_START = "GREATEST(b.start_date, COALESCE(p.period_start, b.start_date))"
+BUDGET_WINDOW_END = "LEAST(b.end_date, COALESCE(p.period_end, b.end_date))"
+
+def budget_periods_sql(today):
+    """
+    Builds a derived table (period, period_start, period_end) holding the
+    current window of every recurring period, for LEFT JOINing onto budget as
+    'p'. Returns (sql, params).
+    """
+    rows = []
+    params = []
+    for period in BUDGET_PERIODS:
+        rows.append("SELECT %s AS period, CAST(%s AS DATE) AS period_start, CAST(%s AS DATE) AS period_end")
+        params.extend((period, *current_period_window(period, today)))
+    return f"({' UNION ALL '.join(rows)})", params
+
+def refresh_budget_exceeded(cursor, where, params, today=None):
+    """
+    Recomputes budget.is_exceeded from the transaction table for the budgets
+    matching `where` (written against alias b). Runs on the caller's cursor so
+    the flag commits with the write that changed it.
+    """
+    periods, period_params = budget_periods_sql(today or date.today())
+    cursor.execute(
+        f"""
+        UPDATE budget b
+        LEFT JOIN {periods} p ON p.period = b.period
+        SET b.is_exceeded = (
+            SELECT COALESCE(SUM(t.amount), 0)
+            FROM transaction t
+            WHERE t.user_id = b.user_id
+                AND t.category = b.category
+                AND t.type = 'expense'
+                AND t.date BETWEEN {BUDGET_WINDOW_START} AND {BUDGET_WINDOW_END}
+        ) > b.amount
+        WHERE {where}
+        """,
+        (*period_params, *params)
+    )
+
+@app.cli.command('reconcile-overview')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting financial_overview.')
+def reconcile_overview(dry_run):
+    """Rebuild financial_overview from the transaction table and report drift."""
+    computed_totals = """
+        SELECT
+            u.user_id,
+            COALESCE(SUM(CASE WHEN t.type = 'income' THEN t.amount END), 0) AS total_income,
+            COALESCE(SUM(CASE WHEN t.type = 'expense' THEN t.amount END), 0) AS total_expenses
+        FROM user u
+        LEFT JOIN transaction t ON t.user_id = u.user_id
+        GROUP BY u.user_id
+    """
+    drift = execute_db_query(f"""
+        SELECT
+            c.user_id,
+            c.total_income, c.total_expenses,
+            fo.total_income AS stored_income, fo.total_expenses AS stored_expenses,
+            fo.net_worth AS stored_net_worth
+        FROM ({computed_totals}) c
+        LEFT JOIN financial_overview fo ON fo.user_id = c.user_id
+        WHERE fo.user_id IS NULL
+            OR fo.total_income <> c.total_income
+            OR fo.total_expenses <> c.total_expenses
+            OR fo.net_worth <> c.total_income - c.total_expenses
+    """)
+
+    for row in drift:
+        if row['stored_income'] is None:
+            click.echo(f"{row['user_id']}: missing overview row")
+            continue
+        click.echo(
+            f"{row['user_id']}: income {row['stored_income']} -> {row['total_income']}, "
+            f"expenses {row['stored_expenses']} -> {row['total_expenses']}, "
+            f"net_worth {row['stored_net_worth']} -> {row['total_income'] - row['total_expenses']}"
+        )
+    click.echo(f"{len(drift)} user(s) with drift.")
+
+    if dry_run:
+        return
+    # One INSERT ... SELECT, so the rebuild is atomic with respect to concurrent deltas
+    result = execute_db_query(f"""
+        INSERT INTO financial_overview (user_id, total_income, total_expenses, net_worth)
+        SELECT user_id, total_income, total_expenses, total_income - total_expenses
+        FROM ({computed_totals}) c
+        ON DUPLICATE KEY UPDATE
+            total_income = VALUES(total_income),
+            total_expenses = VALUES(total_expenses),
+            net_worth = VALUES(net_worth)
+    """, commit=True)
+    click.echo(f"Rebuilt financial_overview ({result['rowcount']} rows affected).")
+
+
+def rebuild_monthly_rollups(user_ids):
+    """Recomputes monthly_rollup rows for a batch of users in one database transaction."""
+    pool = get_db_pool()
+    conn = pool.acquire()
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DELETE FROM monthly_rollup WHERE user_id IN ({placeholders})", user_ids)
+            cursor.execute(f"""
+                INSERT INTO monthly_rollup (user_id, month, type, category, total_amount, transaction_count)
+                SELECT
+                    user_id,
+                    DATE_FORMAT(date, '%%Y-%%m-01'),
+                    type,
+                    COALESCE(category, ''),
+                    SUM(amount),
+                    COUNT(*)
+                FROM transaction
+                WHERE user_id IN ({placeholders})
+                GROUP BY user_id, DATE_FORMAT(date, '%%Y-%%m-01'), type, COALESCE(category, '')
+            """, user_ids)
+            inserted = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        pool.release(conn, discard=True)
+        raise
+    pool.release(conn)
+    return inserted
+
+@app.cli.command('backfill-rollups')
+@click.option('--batch-size', default=200, show_default=True, help='Users rebuilt per database transaction.')
+@click.option('--workers', default=4, show_default=True, help='Batches rebuilt concurrently.')
+def backfill_rollups(batch_size, workers):
+    """Rebuild monthly_rollup from the transaction table for every user."""
+    user_ids = [row['user_id'] for row in execute_db_query("SELECT user_id FROM user ORDER BY user_id")]
+    batches = [user_ids[i:i + batch_size] for i in range(0, len(user_ids), batch_size)]
+    click.echo(f"Rebuilding rollups for {len(user_ids)} users in {len(batches)} batches...")
+
+    done = rows = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for inserted in executor.map(rebuild_monthly_rollups, batches):
+            done += 1
+            rows += inserted
+            click.echo(f"  batch {done}/{len(batches)} done ({rows} rollup rows)")
+    click.echo("Done.")
 
 
 # ==================== TRANSACTION ENDPOINTS ====================
@@ -364,7 +2460,7 @@ def get_transactions(user_id):
     query = """
         SELECT 
             transaction_id AS id, user_id, name, type, amount, date, 
-            category, description, receipt_data
+            category, description, receipt_id
         FROM transaction 
         WHERE user_id = %s
         ORDER BY date DESC
@@ -373,6 +2469,221 @@ def get_transactions(user_id):
     # Ensure date fields are in a format the frontend expects (or handle conversion client-side)
     return jsonify(transactions), 200
 
+TRANSACTION_PAGE_DEFAULT_LIMIT = 50
+TRANSACTION_PAGE_MAX_LIMIT = 500
+
+def encode_cursor(*values):
+    """Packs keyset values into an opaque, URL-safe cursor string."""
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Reverses encode_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+def build_transaction_filters(args):
+    """
+    Translates query-string filters into SQL conditions on the transaction table.
+    Supports start_date, end_date (inclusive, YYYY-MM-DD), type, category
+    (comma-separated) and min_amount/max_amount. Raises ValueError on bad input.
+    """
+    clauses = []
+    params = []
+
+    for arg, op in (('start_date', '>='), ('end_date', '<=')):
+        if args.get(arg):
+            try:
+                params.append(date.fromisoformat(args[arg]))
+            except ValueError as e:
+                raise ValueError(f"{arg} must be YYYY-MM-DD") from e
+            clauses.append(f"date {op} %s")
+
+    if args.get('type'):
+        if args['type'] not in ('income', 'expense'):
+            raise ValueError("type must be 'income' or 'expense'")
+        clauses.append("type = %s")
+        params.append(args['type'])
+
+    if args.get('category'):
+        categories = [c.strip() for c in args['category'].split(',') if c.strip()]
+        if categories:
+            clauses.append(f"category IN ({', '.join(['%s'] * len(categories))})")
+            params.extend(categories)
+
+    for arg, op in (('min_amount', '>='), ('max_amount', '<=')):
+        if args.get(arg):
+            try:
+                params.append(Decimal(args[arg]))
+            except InvalidOperation as e:
+                raise ValueError(f"{arg} must be a number") from e
+            clauses.append(f"amount {op} %s")
+
+    return clauses, params
+
+@app.route('/api/transactions/<user_id>/page', methods=['GET'])
+@handle_db_error
+@require_token
+def get_transactions_page(user_id):
+    """
+    Fetch one page of a user's transactions, newest first.
+    Uses keyset pagination on (date, transaction_id) so every page is an index
+    range scan, no matter how deep the client pages. Pass the returned
+    next_cursor back as ?cursor= to get the following page.
+    """
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    try:
+        limit = int(request.args.get('limit', TRANSACTION_PAGE_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    limit = max(1, min(limit, TRANSACTION_PAGE_MAX_LIMIT))
+
+    try:
+        clauses, params = build_transaction_filters(request.args)
+        if request.args.get('cursor'):
+            cursor_date, cursor_id = decode_cursor(request.args['cursor'])
+            # Expanded row comparison so MySQL can range-scan idx_user_date_id
+            clauses.append("(date < %s OR (date = %s AND transaction_id < %s))")
+            params.extend([cursor_date, cursor_date, cursor_id])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    where = ' AND '.join(['user_id = %s'] + clauses)
+    query = f"""
+        SELECT 
+            transaction_id AS id, user_id, name, type, amount, date, 
+            category, description, receipt_id
+        FROM transaction 
+        WHERE {where}
+        ORDER BY date DESC, transaction_id DESC
+        LIMIT %s
+    """
+    # Fetch one extra row to learn whether another page exists
+    rows = execute_db_query(query, tuple([user_id] + params + [limit + 1]))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last['date'], last['id'])
+
+    return jsonify({
+        'transactions': rows,
+        'next_cursor': next_cursor,
+        'limit': limit
+    }), 200
+
+EXPORT_COLUMNS = ('transaction_id', 'date', 'name', 'type', 'amount', 'category', 'description', 'receipt_id')
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+EXPORT_FLUSH_BYTES = 64 * 1024 # Rows are buffered into chunks of roughly this size
+
+def iter_export_chunks(cursor, export_format, compress):
+    """
+    Serialises rows from an unbuffered cursor into CSV or NDJSON text and
+    yields it in ~EXPORT_FLUSH_BYTES chunks, gzip-compressed when requested.
+    Only one chunk of rows is held in memory at a time.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == 'csv':
+        writer.writerow(EXPORT_COLUMNS)
+
+    def drain():
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    for row in cursor:
+        values = [row[column] for column in EXPORT_COLUMNS]
+        if export_format == 'csv':
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), default=str) + '\n')
+        if buffer.tell() >= EXPORT_FLUSH_BYTES:
+            chunk = drain()
+            if chunk:
+                yield chunk
+    chunk = drain()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+@app.route('/api/transactions/<user_id>/export', methods=['GET'])
+@handle_db_error
+@require_token
+def export_transactions(user_id):
+    """
+    Streams the user's transactions (oldest first) as CSV or NDJSON
+    (?format=csv|ndjson), optionally limited by the same filters as the
+    paginated listing (start_date, end_date, ...) and gzip-encoded with
+    ?gzip=true. Rows come from an unbuffered server-side cursor, so memory
+    stays constant however many rows are exported.
+    """
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+    compress = request.args.get('gzip', 'false').lower() == 'true'
+
+    try:
+        clauses, params = build_transaction_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    where = ' AND '.join(['user_id = %s'] + clauses)
+    query = f"""
+        SELECT {', '.join(EXPORT_COLUMNS)}
+        FROM transaction
+        WHERE {where}
+        ORDER BY date, transaction_id
+    """
+
+    # A dedicated connection: an unbuffered result occupies it until the last
+    # row is read, long after this view (and the request's g.db) has returned.
+    pool = get_db_pool()
+    conn = pool.acquire()
+    state = {'complete': False}
+    try:
+        cursor = conn.cursor(InstrumentedSSDictCursor)
+        # Slow clients pause the read loop; keep the server from aborting the send
+        cursor.execute("SET SESSION net_write_timeout = %s", (current_app.config['EXPORT_NET_WRITE_TIMEOUT'],))
+        cursor.execute(query, tuple([user_id] + params))
+    except Exception:
+        pool.release(conn, discard=True)
+        raise
+
+    def generate():
+        yield from iter_export_chunks(cursor, export_format, compress)
+        cursor.close()
+        cursor_reset = conn.cursor()
+        cursor_reset.execute("SET SESSION net_write_timeout = DEFAULT")
+        cursor_reset.close()
+        state['complete'] = True
+
+    def release():
+        # An abandoned download leaves unread rows on the wire; drop that connection
+        pool.release(conn, discard=not state['complete'])
+
+    filename = f"transactions-{date.today().isoformat()}.{export_format}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"', 'Cache-Control': 'no-store'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    response = Response(generate(), mimetype=EXPORT_FORMATS[export_format], headers=headers)
+    response.call_on_close(release)
+    return response
+
 @app.route('/api/transactions', methods=['POST'])
 @handle_db_error
 @require_token
@@ -383,19 +2694,41 @@ def create_transaction():
     required_fields = ['user_id', 'name', 'type', 'amount', 'date'] 
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required transaction fields'}), 400
+    if data['user_id'] != g.authenticated_user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
     
+    receipt_id = data.get('receipt_id')
+    if receipt_id:
+        if not RECEIPT_ID_PATTERN.match(receipt_id):
+            return jsonify({'error': 'Invalid receipt_id'}), 400
+        # Only receipts the caller uploaded; a digest seen elsewhere is not enough
+        if not execute_db_query(
+            "SELECT 1 FROM receipt_owner WHERE receipt_id = %s AND user_id = %s",
+            (receipt_id, g.authenticated_user_id), fetch_one=True
+        ):
+            return jsonify({'error': 'Unknown receipt_id'}), 400
+    elif data.get('receipt_data'):
+        # Legacy clients still send the receipt inline as a base64 data URL
+        try:
+            receipt_id = store_data_url_receipt(data['receipt_data'], g.authenticated_user_id)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
     transaction_id = str(uuid.uuid4())
     query = """
         INSERT INTO transaction 
-        (transaction_id, user_id, name, type, amount, date, category, description, receipt_data)
+        (transaction_id, user_id, name, type, amount, date, category, description, receipt_id)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
     """
     params = (
         transaction_id, data['user_id'], data['name'], data['type'], data['amount'], 
-        data['date'], data.get('category'), data.get('description'), data.get('receipt_data')
+        data['date'], data.get('category'), data.get('description'), receipt_id
     )
     
-    execute_db_query(query, params, commit=True)
+    with db_transaction() as cursor:
+        cursor.execute(query, params)
+        apply_transaction_deltas(cursor, data['user_id'], [data])
+    on_user_data_changed(data['user_id'], 'transaction')
     return jsonify({'message': 'Transaction created successfully', 'id': transaction_id}), 201
 
 @app.route('/api/transactions/<transaction_id>', methods=['DELETE'])
@@ -408,13 +2741,581 @@ def delete_transaction(transaction_id):
     if not user_id:
         return jsonify({'error': 'User ID required for authorization'}), 400
         
-    query = "DELETE FROM transaction WHERE transaction_id = %s AND user_id = %s"
-    result = execute_db_query(query, (transaction_id, user_id), commit=True)
+    with db_transaction() as cursor:
+        # Lock the row so the aggregate delta matches exactly what gets deleted
+        cursor.execute(
+            "SELECT type, amount, date, category FROM transaction WHERE transaction_id = %s AND user_id = %s FOR UPDATE",
+            (transaction_id, user_id)
+        )
+        deleted = cursor.fetchone()
+        if deleted:
+            cursor.execute(
+                "DELETE FROM transaction WHERE transaction_id = %s AND user_id = %s",
+                (transaction_id, user_id)
+            )
+            apply_transaction_deltas(cursor, user_id, [deleted], sign=-1)
+            record_tombstones(cursor, user_id, 'transaction', [transaction_id])
     
-    if result.get('rowcount', 0) > 0:
+    if deleted:
+        on_user_data_changed(user_id, 'transaction')
         return jsonify({'message': 'Transaction deleted successfully'}), 200
     return jsonify({'error': 'Transaction not found or unauthorized'}), 404
 
+# ==================== TRANSACTION IMPORT ====================
+
+IMPORT_FORMATS = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/json': 'json',
+    'application/x-ndjson': 'json',
+    'application/x-ofx': 'ofx',
+    'application/ofx': 'ofx',
+}
+IMPORT_CHUNK_SIZE = 64 * 1024 # Characters read from the upload at a time
+IMPORT_MAX_RECORD_CHARS = 1024 * 1024 # A JSON record larger than this is rejected instead of buffered
+IMPORT_MAX_REPORTED_ERRORS = 1000 # Further failures are only counted
+IMPORT_MAX_AMOUNT = Decimal('9999999999999.99') # DECIMAL(15, 2)
+OFX_TAG_PATTERN = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+
+
+class ImportRowError(ValueError):
+    """Raised (or yielded by a parser) for a record that cannot be imported."""
+
+
+def iter_csv_records(text):
+    """
+    Yields one dict per CSV row, keyed by the header row. A row the csv module
+    cannot parse (e.g. a field over csv.field_size_limit()) is yielded as
+    ImportRowError and ends the import, since the rows after it cannot be
+    located reliably.
+    """
+    reader = csv.DictReader(text)
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield ImportRowError(f"Malformed CSV row ({e}), import stopped")
+            return
+        yield record
+
+def iter_json_records(text):
+    """
+    Yields the elements of a top-level JSON array, or the objects of
+    newline-delimited JSON, decoding one record at a time so only the current
+    chunk is held in memory. Malformed NDJSON lines are yielded as
+    ImportRowError and skipped.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    is_array = None
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if is_array is None and buffer:
+            is_array = buffer.startswith('[')
+            if is_array:
+                buffer = buffer[1:]
+                continue
+        if is_array and buffer.startswith(','):
+            buffer = buffer[1:]
+            continue
+        if is_array and buffer.startswith(']'):
+            return
+        if buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if not is_array and '\n' in buffer:
+                    yield ImportRowError('Malformed JSON record')
+                    buffer = buffer[buffer.index('\n') + 1:]
+                    continue
+                if eof or len(buffer) > IMPORT_MAX_RECORD_CHARS:
+                    yield ImportRowError('Malformed JSON record, import stopped')
+                    return
+            else:
+                # A bare number at the end of the buffer may continue in the next chunk
+                if eof or end < len(buffer) or isinstance(record, (dict, list)):
+                    buffer = buffer[end:]
+                    yield record
+                    continue
+        elif eof:
+            return
+        chunk = text.read(IMPORT_CHUNK_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+def iter_ofx_records(text):
+    """
+    Yields the fields of each <STMTTRN> in an OFX statement (SGML or XML
+    flavour), scanning the tag stream chunk by chunk.
+    """
+    buffer = ''
+    current = None
+    while True:
+        chunk = text.read(IMPORT_CHUNK_SIZE)
+        eof = not chunk
+        buffer += chunk
+        # Stop at the last '<' so a tag split across chunks is completed by the next read
+        cut = len(buffer) if eof else buffer.rfind('<')
+        if cut == -1:
+            buffer = ''
+            continue
+        for closing, tag, value in OFX_TAG_PATTERN.findall(buffer[:cut]):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and current is not None:
+                    yield {
+                        'date': current.get('DTPOSTED'),
+                        'amount': current.get('TRNAMT'),
+                        'name': current.get('NAME') or current.get('MEMO'),
+                        'memo': current.get('MEMO') if current.get('NAME') else None,
+                    }
+                current = None if closing else {}
+            elif current is not None and not closing:
+                current[tag] = html.unescape(value.strip())
+        buffer = buffer[cut:]
+        if eof:
+            return
+
+IMPORT_PARSERS = {'csv': iter_csv_records, 'json': iter_json_records, 'ofx': iter_ofx_records}
+
+def parse_import_date(value):
+    """Accepts YYYY-MM-DD (optionally with a time), MM/DD/YYYY or OFX YYYYMMDD[...]."""
+    value = str(value).strip()
+    if re.match(r'\d{8}', value):
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    if '/' in value:
+        return datetime.strptime(value, '%m/%d/%Y').date()
+    return date.fromisoformat(value[:10])
+
+def import_content_hash(txn_date, signed_amount, name):
+    """Content hash of (date, amount, name) used to skip rows imported before."""
+    key = f"{txn_date.isoformat()}|{signed_amount:.2f}|{' '.join(name.split()).lower()}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def normalize_import_row(record):
+    """
+    Validates one parsed record and returns it as a transaction dict with its
+    import_hash. Columns are matched case-insensitively: date, name (or payee /
+    description), amount, and optional type, category, description/memo.
+    Without a type, negative amounts are expenses. Raises ImportRowError.
+    """
+    if not isinstance(record, dict):
+        raise ImportRowError('Record is not an object')
+    row = {
+        str(key).strip().lower(): value.strip() if isinstance(value, str) else value
+        for key, value in record.items() if key is not None
+    }
+
+    name = row.get('name') or row.get('payee') or row.get('description')
+    if not name or not isinstance(name, str):
+        raise ImportRowError('Missing name')
+    if len(name) > 100:
+        raise ImportRowError('Name is longer than 100 characters')
+
+    try:
+        txn_date = parse_import_date(row.get('date'))
+    except (TypeError, ValueError):
+        raise ImportRowError(f"Invalid date: {row.get('date')!r}")
+
+    try:
+        amount = Decimal(str(row.get('amount')).replace(',', '')).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ImportRowError(f"Invalid amount: {row.get('amount')!r}")
+    if not amount.is_finite() or not amount or abs(amount) > IMPORT_MAX_AMOUNT:
+        raise ImportRowError(f"Invalid amount: {row.get('amount')!r}")
+
+    txn_type = str(row.get('type') or '').lower()
+    txn_type = {'debit': 'expense', 'credit': 'income'}.get(txn_type, txn_type)
+    if not txn_type:
+        txn_type = 'expense' if amount < 0 else 'income'
+    elif txn_type not in ('expense', 'income'):
+        raise ImportRowError(f"Invalid type: {row.get('type')!r}")
+    amount = abs(amount)
+
+    category = row.get('category') or None
+    if category and len(category) > 50:
+        raise ImportRowError('Category is longer than 50 characters')
+    description = row.get('memo') or (row.get('description') if row.get('description') != name else None)
+
+    signed_amount = amount if txn_type == 'income' else -amount
+    return {
+        'name': name,
+        'type': txn_type,
+        'amount': amount,
+        'date': txn_date,
+        'category': category,
+        'description': description,
+        'import_hash': import_content_hash(txn_date, signed_amount, name),
+    }
+
+def insert_import_batch(cursor, user_id, batch):
+    """
+    Inserts one batch of normalized rows with a single multi-row INSERT,
+    skipping rows whose import_hash already exists (in the table or earlier in
+    the batch), and folds the new rows into the aggregates once.
+    Returns (inserted rows, duplicate rows).
+    """
+    hashes = list({txn['import_hash'] for txn in batch})
+    placeholders = ', '.join(['%s'] * len(hashes))
+    cursor.execute(
+        f"SELECT import_hash FROM transaction WHERE user_id = %s AND import_hash IN ({placeholders})",
+        (user_id, *hashes)
+    )
+    seen = {row['import_hash'] for row in cursor.fetchall()}
+
+    fresh = []
+    duplicates = []
+    for txn in batch:
+        if txn['import_hash'] in seen:
+            duplicates.append(txn)
+            continue
+        seen.add(txn['import_hash'])
+        fresh.append(txn)
+
+    if fresh:
+        cursor.executemany(
+            """
+            INSERT INTO transaction
+            (transaction_id, user_id, name, type, amount, date, category, description, import_hash)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            [(str(uuid.uuid4()), user_id, txn['name'], txn['type'], txn['amount'], txn['date'],
+              txn['category'], txn['description'], txn['import_hash']) for txn in fresh]
+        )
+        apply_transaction_deltas(cursor, user_id, fresh)
+    return fresh, duplicates
+
+def import_transaction_records(user_id, records, batch_size):
+    """
+    Validates parsed records and imports them in batches of batch_size, one
+    commit per batch. Returns a report with counts and per-row errors (row
+    numbers are 1-based record positions). Because rows are deduplicated by
+    content hash, re-running an interrupted import only adds what is missing.
+    """
+    report = {'inserted': 0, 'duplicates': 0, 'failed': 0, 'batches': 0, 'errors': [], 'errors_truncated': False}
+
+    def fail(row_number, message):
+        report['failed'] += 1
+        if len(report['errors']) < IMPORT_MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'error': message})
+        else:
+            report['errors_truncated'] = True
+
+    def flush(batch):
+        try:
+            with db_transaction() as cursor:
+                inserted, duplicates = insert_import_batch(cursor, user_id, batch)
+        except pymysql.IntegrityError as e:
+            # e.g. the same rows committed concurrently by another import
+            for txn in batch:
+                fail(txn['row'], f"Batch rejected by the database: {e.args[-1]}")
+            return
+        report['inserted'] += len(inserted)
+        report['duplicates'] += len(duplicates)
+        report['batches'] += 1
+
+    batch = []
+    for row_number, record in enumerate(records, start=1):
+        try:
+            if isinstance(record, ImportRowError):
+                raise record
+            txn = normalize_import_row(record)
+        except ImportRowError as e:
+            fail(row_number, str(e))
+            continue
+        txn['row'] = row_number
+        batch.append(txn)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return report
+
+@app.route('/api/transactions/import', methods=['POST'])
+@handle_db_error
+@require_token
+def import_transactions():
+    """
+    Bulk-imports the authenticated user's transactions from a CSV, OFX or JSON
+    (array or NDJSON) file sent as the raw request body. The format comes from
+    ?format= or the Content-Type. The body is parsed as it streams in, so
+    memory stays flat regardless of file size.
+    """
+    user_id = g.authenticated_user_id
+    import_format = request.args.get('format') or IMPORT_FORMATS.get((request.mimetype or '').lower())
+    if import_format not in IMPORT_PARSERS:
+        return jsonify({'error': 'Unsupported import format, use csv, ofx or json'}), 415
+
+    text = io.TextIOWrapper(request.stream, encoding='utf-8-sig', errors='replace', newline='')
+    report = import_transaction_records(
+        user_id, IMPORT_PARSERS[import_format](text), current_app.config['IMPORT_BATCH_SIZE']
+    )
+    if report['inserted']:
+        on_user_data_changed(user_id, 'transaction')
+    return jsonify(report), 200
+
+
+# ==================== RECEIPT ENDPOINTS ====================
+
+RECEIPT_ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+RECEIPT_CONTENT_TYPES = ('image/', 'application/pdf')
+RECEIPT_SCRIPTABLE_TYPES = ('image/svg+xml',) # Images that can carry script; not accepted as receipts
+RECEIPT_FALLBACK_CONTENT_TYPE = 'application/octet-stream'
+RECEIPT_MAX_AGE = 31536000
+DATA_URL_PATTERN = re.compile(r'^data:([\w.+-]+/[\w.+-]+)?((?:;[^;,]*)*),', re.IGNORECASE)
+
+
+class ReceiptTooLargeError(ValueError):
+    """Raised when an uploaded receipt exceeds RECEIPT_MAX_BYTES."""
+
+
+class ReceiptStore:
+    """
+    Content-addressed receipt files on the local filesystem.
+
+    Each file is stored once under its SHA-256 hex digest (fanned out as
+    ab/cd/<digest>), so identical uploads are deduplicated. Writes go to a temp
+    file in the same tree and are renamed into place, so readers never see a
+    partial file.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path_for(digest))
+
+    def save_stream(self, stream, max_bytes=None):
+        """
+        Copies a binary stream into the store chunk by chunk while hashing it.
+        Returns (digest, size_bytes). Memory use is bounded by CHUNK_SIZE.
+        """
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = stream.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise ReceiptTooLargeError(f"Receipt exceeds {max_bytes} bytes")
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+
+            digest = hasher.hexdigest()
+            final_path = self.path_for(digest)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)  # Duplicate content, keep the existing copy
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+receipt_store = ReceiptStore(app.config['RECEIPT_STORAGE_DIR'])
+
+def register_receipt(receipt_id, content_type, size_bytes, user_id):
+    """
+    Records receipt metadata and that user_id uploaded it. Re-registering an
+    existing digest only adds the owner, so identical files uploaded by two
+    users are stored once but each user can attach them.
+    """
+    with db_transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO receipt (receipt_id, content_type, size_bytes)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE receipt_id = receipt_id
+        """, (receipt_id, content_type, size_bytes))
+        cursor.execute(
+            "INSERT IGNORE INTO receipt_owner (receipt_id, user_id) VALUES (%s, %s)",
+            (receipt_id, user_id)
+        )
+
+def is_receipt_content_type(content_type):
+    """Whether a receipt may be stored and served as this type: an image (not SVG) or a PDF."""
+    return content_type.startswith(RECEIPT_CONTENT_TYPES) and content_type not in RECEIPT_SCRIPTABLE_TYPES
+
+def parse_data_url(data_url):
+    """
+    Splits a base64 data URL (as produced by FileReader.readAsDataURL) into
+    (content_type, raw_bytes). Raises ValueError for anything else.
+    """
+    match = DATA_URL_PATTERN.match(data_url or '')
+    if not match or ';base64' not in match.group(2).lower():
+        raise ValueError('receipt_data must be a base64 data URL')
+    try:
+        payload = base64.b64decode(data_url[match.end():], validate=True)
+    except binascii.Error as e:
+        raise ValueError('receipt_data contains invalid base64') from e
+    return (match.group(1) or 'application/octet-stream').lower(), payload
+
+def store_data_url_receipt(data_url, user_id):
+    """Moves user_id's inline data URL receipt into the store and returns its receipt_id."""
+    content_type, payload = parse_data_url(data_url)
+    if not is_receipt_content_type(content_type):
+        raise ValueError('Receipts must be images or PDFs')
+    receipt_id, size = receipt_store.save_stream(io.BytesIO(payload), current_app.config['RECEIPT_MAX_BYTES'])
+    register_receipt(receipt_id, content_type, size, user_id)
+    return receipt_id
+
+@app.route('/api/receipts', methods=['POST'])
+@handle_db_error
+@require_token
+def upload_receipt():
+    """
+    Upload a receipt as the raw request body (not JSON/base64), e.g.
+    `Content-Type: image/png`. The body is streamed to disk, so memory stays flat.
+    Returns the receipt_id to attach to one of the caller's transactions.
+    """
+    content_type = (request.mimetype or '').lower()
+    if not is_receipt_content_type(content_type):
+        return jsonify({'error': 'Receipts must be images or PDFs'}), 415
+
+    max_bytes = current_app.config['RECEIPT_MAX_BYTES']
+    if request.content_length is not None and request.content_length > max_bytes:
+        return jsonify({'error': f'Receipt exceeds {max_bytes} bytes'}), 413
+
+    try:
+        receipt_id, size = receipt_store.save_stream(request.stream, max_bytes)
+    except ReceiptTooLargeError as e:
+        return jsonify({'error': str(e)}), 413
+    if size == 0:
+        return jsonify({'error': 'Empty receipt'}), 400
+
+    register_receipt(receipt_id, content_type, size, g.authenticated_user_id)
+    return jsonify({
+        'message': 'Receipt uploaded successfully',
+        'receipt_id': receipt_id,
+        'content_type': content_type,
+        'size_bytes': size
+    }), 201
+
+@app.route('/api/receipts/<receipt_id>', methods=['GET'])
+@handle_db_error
+@require_token
+def download_receipt(receipt_id):
+    """Stream a receipt attached to one of the caller's transactions."""
+    if not RECEIPT_ID_PATTERN.match(receipt_id):
+        return jsonify({'error': 'Receipt not found'}), 404
+
+    query = """
+        SELECT r.content_type
+        FROM receipt r
+        JOIN transaction t ON t.receipt_id = r.receipt_id
+        WHERE r.receipt_id = %s AND t.user_id = %s
+        LIMIT 1
+    """
+    receipt = execute_db_query(query, (receipt_id, g.authenticated_user_id), fetch_one=True)
+    if not receipt or not receipt_store.exists(receipt_id):
+        return jsonify({'error': 'Receipt not found'}), 404
+
+    # Rows stored before the allowlist may hold any type; those are only offered as a download
+    content_type = receipt['content_type']
+    if not is_receipt_content_type(content_type):
+        content_type = RECEIPT_FALLBACK_CONTENT_TYPE
+    response = send_file(
+        receipt_store.path_for(receipt_id),
+        mimetype=content_type,
+        conditional=True,
+        etag=receipt_id
+    )
+    # Content-addressed, so the bytes behind an ID never change; but they belong
+    # to one user, so only the browser (never a shared cache) may keep them
+    response.headers['Cache-Control'] = f"private, max-age={RECEIPT_MAX_AGE}, immutable"
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    response.headers['Content-Security-Policy'] = 'sandbox'
+    return response
+
+@app.cli.command('migrate-receipts')
+@click.option('--batch-size', default=200, show_default=True, help='Rows moved per commit.')
+@click.option('--drop-column', is_flag=True, help='Drop transaction.receipt_data once it is empty.')
+def migrate_receipts(batch_size, drop_column):
+    """Move inline transaction.receipt_data into the receipt store."""
+    conn = get_db()
+    moved = skipped = 0
+    last_id = ''
+    while True:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT transaction_id, user_id, receipt_data FROM transaction
+                WHERE receipt_data IS NOT NULL AND transaction_id > %s
+                ORDER BY transaction_id
+                LIMIT %s
+                """,
+                (last_id, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]['transaction_id']
+
+            receipts = []
+            owners = []
+            links = []
+            for row in rows:
+                try:
+                    content_type, payload = parse_data_url(row['receipt_data'])
+                    receipt_id, size = receipt_store.save_stream(
+                        io.BytesIO(payload), current_app.config['RECEIPT_MAX_BYTES']
+                    )
+                except ValueError:
+                    # Plain URLs, malformed values and oversized files cannot be moved; leave them in place
+                    skipped += 1
+                    continue
+                if not is_receipt_content_type(content_type):
+                    content_type = RECEIPT_FALLBACK_CONTENT_TYPE  # Kept, but only ever served as a download
+                receipts.append((receipt_id, content_type, size))
+                owners.append((receipt_id, row['user_id']))
+                links.append((receipt_id, row['transaction_id']))
+
+            if links:
+                cursor.executemany(
+                    """
+                    INSERT INTO receipt (receipt_id, content_type, size_bytes) VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE receipt_id = receipt_id
+                    """,
+                    receipts
+                )
+                cursor.executemany(
+                    "INSERT IGNORE INTO receipt_owner (receipt_id, user_id) VALUES (%s, %s)",
+                    owners
+                )
+                cursor.executemany(
+                    "UPDATE transaction SET receipt_id = %s, receipt_data = NULL WHERE transaction_id = %s",
+                    links
+                )
+            conn.commit()
+            moved += len(links)
+            click.echo(f"Moved {moved} receipts ({skipped} skipped)...")
+
+    click.echo(f"Done: {moved} receipts moved, {skipped} left in place.")
+    if drop_column:
+        if skipped:
+            click.echo("Not dropping receipt_data: some rows could not be migrated.")
+        else:
+            execute_db_query("ALTER TABLE transaction DROP COLUMN receipt_data", commit=True)
+            click.echo("Dropped transaction.receipt_data.")
+
+
 # ==================== REMINDER ENDPOINTS ====================
 
 @app.route('/api/reminders/<user_id>', methods=['GET'])
@@ -441,18 +3342,25 @@ def create_reminder():
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required reminder fields'}), 400
     
+    try:
+        first_fire = reminder_first_fire(data['dueDate'], data['recurring'])
+    except (TypeError, ValueError):
+        return jsonify({'error': 'dueDate must be YYYY-MM-DD'}), 400
+    
     reminder_id = str(uuid.uuid4())
     query = """
         INSERT INTO reminder 
-        (reminder_id, user_id, title, category, description, amount, due_date, recurring)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        (reminder_id, user_id, title, category, description, amount, due_date, recurring, next_fire_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
     """
     params = (
         reminder_id, data['user_id'], data['title'], data.get('category'), 
-        data.get('description'), data['amount'], data['dueDate'], data['recurring']
+        data.get('description'), data['amount'], data['dueDate'], data['recurring'], first_fire
     )
     
     execute_db_query(query, params, commit=True)
+    reminder_scheduler.schedule(reminder_id, first_fire)
+    on_user_data_changed(data['user_id'], 'reminder')
     return jsonify({'message': 'Reminder created successfully', 'id': reminder_id}), 201
 
 @app.route('/api/reminders/<reminder_id>', methods=['PUT'])
@@ -481,11 +3389,34 @@ def update_reminder(reminder_id):
     if not update_fields:
         return jsonify({'error': 'No fields provided for update'}), 400
 
+    # A new due date is a new occurrence: restart its notifications
+    first_fire = None
+    if 'dueDate' in data:
+        recurring = data.get('recurring')
+        if recurring is None:
+            current = execute_db_query(
+                "SELECT recurring FROM reminder WHERE reminder_id = %s AND user_id = %s",
+                (reminder_id, data.get('user_id')), fetch_one=True
+            )
+            if not current:
+                return jsonify({'error': 'Reminder not found or unauthorized'}), 404
+            recurring = current['recurring']
+        try:
+            first_fire = reminder_first_fire(data['dueDate'], recurring)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'dueDate must be YYYY-MM-DD'}), 400
+        # The scheduler takes the day of month from the new due date when it first rolls it forward
+        update_fields.append("due_day = NULL")
+        update_fields.append("next_fire_at = %s")
+        params.append(first_fire)
+
     query = f"UPDATE reminder SET {', '.join(update_fields)} WHERE reminder_id = %s AND user_id = %s"
     params.extend([reminder_id, data.get('user_id')])
 
     result = execute_db_query(query, tuple(params), commit=True)
     if result.get('rowcount', 0) > 0:
+        reminder_scheduler.schedule(reminder_id, first_fire)
+        on_user_data_changed(data.get('user_id'), 'reminder')
         return jsonify({'message': 'Reminder updated successfully'}), 200
     return jsonify({'error': 'Reminder not found or unauthorized'}), 404
 
@@ -499,10 +3430,8 @@ def delete_reminder(reminder_id):
     if not user_id:
         return jsonify({'error': 'User ID required for authorization'}), 400
 
-    query = "DELETE FROM reminder WHERE reminder_id = %s AND user_id = %s"
-    result = execute_db_query(query, (reminder_id, user_id), commit=True)
-    
-    if result.get('rowcount', 0) > 0:
+    if delete_tracked_row('reminder', reminder_id, user_id):
+        on_user_data_changed(user_id, 'reminder')
         return jsonify({'message': 'Reminder deleted successfully'}), 200
     return jsonify({'error': 'Reminder not found or unauthorized'}), 404
 
@@ -524,6 +3453,59 @@ def get_budgets():
     return jsonify(budgets), 200
 
 
+@app.route('/api/budgets/utilization', methods=['GET'])
+@handle_db_error
+@require_token
+def get_budget_utilization():
+    """
+    Returns each of the user's budgets with its spend over the current window,
+    the percentage used and an over/under status, in one aggregate query.
+    """
+    user_id = request.args.get('user_id', g.authenticated_user_id)
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    periods, period_params = budget_periods_sql(date.today())
+    query = f"""
+        SELECT
+            b.budget_id, b.user_id, b.category, b.amount, b.period,
+            b.start_date, b.end_date, b.is_exceeded,
+            {BUDGET_WINDOW_START} AS window_start,
+            {BUDGET_WINDOW_END} AS window_end,
+            COALESCE(SUM(t.amount), 0) AS spent
+        FROM budget b
+        LEFT JOIN {periods} p ON p.period = b.period
+        LEFT JOIN transaction t
+            ON t.user_id = b.user_id
+            AND t.category = b.category
+            AND t.type = 'expense'
+            AND t.date BETWEEN {BUDGET_WINDOW_START} AND {BUDGET_WINDOW_END}
+        WHERE b.user_id = %s
+        GROUP BY b.budget_id, p.period_start, p.period_end
+        ORDER BY b.category, b.budget_id
+    """
+    budgets = execute_db_query(query, (*period_params, user_id))
+
+    stale = []
+    for budget in budgets:
+        amount = budget['amount']
+        spent = budget['spent']
+        exceeded = spent > amount
+        budget['remaining'] = amount - spent
+        budget['percent_used'] = round(spent / amount * 100, 1) if amount > 0 else None
+        budget['status'] = 'over' if exceeded else 'under'
+        if bool(budget['is_exceeded']) != exceeded:
+            # Windows of recurring budgets roll over with the calendar
+            stale.append((exceeded, budget['budget_id']))
+        budget['is_exceeded'] = exceeded
+
+    if stale:
+        with db_transaction() as cursor:
+            cursor.executemany("UPDATE budget SET is_exceeded = %s WHERE budget_id = %s", stale)
+
+    return jsonify(budgets), 200
+
+
 @app.route('/api/budgets/<budget_id>', methods=['GET'])
 @handle_db_error
 def get_budget(budget_id):
@@ -549,14 +3531,18 @@ def create_budget():
     query = """
         INSERT INTO budget 
         (budget_id, user_id, category, amount, period, start_date, end_date, is_exceeded) 
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, FALSE)
     """
     params = (
         data['budget_id'], data['user_id'], data['category'], data['amount'],
-        data['period'], data['start_date'], data['end_date'], data.get('is_exceeded', False)
+        data['period'], data['start_date'], data['end_date']
     )
     
-    execute_db_query(query, params, commit=True)
+    with db_transaction() as cursor:
+        cursor.execute(query, params)
+        # is_exceeded is derived from the transactions, not taken from the client
+        refresh_budget_exceeded(cursor, "b.budget_id = %s", (data['budget_id'],))
+    on_user_data_changed(data['user_id'], 'budget')
     return jsonify({'message': 'Budget created successfully'}), 201
 
 
@@ -569,32 +3555,39 @@ def update_budget(budget_id):
     update_fields = []
     values = []
     
-    for field in ['category', 'amount', 'period', 'start_date', 'end_date', 'is_exceeded']:
+    # is_exceeded is recomputed below rather than accepted from the client
+    for field in ['category', 'amount', 'period', 'start_date', 'end_date']:
         if field in data:
             update_fields.append(f"{field} = %s")
             values.append(data[field])
     
-    if not update_fields:
+    if not update_fields and 'is_exceeded' not in data:
         return jsonify({'error': 'No fields to update'}), 400
     
     values.append(budget_id)
-    query = f"UPDATE budget SET {', '.join(update_fields)} WHERE budget_id = %s"
     
-    result = execute_db_query(query, tuple(values), commit=True)
+    with db_transaction() as cursor:
+        cursor.execute("SELECT user_id FROM budget WHERE budget_id = %s FOR UPDATE", (budget_id,))
+        owner = cursor.fetchone()
+        if owner:
+            if update_fields:
+                cursor.execute(f"UPDATE budget SET {', '.join(update_fields)} WHERE budget_id = %s", tuple(values))
+            refresh_budget_exceeded(cursor, "b.budget_id = %s", (budget_id,))
     
-    if result.get('rowcount', 0) > 0:
+    if owner:
+        on_user_data_changed(owner['user_id'], 'budget')
         return jsonify({'message': 'Budget updated successfully'}), 200
-    return jsonify({'error': 'Budget not found or no changes made'}), 404
+    return jsonify({'error': 'Budget not found'}), 404
 
 
 @app.route('/api/budgets/<budget_id>', methods=['DELETE'])
 @handle_db_error
 def delete_budget(budget_id):
     """Delete budget"""
-    query = "DELETE FROM budget WHERE budget_id = %s"
-    result = execute_db_query(query, (budget_id,), commit=True)
+    owner_id = delete_tracked_row('budget', budget_id)
     
-    if result.get('rowcount', 0) > 0:
+    if owner_id:
+        on_user_data_changed(owner_id, 'budget')
         return jsonify({'message': 'Budget deleted successfully'}), 200
     return jsonify({'error': 'Budget not found'}), 404
 
@@ -651,6 +3644,7 @@ def create_goal():
     )
     
     execute_db_query(query, params, commit=True)
+    on_user_data_changed(data['user_id'], 'goal')
     return jsonify({'message': 'Goal created successfully'}), 201
 
 
@@ -671,26 +3665,179 @@ def update_goal(goal_id):
     if not update_fields:
         return jsonify({'error': 'No fields to update'}), 400
     
+    owner = execute_db_query(
+        "SELECT user_id FROM goal WHERE goal_id = %s", (goal_id,), fetch_one=True
+    )
+    
     values.append(goal_id)
     query = f"UPDATE goal SET {', '.join(update_fields)} WHERE goal_id = %s"
     
     result = execute_db_query(query, tuple(values), commit=True)
     
     if result.get('rowcount', 0) > 0:
+        on_user_data_changed(owner['user_id'], 'goal')
         return jsonify({'message': 'Goal updated successfully'}), 200
     return jsonify({'error': 'Goal not found or no changes made'}), 404
 
 
-@app.route('/api/goals/<goal_id>', methods=['DELETE'])
+@app.route('/api/goals/<goal_id>', methods=['DELETE'])
+@handle_db_error
+def delete_goal(goal_id):
+    """Delete goal"""
+    owner_id = delete_tracked_row('goal', goal_id)
+    
+    if owner_id:
+        on_user_data_changed(owner_id, 'goal')
+        return jsonify({'message': 'Goal deleted successfully'}), 200
+    return jsonify({'error': 'Goal not found'}), 404
+
+
+def parse_positive_amount(value):
+    """Parses a money amount that must be greater than zero. Raises ValueError."""
+    try:
+        amount = Decimal(str(value)).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ValueError('amount must be a number')
+    if not amount.is_finite() or amount <= 0:
+        raise ValueError('amount must be greater than zero')
+    return amount
+
+def plan_savings_distribution(goals, amount):
+    """
+    Splits `amount` across goals the way the Goals page always has: earliest
+    deadline first (goals without one last), then the largest remaining gap.
+    Each goal gets up to what it still needs; a goal that is already funded
+    gets an even share of what is left. Returns {goal_id: allocation}.
+    """
+    def remaining(goal):
+        return max(goal['target_amount'] - goal['current_amount'], Decimal('0'))
+
+    ordered = sorted(goals, key=lambda goal: (goal['deadline'] is None, goal['deadline'] or date.max, -remaining(goal)))
+    allocations = {}
+    leftover = amount
+    for goal in ordered:
+        if leftover <= 0:
+            break
+        gap = remaining(goal)
+        share = (leftover / len(ordered)).quantize(Decimal('0.01'), rounding=ROUND_DOWN) if not gap else min(leftover, gap)
+        if share > 0:
+            allocations[goal['goal_id']] = share
+            leftover -= share
+    return allocations
+
+def apply_goal_contributions(cursor, user_id, goals, allocations):
+    """
+    Adds each allocation to its goal with one multi-row UPDATE (relative to the
+    stored current_amount, so concurrent contributions add up) and writes a
+    goal_achieved notification for every goal whose target was crossed.
+    `goals` must have been read FOR UPDATE in the same transaction.
+    Returns (updated goals, achieved goals).
+    """
+    rows = ' UNION ALL '.join(['SELECT %s AS goal_id, CAST(%s AS DECIMAL(15, 2)) AS amount'] * len(allocations))
+    cursor.execute(f"""
+        UPDATE goal g
+        JOIN ({rows}) c ON c.goal_id = g.goal_id
+        SET g.current_amount = COALESCE(g.current_amount, 0) + c.amount
+        WHERE g.user_id = %s
+    """, tuple(value for item in allocations.items() for value in item) + (user_id,))
+
+    updated = []
+    achieved = []
+    for goal in goals:
+        if goal['goal_id'] not in allocations:
+            continue
+        before = goal['current_amount']
+        after = before + allocations[goal['goal_id']]
+        updated.append({**goal, 'current_amount': after, 'contribution': allocations[goal['goal_id']]})
+        if before < goal['target_amount'] <= after:
+            achieved.append(goal)
+
+    if achieved:
+        cursor.executemany(
+            "INSERT INTO notification (user_id, content, type, is_read) VALUES (%s, %s, 'goal_achieved', FALSE)",
+            [(user_id, f"Goal achieved: {goal['name']} reached its target of {goal['target_amount']:.2f}")
+             for goal in achieved]
+        )
+    return updated, achieved
+
+def goal_contribution_response(updated, achieved):
+    """JSON body shared by the contribution and distribution endpoints."""
+    return {
+        'goals': [
+            {
+                'goal_id': goal['goal_id'],
+                'contribution': float(goal['contribution']),
+                'current_amount': float(goal['current_amount']),
+                'target_amount': float(goal['target_amount']),
+            }
+            for goal in updated
+        ],
+        'achieved': [goal['goal_id'] for goal in achieved],
+    }
+
+@app.route('/api/goals/<goal_id>/contributions', methods=['POST'])
 @handle_db_error
-def delete_goal(goal_id):
-    """Delete goal"""
-    query = "DELETE FROM goal WHERE goal_id = %s"
-    result = execute_db_query(query, (goal_id,), commit=True)
-    
-    if result.get('rowcount', 0) > 0:
-        return jsonify({'message': 'Goal deleted successfully'}), 200
-    return jsonify({'error': 'Goal not found'}), 404
+@require_token
+def add_goal_contribution(goal_id):
+    """Adds {amount} to one of the caller's goals atomically."""
+    user_id = g.authenticated_user_id
+    data = request.get_json(silent=True) or {}
+    try:
+        amount = parse_positive_amount(data.get('amount'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    with db_transaction() as cursor:
+        cursor.execute("""
+            SELECT goal_id, name, target_amount, COALESCE(current_amount, 0) AS current_amount, deadline
+            FROM goal WHERE goal_id = %s AND user_id = %s
+            FOR UPDATE
+        """, (goal_id, user_id))
+        goal = cursor.fetchone()
+        if not goal:
+            return jsonify({'error': 'Goal not found'}), 404
+        updated, achieved = apply_goal_contributions(cursor, user_id, [goal], {goal_id: amount})
+
+    on_user_data_changed(user_id, 'goal')
+    if achieved:
+        on_user_data_changed(user_id, 'notification')
+    return jsonify(goal_contribution_response(updated, achieved)), 200
+
+@app.route('/api/goals/distribute', methods=['POST'])
+@handle_db_error
+@require_token
+def distribute_goal_savings():
+    """
+    Spreads {amount} across all of the caller's goals by deadline and
+    remaining gap, updating every goal in one transaction. The response lists
+    what each goal received and any amount left unallocated.
+    """
+    user_id = g.authenticated_user_id
+    data = request.get_json(silent=True) or {}
+    try:
+        amount = parse_positive_amount(data.get('amount'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    with db_transaction() as cursor:
+        cursor.execute("""
+            SELECT goal_id, name, target_amount, COALESCE(current_amount, 0) AS current_amount, deadline
+            FROM goal WHERE user_id = %s
+            ORDER BY goal_id
+            FOR UPDATE
+        """, (user_id,))
+        goals = cursor.fetchall()
+        allocations = plan_savings_distribution(goals, amount)
+        if not allocations:
+            return jsonify({'error': 'No goals to distribute savings to'}), 404
+        updated, achieved = apply_goal_contributions(cursor, user_id, goals, allocations)
+
+    on_user_data_changed(user_id, 'goal')
+    if achieved:
+        on_user_data_changed(user_id, 'notification')
+    result = goal_contribution_response(updated, achieved)
+    result['unallocated'] = float(amount - sum(allocations.values()))
+    return jsonify(result), 200
 
 
 # ==================== PREFERENCES ENDPOINTS ====================
@@ -831,6 +3978,121 @@ def get_notifications():
     return jsonify(notifications), 200
 
 
+NOTIFICATION_PAGE_DEFAULT_LIMIT = 20
+NOTIFICATION_PAGE_MAX_LIMIT = 100
+NOTIFICATION_MARK_READ_MAX_IDS = 1000
+
+def count_unread_notifications(user_id):
+    """Unread count, answered from idx_user_read_created alone (no row lookups)."""
+    row = execute_db_query(
+        "SELECT COUNT(*) AS unread FROM notification WHERE user_id = %s AND is_read = FALSE",
+        (user_id,), fetch_one=True
+    )
+    return row['unread']
+
+@app.route('/api/notifications/<user_id>/page', methods=['GET'])
+@handle_db_error
+@require_token
+def get_notifications_page(user_id):
+    """
+    Fetch one page of a user's notifications, newest first, with the unread
+    count. Keyset pagination on (created_at, notification_id) like the
+    transaction pages: pass next_cursor back as ?cursor=. ?unread=true limits
+    the page to unread notifications.
+    """
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    try:
+        limit = int(request.args.get('limit', NOTIFICATION_PAGE_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    limit = max(1, min(limit, NOTIFICATION_PAGE_MAX_LIMIT))
+
+    clauses = ['user_id = %s']
+    params = [user_id]
+    if request.args.get('unread', 'false').lower() == 'true':
+        clauses.append('is_read = FALSE')
+    if request.args.get('cursor'):
+        try:
+            cursor_created, cursor_id = decode_cursor(request.args['cursor'])
+            cursor_created = datetime.fromisoformat(cursor_created)
+            cursor_id = int(cursor_id)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid cursor'}), 400
+        # Expanded row comparison so MySQL can range-scan idx_user_created / idx_user_read_created
+        clauses.append("(created_at < %s OR (created_at = %s AND notification_id < %s))")
+        params.extend([cursor_created, cursor_created, cursor_id])
+
+    rows = execute_db_query(f"""
+        SELECT notification_id, user_id, content, type, is_read, created_at
+        FROM notification
+        WHERE {' AND '.join(clauses)}
+        ORDER BY created_at DESC, notification_id DESC
+        LIMIT %s
+    """, tuple(params + [limit + 1]))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last['created_at'], last['notification_id'])
+
+    return jsonify({
+        'notifications': rows,
+        'next_cursor': next_cursor,
+        'limit': limit,
+        'unread_count': count_unread_notifications(user_id)
+    }), 200
+
+@app.route('/api/notifications/<user_id>/unread-count', methods=['GET'])
+@handle_db_error
+@require_token
+def get_unread_notification_count(user_id):
+    """Number of unread notifications, for badges."""
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    return jsonify({'unread_count': count_unread_notifications(user_id)}), 200
+
+@app.route('/api/notifications/mark-read', methods=['POST'])
+@handle_db_error
+@require_token
+def mark_notifications_read():
+    """
+    Marks several of the caller's notifications read in one UPDATE: either
+    {"ids": [...]} or {"up_to_id": N} for everything up to and including
+    notification N (e.g. the newest one on screen for "mark all read").
+    """
+    user_id = g.authenticated_user_id
+    data = request.get_json(silent=True) or {}
+
+    if 'ids' in data:
+        ids = data['ids']
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return jsonify({'error': 'ids must be a list of notification ids'}), 400
+        if len(ids) > NOTIFICATION_MARK_READ_MAX_IDS:
+            return jsonify({'error': f"At most {NOTIFICATION_MARK_READ_MAX_IDS} ids per request"}), 400
+        if not ids:
+            return jsonify({'updated': 0, 'unread_count': count_unread_notifications(user_id)}), 200
+        condition = f"notification_id IN ({', '.join(['%s'] * len(ids))})"
+        params = list(ids)
+    elif 'up_to_id' in data:
+        if not isinstance(data['up_to_id'], int) or isinstance(data['up_to_id'], bool):
+            return jsonify({'error': 'up_to_id must be a notification id'}), 400
+        condition = "notification_id <= %s"
+        params = [data['up_to_id']]
+    else:
+        return jsonify({'error': 'Provide ids or up_to_id'}), 400
+
+    result = execute_db_query(
+        f"UPDATE notification SET is_read = TRUE WHERE user_id = %s AND is_read = FALSE AND {condition}",
+        tuple([user_id] + params), commit=True
+    )
+    if result.get('rowcount', 0) > 0:
+        on_user_data_changed(user_id, 'notification')
+    return jsonify({'updated': result.get('rowcount', 0), 'unread_count': count_unread_notifications(user_id)}), 200
+
+
 @app.route('/api/notifications', methods=['POST'])
 @handle_db_error
 def create_notification():
@@ -850,6 +4112,7 @@ def create_notification():
     )
     
     execute_db_query(query, params, commit=True)
+    on_user_data_changed(data['user_id'], 'notification')
     return jsonify({'message': 'Notification created successfully'}), 201
 
 
@@ -861,12 +4124,17 @@ def update_notification(notification_id):
     
     is_read_value = data.get('is_read', True)
     
+    owner = execute_db_query(
+        "SELECT user_id FROM notification WHERE notification_id = %s", (notification_id,), fetch_one=True
+    )
+    
     query = "UPDATE notification SET is_read = %s WHERE notification_id = %s"
     params = (is_read_value, notification_id)
     
     result = execute_db_query(query, params, commit=True)
     
     if result.get('rowcount', 0) > 0:
+        on_user_data_changed(owner['user_id'], 'notification')
         return jsonify({'message': 'Notification updated successfully'}), 200
     return jsonify({'error': 'Notification not found or no changes made'}), 404
 
@@ -875,10 +4143,10 @@ def update_notification(notification_id):
 @handle_db_error
 def delete_notification(notification_id):
     """Delete notification"""
-    query = "DELETE FROM notification WHERE notification_id = %s"
-    result = execute_db_query(query, (notification_id,), commit=True)
+    owner_id = delete_tracked_row('notification', notification_id)
     
-    if result.get('rowcount', 0) > 0:
+    if owner_id:
+        on_user_data_changed(owner_id, 'notification')
         return jsonify({'message': 'Notification deleted successfully'}), 200
     return jsonify({'error': 'Notification not found'}), 404
 
@@ -964,50 +4232,495 @@ def delete_report(report_id):
     return jsonify({'error': 'Report not found'}), 404
 
 
+MONTH_KEY_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+
+def parse_month_key(value):
+    """Parses 'YYYY-MM' into the first day of that month. Raises ValueError."""
+    if not MONTH_KEY_PATTERN.match(value):
+        raise ValueError('Month must be YYYY-MM')
+    return date(int(value[:4]), int(value[5:]), 1)
+
+def compute_monthly_report(user_id, month):
+    """
+    Builds the Reports page monthly summary for `month` (a first-of-month
+    date): income, expenses, savings, expense categories, the biggest expense
+    and the change in savings versus the previous month. Totals come from
+    monthly_rollup for both months in one primary-key range read.
+    """
+    previous = month - relativedelta(months=1)
+    rollups = execute_db_query("""
+        SELECT month, type, category, total_amount
+        FROM monthly_rollup
+        WHERE user_id = %s AND month IN (%s, %s) AND transaction_count > 0
+    """, (user_id, previous, month))
+
+    totals = {}
+    categories = {}
+    for row in rollups:
+        amount = float(row['total_amount'])
+        key = (row['month'], row['type'])
+        totals[key] = totals.get(key, 0.0) + amount
+        if row['month'] == month and row['type'] == 'expense':
+            category = row['category'] if row['category'] else 'Uncategorized'
+            categories[category] = categories.get(category, 0.0) + amount
+
+    biggest = execute_db_query("""
+        SELECT transaction_id AS id, name, amount, category, date, description
+        FROM transaction
+        WHERE user_id = %s AND type = 'expense' AND date BETWEEN %s AND %s
+        ORDER BY amount DESC, date DESC
+        LIMIT 1
+    """, (user_id, month, month + relativedelta(months=1) - timedelta(days=1)), fetch_one=True)
+    if biggest:
+        biggest['amount'] = float(biggest['amount'])
+        biggest['date'] = biggest['date'].isoformat()
+
+    income = totals.get((month, 'income'), 0.0)
+    expenses = totals.get((month, 'expense'), 0.0)
+    savings = income - expenses
+    previous_savings = totals.get((previous, 'income'), 0.0) - totals.get((previous, 'expense'), 0.0)
+    return {
+        'income': round(income, 2),
+        'expenses': round(expenses, 2),
+        'savings': round(savings, 2),
+        'categories': {
+            category: round(total, 2)
+            for category, total in sorted(categories.items(), key=lambda item: item[1], reverse=True)
+        },
+        'biggest': biggest,
+        'trend': round(savings - previous_savings, 2),
+    }
+
+@app.route('/api/reports/monthly/<month>', methods=['GET'])
+@handle_db_error
+@require_token
+def get_monthly_report(month):
+    """Monthly summary for ?user_id= (defaults to the caller) and month 'YYYY-MM'."""
+    user_id = request.args.get('user_id', g.authenticated_user_id)
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        month_date = parse_month_key(month)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(compute_monthly_report(user_id, month_date)), 200
+
+@app.route('/api/reports/monthly/<month>', methods=['POST'])
+@handle_db_error
+@require_token
+def save_monthly_report(month):
+    """Computes the caller's monthly summary and stores it as a 'monthly_summary' report."""
+    user_id = g.authenticated_user_id
+    try:
+        month_date = parse_month_key(month)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    summary = compute_monthly_report(user_id, month_date)
+    report_id = f"report-{uuid.uuid4()}"
+    data = {
+        'month': month,
+        'summary': summary,
+        'categoryBreakdown': summary['categories'],
+        'biggestExpense': summary['biggest'],
+    }
+    execute_db_query(
+        "INSERT INTO report (report_id, user_id, type, data) VALUES (%s, %s, %s, %s)",
+        (report_id, user_id, 'monthly_summary', json.dumps(data)),
+        commit=True
+    )
+    return jsonify({'message': 'Report created successfully', 'report_id': report_id, 'data': data}), 201
+
+
+# ==================== ANALYTICS ENDPOINTS ====================
+
+# Bucket start for each granularity, as SQL over t.date. Weeks start on
+# Sunday like the Budgets page; the Python side mirrors these in bucket_start.
+ANALYTICS_BUCKET_SQL = {
+    'day': "t.date",
+    'week': "DATE_SUB(t.date, INTERVAL DAYOFWEEK(t.date) - 1 DAY)",
+    'month': "DATE_SUB(t.date, INTERVAL DAYOFMONTH(t.date) - 1 DAY)",
+    'quarter': "MAKEDATE(YEAR(t.date), 1) + INTERVAL QUARTER(t.date) - 1 QUARTER",
+    'year': "MAKEDATE(YEAR(t.date), 1)",
+}
+ANALYTICS_BUCKET_STEP = {
+    'day': relativedelta(days=1),
+    'week': relativedelta(weeks=1),
+    'month': relativedelta(months=1),
+    'quarter': relativedelta(months=3),
+    'year': relativedelta(years=1),
+}
+ANALYTICS_MAX_BUCKETS = 5000 # e.g. ~13 years of daily buckets
+
+def bucket_start(value, granularity):
+    """Returns the first day of the bucket containing `value`."""
+    if granularity == 'week':
+        return value - timedelta(days=(value.weekday() + 1) % 7)
+    if granularity == 'month':
+        return value.replace(day=1)
+    if granularity == 'quarter':
+        return date(value.year, (value.month - 1) // 3 * 3 + 1, 1)
+    if granularity == 'year':
+        return date(value.year, 1, 1)
+    return value
+
+def bucket_range(start, end, granularity):
+    """Every bucket start from the bucket holding `start` through `end`. Raises ValueError past ANALYTICS_MAX_BUCKETS."""
+    first = bucket_start(start, granularity)
+    step = ANALYTICS_BUCKET_STEP[granularity]
+    buckets = []
+    current = first
+    while current <= end:
+        if len(buckets) == ANALYTICS_MAX_BUCKETS:
+            raise ValueError(f"Range spans more than {ANALYTICS_MAX_BUCKETS} {granularity} buckets")
+        buckets.append(current)
+        # Step from the first bucket so month ends don't drift (Jan 31 -> Feb 28 -> Mar 28)
+        current = first + step * len(buckets)
+    return buckets
+
+def scatter_column(positions, values, size):
+    """Builds a zeroed float column of `size` and adds each value at its position."""
+    column = array('d', bytes(8 * size))
+    for position, value in zip(positions, values):
+        column[position] += value
+    return column
+
+def type_columns(positions, types, totals, size):
+    """Splits grouped (position, type, total) columns into income and expense series."""
+    columns = {}
+    for txn_type in ('income', 'expense'):
+        picked = [txn == txn_type for txn in types]
+        columns[txn_type] = scatter_column(compress(positions, picked), compress(totals, picked), size)
+    return columns['income'], columns['expense']
+
+@app.route('/api/analytics/<user_id>/timeseries', methods=['GET'])
+@handle_db_error
+@require_token
+def get_timeseries(user_id):
+    """
+    Income, expense, savings and cumulative savings series for
+    ?granularity=day|week|month|quarter|year (default month) between
+    ?start_date and ?end_date (default: the last 12 months). ?split=category
+    adds per-category series and ?fill=false drops empty buckets.
+
+    Bucketing is done by GROUP BY in MySQL over the (user_id, date) index, so
+    only one row per bucket/type/category reaches Python, where the series are
+    assembled as columns (zero-filled arrays, map/accumulate for savings and
+    running totals) instead of per-transaction loops.
+    """
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in ANALYTICS_BUCKET_SQL:
+        return jsonify({'error': f"granularity must be one of {', '.join(ANALYTICS_BUCKET_SQL)}"}), 400
+    split_by_category = request.args.get('split') == 'category'
+    zero_fill = request.args.get('fill', 'true').lower() != 'false'
+
+    try:
+        end = date.fromisoformat(request.args['end_date']) if request.args.get('end_date') else date.today()
+        start = (date.fromisoformat(request.args['start_date']) if request.args.get('start_date')
+                 else month_start(end) - relativedelta(months=11))
+        if start > end:
+            raise ValueError('start_date must not be after end_date')
+        buckets = bucket_range(start, end, granularity)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    group_columns = "bucket, t.type, t.category" if split_by_category else "bucket, t.type"
+    rows = execute_db_query(f"""
+        SELECT {ANALYTICS_BUCKET_SQL[granularity]} AS bucket, t.type,
+            {'t.category,' if split_by_category else ''} SUM(t.amount) AS total
+        FROM transaction t
+        WHERE t.user_id = %s AND t.date BETWEEN %s AND %s
+        GROUP BY {group_columns}
+    """, (user_id, start, end))
+
+    # Columnar view of the grouped rows
+    index = {bucket: position for position, bucket in enumerate(buckets)}
+    positions = [index[bucket_start(row['bucket'], granularity)] for row in rows]
+    types = [row['type'] for row in rows]
+    totals = [float(row['total']) for row in rows]
+
+    income, expense = type_columns(positions, types, totals, len(buckets))
+    savings = array('d', map(operator.sub, income, expense))
+    cumulative = array('d', accumulate(savings))  # Running total within the range
+
+    keep = range(len(buckets))
+    if not zero_fill:
+        occupied = set(positions)
+        keep = [position for position in keep if position in occupied]
+
+    def select(column):
+        return [round(column[position], 2) for position in keep]
+
+    result = {
+        'granularity': granularity,
+        'start_date': start.isoformat(),
+        'end_date': end.isoformat(),
+        'buckets': [buckets[position].isoformat() for position in keep],
+        'income': select(income),
+        'expense': select(expense),
+        'savings': select(savings),
+        'cumulative_savings': select(cumulative),
+    }
+
+    if split_by_category:
+        grouped = {}  # category -> (positions, types, totals)
+        for position, txn_type, total, row in zip(positions, types, totals, rows):
+            columns = grouped.setdefault(row['category'] or 'Uncategorized', ([], [], []))
+            columns[0].append(position)
+            columns[1].append(txn_type)
+            columns[2].append(total)
+        result['categories'] = {}
+        for category, columns in sorted(grouped.items()):
+            category_income, category_expense = type_columns(*columns, len(buckets))
+            result['categories'][category] = {
+                'income': select(category_income),
+                'expense': select(category_expense),
+            }
+
+    return jsonify(result), 200
+
 # ==================== DASHBOARD REPORTING ENDPOINT ====================
 
+class SingleFlightCache:
+    """
+    Short-TTL cache of computed values with single-flight coalescing: when
+    several requests miss on the same key at once, only the first computes and
+    the rest wait for its result. An invalidation that lands while a compute
+    is in flight keeps that (possibly stale) result out of the cache.
+    """
+
+    class _Flight:
+        def __init__(self):
+            self.done = threading.Event()
+            self.value = None
+            self.error = None
+            self.stale = False
+
+    def __init__(self, ttl=30.0, max_entries=10000, wait_timeout=30.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (value, expires_at)
+        self._inflight = {}  # key -> _Flight
+        self._stats = {
+            'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0,
+            'recomputes': 0, 'recompute_errors': 0,
+            'recompute_seconds_total': 0.0, 'recompute_seconds_max': 0.0,
+        }
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """
+        Returns the cached value for key, computing it (once) on a miss.
+        If given, cacheable(value) decides whether a fresh value may be stored.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._stats['hits'] += 1
+                return entry[0]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                self._stats['misses'] += 1
+                flight = self._inflight[key] = self._Flight()
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            if flight.done.wait(self.wait_timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+            return compute()  # Leader is stuck; don't pile up behind it
+
+        started = time.perf_counter()
+        try:
+            value = compute()
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self._stats['recompute_errors'] += 1
+                self._inflight.pop(key, None)
+            flight.done.set()
+            raise
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats['recomputes'] += 1
+            self._stats['recompute_seconds_total'] += elapsed
+            self._stats['recompute_seconds_max'] = max(self._stats['recompute_seconds_max'], elapsed)
+            if not flight.stale and (cacheable is None or cacheable(value)):
+                self._entries.pop(key, None)  # Re-insert at the end (newest)
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+                self._evict()
+            self._inflight.pop(key, None)
+        flight.value = value
+        flight.done.set()
+        return value
+
+    def invalidate(self, key):
+        """Drops the cached value for key and poisons any in-flight compute."""
+        with self._lock:
+            self._entries.pop(key, None)
+            flight = self._inflight.get(key)
+            if flight is not None:
+                flight.stale = True
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['size'] = len(self._entries)
+        lookups = snapshot['hits'] + snapshot['misses'] + snapshot['coalesced']
+        snapshot['hit_ratio'] = round(snapshot['hits'] / lookups, 4) if lookups else None
+        snapshot['recompute_seconds_avg'] = (
+            round(snapshot['recompute_seconds_total'] / snapshot['recomputes'], 6) if snapshot['recomputes'] else None
+        )
+        return snapshot
+
+    def _evict(self):
+        """Drops expired entries, then the oldest ones, down to max_entries. Caller must hold the lock."""
+        if len(self._entries) <= self.max_entries:
+            return
+        now = time.monotonic()
+        for key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+
+# Tables whose writes change what the dashboard summary shows
+DASHBOARD_ENTITIES = ('transaction', 'reminder', 'notification')
+DASHBOARD_REMINDER_OVERDUE_DAYS = 30 # Missed reminders older than this drop off the dashboard
+dashboard_cache = SingleFlightCache(ttl=app.config['DASHBOARD_CACHE_TTL'])
+
 @app.route('/api/dashboard/summary/<user_id>', methods=['GET'])
 @handle_db_error
 def get_dashboard_summary(user_id):
     """
-    Calculates and returns all dashboard summary data for a specific user,
+    Returns all dashboard summary data for a specific user, including totals,
+    monthly trends, and category breakdowns. Served from dashboard_cache; writes
+    to the user's transactions, reminders and notifications invalidate it.
+    """
+    summary = dashboard_cache.get_or_compute(
+        user_id,
+        lambda: compute_dashboard_summary(user_id),
+        cacheable=lambda summary: not summary['errors']  # Never pin a degraded summary
+    )
+    return jsonify(summary), 200
+
+
+def compute_dashboard_summary(user_id):
+    """
+    Calculates all dashboard summary data for a specific user,
     including totals, monthly trends, and category breakdowns.
+    The section queries are independent, so they run concurrently; a section
+    that fails or times out comes back empty and is listed under 'errors'.
     """
     
-    # --- 1. TOTALS & BREAKDOWN (All Time / Last 12 Months) ---
+    # Totals are all-time and read from financial_overview, which every transaction
+    # write keeps current. The category breakdown and the monthly trend read
+    # monthly_rollup (at most 12 x categories rows) instead of raw transactions.
+    
+    today = date.today()
+    # First month of the 12-month window
+    window_start = month_start(today - relativedelta(months=12))
+    fourteen_days_ago = (today - relativedelta(days=14)).isoformat()
+    
+    queries = {
+        # Query 1: Expense Breakdown for the last year
+        'expense_breakdown': ("""
+            SELECT 
+                type, 
+                category,
+                SUM(total_amount) AS total_amount
+            FROM 
+                monthly_rollup
+            WHERE 
+                user_id = %s 
+                AND month >= %s 
+                AND transaction_count > 0
+            GROUP BY 
+                type, category
+        """, (user_id, window_start)),
+        
+        # Totals come from the incrementally maintained financial_overview row
+        'totals': (
+            "SELECT total_income, total_expenses, net_worth FROM financial_overview WHERE user_id = %s",
+            (user_id,), True
+        ),
+        
+        # Query 2: Monthly Income and Expense
+        'monthly_trend': ("""
+            SELECT
+                month,
+                type,
+                SUM(total_amount) AS total
+            FROM
+                monthly_rollup
+            WHERE
+                user_id = %s
+                AND month >= %s 
+                AND transaction_count > 0
+            GROUP BY
+                month, type
+            ORDER BY 
+                month
+        """, (user_id, window_start)),
+        
+        # Query 3: Fetch active notifications (e.g., last 10 unread or all from last 30 days)
+        'notifications': ("""
+            SELECT 
+                notification_id AS id, content AS message, type, created_at AS date 
+            FROM 
+                notification 
+            WHERE 
+                user_id = %s AND is_read = FALSE 
+            ORDER BY 
+                created_at DESC 
+            LIMIT 10
+        """, (user_id,)),
+        
+        # Reminders in the upcoming window (plus recently missed ones), a range scan on idx_user_due
+        'reminders': ("""
+            SELECT title, amount, due_date AS dueDate
+            FROM reminder
+            WHERE user_id = %s AND due_date BETWEEN %s AND %s
+            ORDER BY due_date
+        """, (user_id, today - timedelta(days=DASHBOARD_REMINDER_OVERDUE_DAYS), today + timedelta(days=REMINDER_DUE_SOON_DAYS))),
+        
+        # Get transactions for the last two weeks for week-over-week comparison (The frontend handles this logic locally, 
+        # but we can provide the raw transactions to simplify the API)
+        'weekly_transactions': ("""
+            SELECT 
+                amount, date, type, category
+            FROM 
+                transaction
+            WHERE 
+                user_id = %s
+                AND date >= %s
+            ORDER BY date DESC
+        """, (user_id, fourteen_days_ago)),
+    }
     
-    # For simplicity, we calculate totals for the last 12 months (or all data if less than 12 months)
-    # The client-side logic calculates total savings, so we provide income and expense totals.
+    results, errors = fetch_concurrently(queries, timeout=current_app.config['DASHBOARD_QUERY_TIMEOUT'])
+    if not results:
+        # Nothing came back at all: report a real failure rather than an empty dashboard
+        raise ConnectionError("All dashboard queries failed.")
     
-    # Calculate start date for 12 months ago
-    twelve_months_ago = (date.today() - relativedelta(months=12)).isoformat()
+    # --- 1. TOTALS & BREAKDOWN (All Time / Last 12 Months) ---
     
-    # Query 1: Total Income, Total Expense, and Expense Breakdown for the last year
-    summary_query = """
-        SELECT 
-            t.type, 
-            t.category,
-            SUM(t.amount) AS total_amount
-        FROM 
-            transaction t
-        WHERE 
-            t.user_id = %s 
-            AND t.date >= %s 
-        GROUP BY 
-            t.type, t.category
-    """
-    summary_data = execute_db_query(summary_query, (user_id, twelve_months_ago))
-
-    total_income = 0.0
-    total_expense = 0.0
     expense_breakdown = {}
     
-    for row in summary_data:
+    for row in results.get('expense_breakdown', []):
         amount = float(row['total_amount'])
-        if row['type'].lower() == 'income':
-            total_income += amount
-        elif row['type'].lower() == 'expense':
-            total_expense += amount
+        if row['type'].lower() == 'expense':
             category = row['category'] if row['category'] else 'Uncategorized'
             expense_breakdown[category] = expense_breakdown.get(category, 0.0) + amount
 
@@ -1016,35 +4729,18 @@ def get_dashboard_summary(user_id):
         for cat, val in expense_breakdown.items()
     ]
     
+    overview = results.get('totals')
     totals = {
-        'income': total_income,
-        'expense': total_expense,
-        'savings': total_income - total_expense
+        'income': float(overview['total_income']) if overview else 0.0,
+        'expense': float(overview['total_expenses']) if overview else 0.0,
+        'savings': float(overview['net_worth']) if overview else 0.0
     }
     
     # --- 2. MONTHLY TRENDS (Line Chart Data) ---
     
-    # Query 2: Monthly Income and Expense
-    monthly_query = """
-        SELECT
-            DATE_FORMAT(date, '%%Y-%%m') AS month,
-            type,
-            SUM(amount) AS total
-        FROM
-            transaction
-        WHERE
-            user_id = %s
-            AND date >= %s 
-        GROUP BY
-            month, type
-        ORDER BY 
-            month
-    """
-    monthly_results = execute_db_query(monthly_query, (user_id, twelve_months_ago))
-    
     monthly_map = {}
-    for row in monthly_results:
-        month = row['month']
+    for row in results.get('monthly_trend', []):
+        month = row['month'].strftime('%Y-%m')
         if month not in monthly_map:
             monthly_map[month] = {'month': month, 'income': 0.0, 'expense': 0.0}
             
@@ -1055,52 +4751,574 @@ def get_dashboard_summary(user_id):
 
     monthly_data = list(monthly_map.values())
     
-    # --- 3. ALERTS / NOTIFICATIONS ---
-    
-    # Query 3: Fetch active notifications (e.g., last 10 unread or all from last 30 days)
-    notifications_query = """
-        SELECT 
-            notification_id AS id, content AS message, type, created_at AS date 
-        FROM 
-            notification 
-        WHERE 
-            user_id = %s AND is_read = FALSE 
-        ORDER BY 
-            created_at DESC 
-        LIMIT 10
-    """
-    notifications = execute_db_query(notifications_query, (user_id,))
-    
-    # --- 4. INSIGHTS / REMINDERS (Fetch all reminders and last week's transactions) ---
-    
-    # Fetch all reminders
-    reminders_query = "SELECT title, amount, due_date AS dueDate FROM reminder WHERE user_id = %s"
-    reminders = execute_db_query(reminders_query, (user_id,))
-    
-    # Get transactions for the last two weeks for week-over-week comparison (The frontend handles this logic locally, 
-    # but we can provide the raw transactions to simplify the API)
-    fourteen_days_ago = (date.today() - relativedelta(days=14)).isoformat()
-    weekly_txns_query = """
-        SELECT 
-            amount, date, type, category
-        FROM 
-            transaction
-        WHERE 
-            user_id = %s
-            AND date >= %s
-        ORDER BY date DESC
-    """
-    weekly_txns = execute_db_query(weekly_txns_query, (user_id, fourteen_days_ago))
+    # --- 3. ALERTS / NOTIFICATIONS and 4. INSIGHTS / REMINDERS ---
+    # (reminders and last two weeks' transactions are passed through as fetched)
 
     # Compile the final response
-    return jsonify({
+    return {
         'totals': totals,
         'monthly_trend': monthly_data,
         'expense_breakdown': pie_data,
-        'notifications': notifications,
-        'reminders': reminders,
-        'weekly_transactions': weekly_txns, # Send raw data for weekly calculation
-    }), 200
+        'notifications': results.get('notifications', []),
+        'reminders': results.get('reminders', []),
+        'weekly_transactions': results.get('weekly_transactions', []), # Send raw data for weekly calculation
+        'errors': errors, # Sections that failed or timed out and were returned empty
+    }
+
+
+# ==================== ALERT ENGINE ====================
+
+# Thresholds mirror the rules the frontend used to apply client-side
+BUDGET_ALERT_RATIO = Decimal('0.5') # Warn once half a budget is spent
+REMINDER_DUE_SOON_DAYS = 7
+GOAL_DEADLINE_DAYS = 14
+MONTHLY_SAVINGS_ACHIEVEMENT = Decimal(500)
+
+def format_usd(amount):
+    """Formats an amount the way the frontend's Intl.NumberFormat USD formatter does."""
+    amount = Decimal(amount)
+    sign = '-' if amount < 0 else ''
+    return f"{sign}${abs(amount):,.2f}"
+
+@app.route('/api/alerts/<user_id>', methods=['GET'])
+@handle_db_error
+@require_token
+def get_alerts(user_id):
+    """
+    Computes the user's live alert set: budget overspending, bills due soon,
+    due today or overdue, approaching goal deadlines, negative savings and the
+    monthly savings achievement. Each alert keeps a stable id (e.g.
+    'bill-<reminder_id>') so clients can track read state across refreshes.
+    """
+    if g.authenticated_user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    today = date.today()
+    now_iso = datetime.now().isoformat()
+    periods, period_params = budget_periods_sql(today)
+
+    queries = {
+        # Spend per budget in its current window (as /api/budgets/utilization), via idx_user_category_date
+        'budgets': (f"""
+            SELECT b.budget_id, b.category, b.amount, COALESCE(SUM(t.amount), 0) AS spent
+            FROM budget b
+            LEFT JOIN {periods} p ON p.period = b.period
+            LEFT JOIN transaction t
+                ON t.user_id = b.user_id
+                AND t.category = b.category
+                AND t.type = 'expense'
+                AND t.date BETWEEN {BUDGET_WINDOW_START} AND {BUDGET_WINDOW_END}
+            WHERE b.user_id = %s
+            GROUP BY b.budget_id, b.category, b.amount
+            HAVING b.amount > 0 AND spent > b.amount * %s
+        """, (*period_params, user_id, BUDGET_ALERT_RATIO)),
+        'reminders': ("""
+            SELECT reminder_id, title, amount, due_date
+            FROM reminder
+            WHERE user_id = %s AND due_date <= %s
+        """, (user_id, today + timedelta(days=REMINDER_DUE_SOON_DAYS))),
+        'goals': ("""
+            SELECT goal_id, name, deadline
+            FROM goal
+            WHERE user_id = %s AND deadline BETWEEN %s AND %s
+        """, (user_id, today, today + timedelta(days=GOAL_DEADLINE_DAYS))),
+        'overview': (
+            "SELECT net_worth FROM financial_overview WHERE user_id = %s",
+            (user_id,), True
+        ),
+        'this_month': ("""
+            SELECT type, SUM(total_amount) AS total
+            FROM monthly_rollup
+            WHERE user_id = %s AND month = %s
+            GROUP BY type
+        """, (user_id, month_start(today))),
+    }
+    results, errors = fetch_concurrently(queries, timeout=current_app.config['DASHBOARD_QUERY_TIMEOUT'])
+    if not results:
+        raise ConnectionError("All alert queries failed.")
+
+    alerts = []
+
+    # Budget alerts
+    for budget in results.get('budgets', []):
+        pct = round(budget['spent'] / budget['amount'] * 100)
+        alerts.append({
+            'id': f"overspending-{budget['budget_id']}",
+            'type': 'overspending',
+            'message': f"You have used {pct}% of your {budget['category']} budget ({format_usd(budget['amount'])} limit).",
+            'date': now_iso
+        })
+
+    # Reminder alerts
+    for bill in results.get('reminders', []):
+        diff_days = (bill['due_date'] - today).days
+        if diff_days < 0:
+            status, label = 'overdue', 'was due'
+        elif diff_days == 0:
+            status, label = 'due-today', 'is due today'
+        else:
+            status, label = 'due-soon', f"is due in {diff_days} day{'' if diff_days == 1 else 's'}"
+        alerts.append({
+            'id': f"bill-{bill['reminder_id']}",
+            'type': status,
+            'message': f"{bill['title']} ({format_usd(bill['amount'])}) {label}.",
+            'date': bill['due_date'].isoformat()
+        })
+
+    # Goal alerts - goals approaching deadline
+    for goal in results.get('goals', []):
+        days_left = (goal['deadline'] - today).days
+        alerts.append({
+            'id': f"goal-{goal['goal_id']}",
+            'type': 'goal',
+            'message': f"{goal['name']} deadline in {days_left} day{'' if days_left == 1 else 's'}. Keep saving!",
+            'date': goal['deadline'].isoformat()
+        })
+
+    # Low savings warning
+    overview = results.get('overview')
+    if overview and overview['net_worth'] < 0:
+        alerts.append({
+            'id': 'savings-warning',
+            'type': 'low-savings',
+            'message': f"Savings dipped to {format_usd(overview['net_worth'])}. Review spending to stay on track.",
+            'date': now_iso
+        })
+
+    # Achievement notification - saved over $500 this month
+    month_totals = {row['type']: row['total'] for row in results.get('this_month', [])}
+    monthly_savings = month_totals.get('income', 0) - month_totals.get('expense', 0)
+    if monthly_savings >= MONTHLY_SAVINGS_ACHIEVEMENT:
+        alerts.append({
+            'id': 'achievement-500',
+            'type': 'achievement',
+            'message': f"You saved {format_usd(monthly_savings)} this month! 🎉",
+            'date': now_iso
+        })
+
+    alerts.sort(key=lambda alert: alert['date'], reverse=True)
+    return jsonify({'alerts': alerts, 'errors': errors}), 200
+
+
+# ==================== REMINDER SCHEDULER ====================
+
+REMINDER_RECURRENCE_STEPS = {
+    'Weekly': relativedelta(weeks=1),
+    'Monthly': relativedelta(months=1),
+    'Yearly': relativedelta(years=1),
+}
+REMINDER_SCAN_LIMIT = 10000 # Fire times loaded into the heap per scan
+
+def reminder_first_fire(due_date, recurring, today=None):
+    """
+    When a reminder with this due date (date or 'YYYY-MM-DD') should first
+    fire: the start of its due-soon window. A one-time reminder already past
+    due never fires (as migration 007 left existing ones), so returns None.
+    """
+    if isinstance(due_date, str):
+        due_date = date.fromisoformat(due_date[:10])
+    if recurring == 'One-time' and due_date < (today or date.today()):
+        return None
+    return datetime.combine(due_date - timedelta(days=REMINDER_DUE_SOON_DAYS), datetime.min.time())
+
+def reminder_occurrence(due, step, periods, due_day):
+    """
+    The occurrence `periods` steps after `due`, moved back to the reminder's
+    due_day where the month allows it, so a bill due on the 31st that fell on
+    Feb 28 is due on Mar 31 again.
+    """
+    occurrence = due + step * periods
+    if step.months or step.years:
+        occurrence = occurrence.replace(
+            day=min(due_day, calendar.monthrange(occurrence.year, occurrence.month)[1])
+        )
+    return occurrence
+
+def plan_reminder_occurrence(reminder, today):
+    """
+    Decides what a firing reminder owes on `today`. A passed occurrence gets an
+    overdue notice and, for recurring reminders, rolls forward to the next
+    occurrence on or after today (stepping from the old due date, so several
+    missed periods collapse into one notice, and keeping the day of month in
+    reminder['due_day']). An occurrence inside the due-soon window gets a
+    due-soon notice. Returns (notices, due_date, next_fire_at) where notices
+    are (kind, occurrence date) pairs and next_fire_at is None once nothing is
+    left to fire.
+    """
+    due = reminder['due_date']
+    due_day = reminder.get('due_day') or due.day
+    notices = []
+    if due < today:
+        notices.append(('overdue', due))
+        step = REMINDER_RECURRENCE_STEPS.get(reminder['recurring'])
+        if step is None:
+            return notices, due, None
+        periods = 1
+        while reminder_occurrence(due, step, periods, due_day) < today:
+            periods += 1
+        due = reminder_occurrence(due, step, periods, due_day)
+
+    if (due - today).days <= REMINDER_DUE_SOON_DAYS:
+        notices.append(('due_soon', due))
+        next_fire = due + timedelta(days=1)  # The day it becomes overdue
+    else:
+        next_fire = due - timedelta(days=REMINDER_DUE_SOON_DAYS)
+    return notices, due, datetime.combine(next_fire, datetime.min.time())
+
+def reminder_notice_text(reminder, kind, occurrence, today):
+    """Notification text, worded like the matching alert from /api/alerts."""
+    if kind == 'overdue':
+        label = f"was due on {occurrence.isoformat()}"
+    else:
+        days = (occurrence - today).days
+        label = 'is due today' if days == 0 else f"is due in {days} day{'' if days == 1 else 's'}"
+    return f"{reminder['title']} ({format_usd(reminder['amount'])}) {label}."
+
+def fire_reminders(reminder_ids, now):
+    """
+    Processes a batch of reminders whose next_fire_at has passed: writes their
+    due-soon/overdue notifications with one multi-row INSERT and rolls due
+    dates and fire times forward with one multi-row UPDATE, in one
+    transaction. Rows are locked and re-checked against next_fire_at first, so
+    an occurrence is notified exactly once even when several workers (or the
+    process-reminders command) fire the same reminder. Returns the
+    (reminder_id, next_fire_at) pairs that were advanced.
+    """
+    today = now.date()
+    placeholders = ', '.join(['%s'] * len(reminder_ids))
+    with db_transaction() as cursor:
+        cursor.execute(f"""
+            SELECT reminder_id, user_id, title, amount, due_date, due_day, recurring
+            FROM reminder
+            WHERE reminder_id IN ({placeholders}) AND next_fire_at <= %s
+            FOR UPDATE
+        """, (*reminder_ids, now))
+        reminders = cursor.fetchall()
+        if not reminders:
+            return []
+
+        notifications = []
+        updates = []
+        for reminder in reminders:
+            notices, due, next_fire = plan_reminder_occurrence(reminder, today)
+            notifications.extend(
+                (reminder['user_id'], reminder_notice_text(reminder, kind, occurrence, today))
+                for kind, occurrence in notices
+            )
+            # Keep the day the reminder was set for, which due_date loses in short months
+            updates.append((reminder['reminder_id'], due, reminder['due_day'] or reminder['due_date'].day, next_fire))
+
+        if notifications:
+            cursor.executemany(
+                "INSERT INTO notification (user_id, content, type, is_read) VALUES (%s, %s, 'alert', FALSE)",
+                notifications
+            )
+        rows = ' UNION ALL '.join(
+            ['SELECT %s AS reminder_id, CAST(%s AS DATE) AS due_date, %s AS due_day, CAST(%s AS DATETIME) AS next_fire_at']
+            * len(updates)
+        )
+        cursor.execute(f"""
+            UPDATE reminder r
+            JOIN ({rows}) u ON u.reminder_id = r.reminder_id
+            SET r.due_date = u.due_date, r.due_day = u.due_day, r.next_fire_at = u.next_fire_at
+        """, tuple(value for update in updates for value in update))
+
+    for user_id in {reminder['user_id'] for reminder in reminders}:
+        on_user_data_changed(user_id, 'reminder')
+    for user_id in {user_id for user_id, _ in notifications}:
+        on_user_data_changed(user_id, 'notification')
+    return [(reminder_id, next_fire) for reminder_id, _, _, next_fire in updates]
+
+
+class ReminderScheduler:
+    """
+    Background thread (one per worker process) that fires reminders at their
+    next_fire_at. Every scan_interval seconds it loads the fire times that fall
+    before the next scan from idx_next_fire into a min-heap, then sleeps until
+    the earliest one is due and fires everything due in batches. Reminders
+    created or moved into the current horizon are pushed with schedule().
+    The heap is only a wake-up plan: fire_reminders() re-checks the row, so
+    stale or duplicate entries are harmless.
+    """
+
+    def __init__(self, app, scan_interval, batch_size, scan_limit=REMINDER_SCAN_LIMIT):
+        self.app = app
+        self.scan_interval = scan_interval
+        self.batch_size = batch_size
+        self.scan_limit = scan_limit
+        self._cond = threading.Condition()
+        self._heap = []  # (next_fire_at, reminder_id)
+        self._scheduled = {}  # reminder_id -> the fire time its live heap entry carries
+        self._horizon = None  # Fire times up to here are in the heap
+        self._pid = None
+        self._stats = {'scans': 0, 'fired': 0, 'errors': 0}
+
+    def ensure_started(self):
+        """Starts the thread in this process if it is not running yet (cheap after the first call)."""
+        if self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            # A forked worker inherits a copy of the parent's heap but not its thread
+            self._pid = os.getpid()
+            self._heap = []
+            self._scheduled = {}
+            self._horizon = None
+            threading.Thread(target=self._run, name='reminder-scheduler', daemon=True).start()
+
+    def schedule(self, reminder_id, fire_at):
+        """Adds a fire time that falls before the next scan; later ones are left to that scan."""
+        with self._cond:
+            if fire_at is None or self._horizon is None or fire_at > self._horizon:
+                return
+            self._push(reminder_id, fire_at)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return dict(self._stats, heap_size=len(self._scheduled), running=self._pid == os.getpid())
+
+    def _push(self, reminder_id, fire_at):
+        # Caller holds the lock. A superseded entry stays in the heap and is skipped when popped.
+        if self._scheduled.get(reminder_id) != fire_at:
+            self._scheduled[reminder_id] = fire_at
+            heapq.heappush(self._heap, (fire_at, reminder_id))
+
+    def _scan(self, now):
+        horizon = now + timedelta(seconds=self.scan_interval)
+        rows = execute_db_query("""
+            SELECT reminder_id, next_fire_at
+            FROM reminder
+            WHERE next_fire_at <= %s
+            ORDER BY next_fire_at
+            LIMIT %s
+        """, (horizon, self.scan_limit))
+        with self._cond:
+            self._stats['scans'] += 1
+            # A full page may have cut off fire times; scan again once the last one loaded is reached
+            self._horizon = rows[-1]['next_fire_at'] if len(rows) == self.scan_limit else horizon
+            for row in rows:
+                self._push(row['reminder_id'], row['next_fire_at'])
+
+    def _pop_due(self, now):
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                fire_at, reminder_id = heapq.heappop(self._heap)
+                if self._scheduled.get(reminder_id) == fire_at:
+                    del self._scheduled[reminder_id]
+                    due.append(reminder_id)
+        return due
+
+    def _run(self):
+        while True:
+            now = datetime.now()
+            try:
+                with self.app.app_context():
+                    if self._horizon is None or now >= self._horizon:
+                        self._scan(now)
+                    due = self._pop_due(now)
+                    if due:
+                        advanced = fire_reminders(due, now)
+                        with self._cond:
+                            self._stats['fired'] += len(advanced)
+                            for reminder_id, next_fire in advanced:
+                                if next_fire is not None and next_fire <= self._horizon:
+                                    self._push(reminder_id, next_fire)
+                        continue
+            except Exception as e:
+                with self._cond:
+                    self._stats['errors'] += 1
+                    # Retry at the next scan; the rows still carry their fire times
+                    self._horizon = now + timedelta(seconds=min(self.scan_interval, 60))
+                self.app.logger.error(f"Reminder scheduler error: {e}")
+
+            with self._cond:
+                wake_at = self._horizon
+                if self._heap and self._heap[0][0] < wake_at:
+                    wake_at = self._heap[0][0]
+                timeout = (wake_at - datetime.now()).total_seconds()
+                if timeout > 0:
+                    self._cond.wait(timeout)
+
+
+reminder_scheduler = ReminderScheduler(
+    app, app.config['REMINDER_SCAN_INTERVAL'], app.config['REMINDER_BATCH_SIZE']
+)
+
+@app.before_request
+def start_reminder_scheduler():
+    """Starts the scheduler lazily in each serving worker (not in CLI commands)."""
+    if app.config['REMINDER_SCHEDULER_ENABLED']:
+        reminder_scheduler.ensure_started()
+
+@app.cli.command('process-reminders')
+def process_reminders():
+    """Fire every reminder that is due now (for deployments that run this from cron instead of the thread)."""
+    batch_size = app.config['REMINDER_BATCH_SIZE']
+    fired = 0
+    while True:
+        now = datetime.now()
+        rows = execute_db_query("""
+            SELECT reminder_id FROM reminder
+            WHERE next_fire_at <= %s
+            ORDER BY next_fire_at
+            LIMIT %s
+        """, (now, batch_size))
+        if not rows:
+            break
+        advanced = fire_reminders([row['reminder_id'] for row in rows], now)
+        if not advanced:
+            break  # Another worker holds or already advanced them
+        fired += len(advanced)
+    click.echo(f"Processed {fired} reminders.")
+
+
+# ==================== BATCH ENDPOINT ====================
+
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+_batch_executor = None
+_batch_executor_pid = None
+
+def get_batch_executor():
+    """
+    Returns the process-wide thread pool for concurrent batch reads. Kept apart
+    from the query fan-out pool because a sub-request (e.g. the dashboard) may
+    itself fan out, and waiting on its own pool could deadlock it.
+    """
+    global _batch_executor, _batch_executor_pid
+    with _db_pool_lock:
+        if _batch_executor is None or _batch_executor_pid != os.getpid():
+            _batch_executor = ThreadPoolExecutor(
+                max_workers=current_app.config['BATCH_WORKERS'],
+                thread_name_prefix='batch'
+            )
+            _batch_executor_pid = os.getpid()
+        return _batch_executor
+
+def parse_batch_request(item):
+    """Validates one sub-request spec. Returns (method, path, params, body); raises ValueError."""
+    if not isinstance(item, dict):
+        raise ValueError('Sub-request must be an object')
+    method = str(item.get('method', 'GET')).upper()
+    if method not in BATCH_METHODS:
+        raise ValueError(f"method must be one of {', '.join(BATCH_METHODS)}")
+    path = item.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/') or '?' in path:
+        raise ValueError("path must start with /api/ (pass the query string as params)")
+    if path.rstrip('/') == '/api/batch':
+        raise ValueError('Batches cannot be nested')
+    if path.startswith('/api/auth/'):
+        # Login, signup and logout act on the bearer token itself, which sub-requests do not carry
+        raise ValueError('Authentication endpoints cannot be batched')
+    params = item.get('params') or {}
+    if not isinstance(params, dict):
+        raise ValueError('params must be an object')
+    return method, path, params, item.get('body')
+
+def dispatch_batch_request(base_url, user_id, method, path, params, body):
+    """
+    Runs one sub-request through the normal URL map, hooks and error handlers
+    in a nested request context. Called with the batch's app context active
+    (so it reuses the batch's connection) or from a batch worker thread under
+    a fresh one. require_token accepts g.batch_user_id instead of a header.
+    Returns (status, body).
+    """
+    builder = EnvironBuilder(
+        path=path, method=method, base_url=base_url,
+        query_string={key: str(value) for key, value in params.items()},
+        json=body if body is not None else None,
+    )
+    g.batch_user_id = user_id
+    try:
+        with app.request_context(builder.get_environ()):
+            response = app.make_response(app.full_dispatch_request())
+            try:
+                if response.is_json:
+                    return response.status_code, response.get_json(silent=True)
+                # Event streams, downloads and binary files only make sense as their own request
+                downloadable = response.headers.get('Content-Disposition', '').startswith('attachment')
+                if response.mimetype.startswith('text/') and response.mimetype != 'text/event-stream' and not downloadable:
+                    return response.status_code, response.get_data(as_text=True)
+                return 400, {'error': f"{response.mimetype} responses cannot be batched"}
+            finally:
+                response.close()  # Runs call_on_close handlers, e.g. releasing an export's connection
+    except Exception as e:
+        # What the WSGI layer would have turned into a 500 for a standalone request
+        current_app.logger.error(f"Batch sub-request {method} {path} failed: {e}", exc_info=True)
+        return 500, {'error': 'An unexpected server error occurred.'}
+    finally:
+        builder.close()
+
+def dispatch_batch_read(base_url, user_id, spec):
+    """Worker-thread entry point: one concurrent GET under its own app context and pooled connection."""
+    with app.app_context():
+        return dispatch_batch_request(base_url, user_id, *spec)
+
+@app.route('/api/batch', methods=['POST'])
+@handle_db_error
+@require_token
+def batch():
+    """
+    Runs several API calls in one round trip:
+    {"requests": [{"id": "...", "method": "GET", "path": "/api/...", "params": {...}, "body": {...}}]}.
+    The caller is authenticated once for the whole batch. Sub-requests run in
+    order; each run of consecutive GETs executes concurrently (one pooled
+    connection per read), while writes run one at a time on the batch's own
+    connection, so a read after a write sees it. Every sub-request gets its
+    own status and body; the batch itself returns 200 unless it is malformed.
+    """
+    user_id = g.authenticated_user_id
+    base_url = request.host_url
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+    max_requests = current_app.config['BATCH_MAX_REQUESTS']
+    if len(items) > max_requests:
+        return jsonify({'error': f"At most {max_requests} requests per batch"}), 413
+
+    results = [None] * len(items)
+    specs = []
+    for position, item in enumerate(items):
+        request_id = item.get('id', position) if isinstance(item, dict) else position
+        try:
+            specs.append((position, parse_batch_request(item)))
+        except ValueError as e:
+            results[position] = {'id': request_id, 'status': 400, 'body': {'error': str(e)}}
+        else:
+            results[position] = {'id': request_id}
+
+    def run_reads(group):
+        if len(group) == 1:
+            position, spec = group[0]
+            outcomes = {position: dispatch_batch_request(base_url, user_id, *spec)}
+        else:
+            executor = get_batch_executor()
+            futures = {
+                position: executor.submit(contextvars.copy_context().run, dispatch_batch_read, base_url, user_id, spec)
+                for position, spec in group
+            }
+            outcomes = {position: future.result() for position, future in futures.items()}
+        for position, (status, body) in outcomes.items():
+            results[position].update(status=status, body=body)
+
+    reads = []
+    for position, spec in specs:
+        if spec[0] == 'GET':
+            reads.append((position, spec))
+            continue
+        if reads:
+            run_reads(reads)
+            reads = []
+        status, body = dispatch_batch_request(base_url, user_id, *spec)
+        results[position].update(status=status, body=body)
+    if reads:
+        run_reads(reads)
+
+    return jsonify({'responses': results}), 200
 
 
 # ==================== HEALTH CHECK ====================
@@ -1118,9 +5336,23 @@ def health_check():
     return jsonify({
         'status': 'healthy' if db_healthy else 'degraded', 
         'timestamp': datetime.now().isoformat(),
-        'database_status': 'OK' if db_healthy else 'ERROR'
+        'database_status': 'OK' if db_healthy else 'ERROR',
+        'database_pool': _db_pool.stats() if _db_pool is not None else None,
+        'token_cache': token_cache.stats(),
+        'token_revocations': token_revocations.stats(),
+        'dashboard_cache': dashboard_cache.stats(),
+        'event_hub': event_hub.stats(),
+        'password_hasher': password_hasher.stats(),
+        'reminder_scheduler': reminder_scheduler.stats(),
+        'request_profiler': request_profiler.stats()
     }), 200
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Request, query and connection pool metrics for this worker, in Prometheus text format."""
+    pool_stats = _db_pool.stats() if _db_pool is not None and _db_pool.pid == os.getpid() else None
+    return Response(request_metrics.render(pool_stats), mimetype='text/plain; version=0.0.4')
+
 
 if __name__ == '__main__':
     # Log configuration for easier debugging
@@ -9,3 +9,6 @@ export async function signupApi({ email, password }){
 export async function meApi(token){
   return apiFetch('/auth/me', { method: 'GET', token })
 }
+export async function logoutApi(token){
+  return apiFetch('/auth/logout', { method: 'POST', token })
+}
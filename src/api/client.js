@@ -37,6 +37,104 @@ function saveMockReminders(reminders) {
   localStorage.setItem(MOCK_REMINDERS_KEY, JSON.stringify(reminders))
 }
 
+function formatMockCurrency(amount) {
+  try {
+    return new Intl.NumberFormat(undefined, { style: 'currency', currency: 'USD' }).format(amount)
+  } catch {
+    return `$${Number(amount).toFixed(2)}`
+  }
+}
+
+// Same rules and alert ids as GET /api/alerts/<user_id>, computed from the mock data.
+// Mock mode has no budget or goal store, so those rules only fire when they are passed in.
+function computeMockAlerts(transactions, reminders, budgets = [], goals = []) {
+  const now = new Date()
+  const todayKey = now.toISOString().slice(0,10)
+  const alerts = []
+  const sumAmounts = (list) => list.reduce((sum, t) => sum + Number(t.amount || 0), 0)
+  const isType = (t, type) => t.type?.toLowerCase() === type
+
+  // Budget alerts - check budgets against expenses in their date range
+  for(const budget of budgets){
+    const spent = sumAmounts(transactions.filter(t =>
+      isType(t, 'expense') &&
+      t.category === budget.category &&
+      t.date >= budget.start_date &&
+      t.date <= budget.end_date
+    ))
+    if (budget.amount && spent > budget.amount * 0.5){
+      const pct = Math.round((spent / budget.amount) * 100)
+      alerts.push({
+        id: `overspending-${budget.budget_id}`,
+        type: 'overspending',
+        message: `You have used ${pct}% of your ${budget.category} budget (${formatMockCurrency(budget.amount)} limit).`,
+        date: now.toISOString()
+      })
+    }
+  }
+
+  // Reminder alerts
+  for(const rem of reminders){
+    const dueDate = rem.due_date || rem.dueDate
+    const diffDays = Math.ceil((new Date(dueDate) - now) / (1000 * 60 * 60 * 24))
+    if (Number.isNaN(diffDays) || diffDays > 7) continue
+    const status = diffDays < 0 ? 'overdue' : diffDays === 0 ? 'due-today' : 'due-soon'
+    const label = status === 'overdue'
+      ? 'was due'
+      : status === 'due-today'
+      ? 'is due today'
+      : `is due in ${diffDays} day${diffDays === 1 ? '' : 's'}`
+    alerts.push({
+      id: `bill-${rem.id || rem.reminder_id}`,
+      type: status,
+      message: `${rem.title} (${formatMockCurrency(rem.amount)}) ${label}.`,
+      date: dueDate
+    })
+  }
+
+  // Goal alerts - goals approaching deadline
+  for(const goal of goals){
+    if (!goal.deadline) continue
+    const daysUntil = (new Date(goal.deadline) - now) / (1000*60*60*24)
+    if (daysUntil > 14 || daysUntil < 0) continue
+    const daysLeft = Math.ceil(daysUntil)
+    alerts.push({
+      id: `goal-${goal.goal_id}`,
+      type: 'goal',
+      message: `${goal.name} deadline in ${daysLeft} day${daysLeft === 1 ? '' : 's'}. Keep saving!`,
+      date: goal.deadline
+    })
+  }
+
+  // Low savings warning
+  const savings = sumAmounts(transactions.filter(t => isType(t, 'income')))
+    - sumAmounts(transactions.filter(t => isType(t, 'expense')))
+  if (savings < 0){
+    alerts.push({
+      id: 'savings-warning',
+      type: 'low-savings',
+      message: `Savings dipped to ${formatMockCurrency(savings)}. Review spending to stay on track.`,
+      date: now.toISOString()
+    })
+  }
+
+  // Achievement notification - saved over $500 this month
+  const currentMonth = todayKey.slice(0,7)
+  const thisMonth = transactions.filter(t => t.date?.startsWith(currentMonth))
+  const monthlySavings = sumAmounts(thisMonth.filter(t => isType(t, 'income')))
+    - sumAmounts(thisMonth.filter(t => isType(t, 'expense')))
+  if (monthlySavings >= 500){
+    alerts.push({
+      id: 'achievement-500',
+      type: 'achievement',
+      message: `You saved ${formatMockCurrency(monthlySavings)} this month! 🎉`,
+      date: now.toISOString()
+    })
+  }
+
+  return alerts
+}
+
 export async function apiFetch(path, { method='GET', body, token } = {}){
   if (USE_MOCK) {
     console.log('[MOCK API]', method, path); // Debug logging
@@ -180,6 +278,11 @@ export async function apiFetch(path, { method='GET', body, token } = {}){
       }
     }
     
+    // ==================== ALERT ENDPOINTS ====================
+    if (path.startsWith('/alerts/') && method === 'GET') {
+      return { alerts: computeMockAlerts(getMockTransactions(), getMockReminders()), errors: {} }
+    }
+    
     throw new Error('Mock endpoint not implemented: '+method+' '+path)
   }
   
@@ -251,6 +354,15 @@ export const fetchTransactions = (userId, token) => {
   return apiFetch(`/transactions/${userId}`, { token: token });
 };
 
+// Keyset-paginated listing. Pass the previous response's next_cursor as params.cursor.
+// Optional filters: start_date, end_date, type, category, min_amount, max_amount, limit.
+export const fetchTransactionsPage = (userId, params = {}, token) => {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, v]) => v !== undefined && v !== null && v !== '')
+  ).toString()
+  return apiFetch(`/transactions/${userId}/page${query ? `?${query}` : ''}`, { token: token });
+};
+
 export const createTransaction = (data, token) => {
   return apiFetch('/transactions', { method: 'POST', body: JSON.stringify(data), token: token });
 };
@@ -263,6 +375,68 @@ export const deleteTransaction = (id, userId, token) => {
   return apiFetch(`/transactions/${id}?user_id=${userId}`, { method: 'DELETE', token: token });
 };
 
+// Server-side export of the user's transactions as a file Blob.
+// params: { format: 'csv' | 'ndjson', start_date, end_date, gzip }
+export const exportTransactions = async (userId, params, token) => {
+  const query = new URLSearchParams(params).toString();
+  const res = await fetch(`${BASE_URL}/transactions/${userId}/export?${query}`, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {}
+  })
+  if (!res.ok) {
+    const t = await res.text()
+    throw new Error(t || ('HTTP '+res.status))
+  }
+  return res.blob()
+};
+
+// Streams a bank export (format: 'csv' | 'ofx' | 'json') as the raw request body.
+// Resolves to { inserted, duplicates, failed, batches, errors: [{ row, error }], errors_truncated }.
+export const importTransactions = async (file, format, token) => {
+  const res = await fetch(`${BASE_URL}/transactions/import?format=${format}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': file.type || 'application/octet-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {})
+    },
+    body: file
+  })
+  if (!res.ok) {
+    const t = await res.text()
+    throw new Error(t || ('HTTP '+res.status))
+  }
+  return res.json()
+};
+
+
+// ==================== RECEIPT API FUNCTIONS  ====================
+
+// Receipts are uploaded as raw file bytes (not base64 JSON) and referenced by receipt_id.
+export const uploadReceipt = async (file, token) => {
+  const res = await fetch(BASE_URL + '/receipts', {
+    method: 'POST',
+    headers: {
+      'Content-Type': file.type || 'application/octet-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {})
+    },
+    body: file
+  })
+  if (!res.ok) {
+    const t = await res.text()
+    throw new Error(t || ('HTTP '+res.status))
+  }
+  return res.json()
+};
+
+// Downloads a receipt with the auth header and returns an object URL for <img>/<iframe>.
+export const fetchReceiptUrl = async (receiptId, token) => {
+  const res = await fetch(`${BASE_URL}/receipts/${receiptId}`, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {}
+  })
+  if (!res.ok) throw new Error('HTTP '+res.status)
+  const blob = await res.blob()
+  return { url: URL.createObjectURL(blob), type: blob.type }
+};
+
 
 // ==================== REMINDER API FUNCTIONS  ====================
 
@@ -288,6 +462,11 @@ export const fetchBudgets = (userId, token) => {
   return apiFetch(`/budgets?user_id=${userId}`, { token: token });
 };
 
+// Budgets with server-computed spent, remaining, percent_used and status ('over' | 'under')
+export const fetchBudgetUtilization = (userId, token) => {
+  return apiFetch(`/budgets/utilization?user_id=${userId}`, { token: token });
+};
+
 export const createBudget = (data, token) => {
   return apiFetch('/budgets', { method: 'POST', body: JSON.stringify(data), token: token });
 };
@@ -318,6 +497,16 @@ export const deleteGoal = (id, token) => {
   return apiFetch(`/goals/${id}`, { method: 'DELETE', token: token });
 };
 
+// Adds to a goal's saved amount on the server (safe against concurrent contributions)
+export const addGoalContribution = (id, amount, token) => {
+  return apiFetch(`/goals/${id}/contributions`, { method: 'POST', body: JSON.stringify({ amount }), token: token });
+};
+
+// Spreads an amount across all goals by deadline, then remaining amount: { goals, achieved, unallocated }
+export const distributeGoalSavings = (amount, token) => {
+  return apiFetch('/goals/distribute', { method: 'POST', body: JSON.stringify({ amount }), token: token });
+};
+
 // ==================== REPORT API FUNCTIONS  ====================
 
 export const fetchReports = (userId, token) => {
@@ -328,10 +517,86 @@ export const createReport = (data, token) => {
   return apiFetch('/reports', { method: 'POST', body: JSON.stringify(data), token: token });
 };
 
+// Server-computed monthly summary for 'YYYY-MM':
+// { income, expenses, savings, categories: {name: total}, biggest, trend }
+export const fetchMonthlyReport = (month, token) => {
+  return apiFetch(`/reports/monthly/${month}`, { token: token });
+};
+
+// Computes the monthly summary on the server and stores it as a 'monthly_summary' report
+export const saveMonthlyReport = (month, token) => {
+  return apiFetch(`/reports/monthly/${month}`, { method: 'POST', token: token });
+};
+
 export const deleteReport = (id, token) => {
   return apiFetch(`/reports/${id}`, { method: 'DELETE', token: token });
 };
 
+// ==================== ANALYTICS API FUNCTIONS  ====================
+
+// Income/expense/savings series per bucket.
+// params: { granularity: 'day' | 'week' | 'month' | 'quarter' | 'year', start_date, end_date, split: 'category', fill }
+export const fetchTimeseries = (userId, params, token) => {
+  const query = new URLSearchParams(params).toString();
+  return apiFetch(`/analytics/${userId}/timeseries?${query}`, { token: token });
+};
+
+// ==================== NOTIFICATION API FUNCTIONS  ====================
+
+// One page of stored notifications, newest first: { notifications, next_cursor, limit, unread_count }
+// params: { limit, cursor, unread }
+export const fetchNotificationsPage = (userId, params, token) => {
+  const query = new URLSearchParams(params).toString();
+  return apiFetch(`/notifications/${userId}/page?${query}`, { token: token });
+};
+
+export const fetchUnreadNotificationCount = (userId, token) => {
+  return apiFetch(`/notifications/${userId}/unread-count`, { token: token });
+};
+
+// Marks notifications read in one request: { ids: [...] } or { up_to_id: newestId }
+export const markNotificationsRead = (selection, token) => {
+  return apiFetch('/notifications/mark-read', { method: 'POST', body: JSON.stringify(selection), token: token });
+};
+
+// ==================== ALERT API FUNCTIONS  ====================
+
+// Server-computed alert set with stable ids: { alerts: [...], errors: {...} }
+export const fetchAlerts = (userId, token) => {
+  return apiFetch(`/alerts/${userId}`, { token: token });
+};
+
+// ==================== SYNC API FUNCTIONS  ====================
+
+// Rows changed since a watermark: { changes: {entity: [...]}, deleted: {entity: [ids]}, full, watermark }.
+// Omit `since` for a full snapshot; when `full` is true replace local state instead of merging.
+export const fetchSyncChanges = (since, token) => {
+  const query = since ? `?since=${encodeURIComponent(since)}` : '';
+  return apiFetch(`/sync${query}`, { token: token });
+};
+
+// ==================== EVENT STREAM  ====================
+
+// Opens the server push channel and calls onEvent({ type, entity }) for every
+// change event ('change') and when the client must catch up via /sync ('resync').
+// EventSource reconnects (resuming from Last-Event-ID) on its own. Returns a close function.
+export const openEventStream = (token, onEvent) => {
+  if (USE_MOCK || typeof EventSource === 'undefined') return () => {};
+  const source = new EventSource(`${BASE_URL}/events?token=${encodeURIComponent(token)}`);
+  source.addEventListener('change', (e) => onEvent({ type: 'change', ...JSON.parse(e.data) }));
+  source.addEventListener('resync', () => onEvent({ type: 'resync' }));
+  return () => source.close();
+};
+
+// ==================== BATCH API FUNCTIONS  ====================
+
+// Several API calls in one round trip. requests: [{ id, method, path: '/api/...', params, body }]
+// Resolves to [{ id, status, body }] in request order; check each status.
+export const batchRequests = async (requests, token) => {
+  const { responses } = await apiFetch('/batch', { method: 'POST', body: JSON.stringify({ requests }), token: token });
+  return responses;
+};
+
 // ==================== PREFERENCES API FUNCTIONS  ====================
 
 export const fetchPreferences = (userId, token) => {
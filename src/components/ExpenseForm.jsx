@@ -7,7 +7,8 @@ const defaultForm = () => ({
   category:'Food',
   amount:'',
   notes:'',
-  receipt:null, // Stores base64 data URL
+  receipt:null, // Stores base64 data URL (preview / mock mode)
+  receiptFile:null, // Raw File, uploaded as bytes to the receipt store
   receiptName:''
 })
 
@@ -39,7 +40,8 @@ export default function ExpenseForm({ onAdd }){
         // Renamed field: form.notes maps to DB 'description'
         description: form.notes, 
         
-        // Renamed field: form.receipt maps to DB 'receipt_data' (Base64 URL)
+        // Raw file for the receipt upload endpoint; the data URL is the mock-mode fallback
+        receipt_file: form.receiptFile,
         receipt_data: form.receipt 
       }
       
@@ -58,14 +60,14 @@ export default function ExpenseForm({ onAdd }){
 
   const handleReceipt = (file) => {
     if(!file){
-      setForm(f => ({ ...f, receipt: null, receiptName: '' }))
+      setForm(f => ({ ...f, receipt: null, receiptFile: null, receiptName: '' }))
       setPreview('')
       return
     }
     const reader = new FileReader()
     reader.onload = () => {
       // reader.result is the base64 data URL expected by the DB
-      setForm(f => ({ ...f, receipt: reader.result, receiptName: file.name })) 
+      setForm(f => ({ ...f, receipt: reader.result, receiptFile: file, receiptName: file.name })) 
       if(file.type.startsWith('image/')){
         setPreview(reader.result)
       } else {
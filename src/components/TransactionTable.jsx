@@ -76,10 +76,10 @@ export default function TransactionTable({ transactions = [], onDelete, onShowRe
                   {notes || '—'}
                 </td>
                 <td>
-                  {txn.receipt_data ? (
+                  {(txn.receipt_id || txn.receipt_data) ? (
                     <button 
                       className="btn btn-ghost text-xs" 
-                      onClick={() => onShowReceipt?.({ data: txn.receipt_data, title: name })}
+                      onClick={() => onShowReceipt?.({ receiptId: txn.receipt_id, data: txn.receipt_data, title: name })}
                     >
                       View
                     </button>
@@ -1,6 +1,6 @@
 import React, { createContext, useContext, useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { loginApi, signupApi, meApi } from '../api/auth'
+import { loginApi, signupApi, meApi, logoutApi } from '../api/auth'
 
 const AuthCtx = createContext()
 const SESSION_KEY = 'pfbms-session' // {token,user}
@@ -57,6 +57,8 @@ export function AuthProvider({ children }){
   }
 
   const logout = () => {
+    // Revoke the token server-side; the local session is cleared either way
+    if (!USE_MOCK && session?.token) logoutApi(session.token).catch(() => {})
     localStorage.removeItem(SESSION_KEY)
     sessionStorage.removeItem(SESSION_KEY)
     setSession(null)
@@ -1,7 +1,7 @@
 import React, { useMemo, useState, useEffect, useCallback } from 'react'
 import { useFinance } from '../context/FinanceContext'
 import { useAuth } from '../context/AuthContext' 
-import { fetchTransactions, createTransaction, deleteTransaction } from '../api/client' 
+import { fetchTransactions, createTransaction, deleteTransaction, uploadReceipt, fetchReceiptUrl, isMockMode } from '../api/client' 
 import ExpenseForm from '../components/ExpenseForm'
 import IncomeForm from '../components/IncomeForm'
 import TransactionTable from '../components/TransactionTable'
@@ -10,6 +10,15 @@ import { LineChart, Line, ResponsiveContainer, CartesianGrid, XAxis, YAxis, Tool
 const dayNames = ['Sun','Mon','Tue','Wed','Thu','Fri','Sat']
 const slotLabels = ['Morning','Afternoon','Evening','Night']
 
+// How the receipt modal shows a file: only PDFs go in an iframe (SVG is shown
+// as an <img>, where its scripts never run); anything else is a download link
+const receiptKind = (type = '') => {
+  type = type.toLowerCase()
+  if (type === 'application/pdf') return 'pdf'
+  if (type.startsWith('image/')) return 'image'
+  return 'file'
+}
+
 export default function Expenses(){
   const { formatCurrency, fromBase } = useFinance()
   const { user, token } = useAuth()
@@ -51,6 +60,13 @@ export default function Expenses(){
         return;
     }
 
+    // Upload the receipt bytes first so the transaction only carries a reference
+    let receiptId = null;
+    if (data.receipt_file && !isMockMode()) {
+      const uploaded = await uploadReceipt(data.receipt_file, token);
+      receiptId = uploaded.receipt_id;
+    }
+
     const transactionData = {
       type: 'expense',
       user_id: user.user_id,
@@ -62,7 +78,8 @@ export default function Expenses(){
       amount: Number(data.amount),
       // Mapped notes to description as per previous change
       description: data.notes || '', 
-      receipt_data: data.receipt || null,
+      receipt_id: receiptId,
+      receipt_data: receiptId ? null : (data.receipt_data || null),
     };
     
     try {
@@ -101,6 +118,24 @@ export default function Expenses(){
     }
   }, [user, token, fetchTransactionsData]);
 
+  const showReceipt = useCallback(async ({ receiptId, data, title }) => {
+    if (!receiptId) {
+      setReceiptModal({ src: data, kind: receiptKind(data.slice(5, data.indexOf(';'))), title });
+      return;
+    }
+    try {
+      const { url, type } = await fetchReceiptUrl(receiptId, token);
+      setReceiptModal({ src: url, kind: receiptKind(type), title });
+    } catch (error) {
+      console.error("Failed to load receipt:", error);
+    }
+  }, [token]);
+
+  const closeReceipt = () => {
+    if (receiptModal?.src.startsWith('blob:')) URL.revokeObjectURL(receiptModal.src);
+    setReceiptModal(null);
+  };
+
   // --- Data Deletion Function (DELETE operation) ---
   const handleDeleteTransaction = useCallback(async (transactionId) => {
     try {
@@ -236,7 +271,7 @@ export default function Expenses(){
             transactions={[...transactions.incomes, ...transactions.expenses].sort((a,b)=>new Date(b.date)-new Date(a.date))} 
             onDelete={handleDeleteTransaction} 
             formatCurrency={formatCurrency} 
-            onShowReceipt={setReceiptModal}
+            onShowReceipt={showReceipt}
           />
         </div>
         <div className="card">
@@ -329,12 +364,16 @@ export default function Expenses(){
           <div className="bg-panel border border-slate-700/60 rounded-2xl p-4 w-full max-w-lg space-y-3">
             <div className="flex items-center justify-between">
               <div className="font-semibold">Receipt — {receiptModal.title}</div>
-              <button className="btn btn-ghost text-sm" onClick={()=>setReceiptModal(null)}>Close</button>
+              <button className="btn btn-ghost text-sm" onClick={closeReceipt}>Close</button>
             </div>
-            {receiptModal.data.startsWith('data:image') ? (
-              <img src={receiptModal.data} alt="Receipt" className="rounded-xl" />
-            ) : (
-              <iframe src={receiptModal.data} title="Receipt" className="w-full h-96 rounded-xl"></iframe>
+            {receiptModal.kind === 'image' && (
+              <img src={receiptModal.src} alt="Receipt" className="rounded-xl" />
+            )}
+            {receiptModal.kind === 'pdf' && (
+              <iframe src={receiptModal.src} title="Receipt" className="w-full h-96 rounded-xl"></iframe>
+            )}
+            {receiptModal.kind === 'file' && (
+              <a href={receiptModal.src} download="receipt" className="btn btn-ghost text-sm">Download receipt</a>
             )}
           </div>
         </div>
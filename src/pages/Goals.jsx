@@ -2,7 +2,7 @@ import React, { useState, useEffect, useCallback } from 'react'
 import { useFinance } from '../context/FinanceContext'
 import { useAuth } from '../context/AuthContext'
 import { 
-  fetchGoals, createGoal, updateGoal, deleteGoal 
+  fetchGoals, createGoal, updateGoal, deleteGoal, addGoalContribution 
 } from '../api/client'
 
 function GoalCard({ goal, onEdit, onAddMoney, onDelete, formatCurrency }){
@@ -142,12 +142,7 @@ export default function Goals(){
     if (!contributeGoal || !Number(contributionAmount)) return
     
     try {
-      const newAmount = Number(contributeGoal.current_amount) + Number(contributionAmount)
-      const updateData = {
-        current_amount: newAmount
-      }
-      
-      await updateGoal(contributeGoal.goal_id, updateData, token)
+      await addGoalContribution(contributeGoal.goal_id, Number(contributionAmount), token)
       setContributeGoal(null)
       setContributionAmount('')
       await fetchGoalsData()
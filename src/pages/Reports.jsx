@@ -1,7 +1,10 @@
 import React, { useMemo, useState, useEffect, useCallback } from 'react'
 import { useFinance } from '../context/FinanceContext'
 import { useAuth } from '../context/AuthContext'
-import { fetchTransactions, createReport, fetchReports, deleteReport } from '../api/client'
+import {
+  fetchTransactions, createReport, fetchReports, deleteReport, exportTransactions,
+  fetchMonthlyReport, saveMonthlyReport as saveMonthlyReportOnServer, isMockMode
+} from '../api/client'
 import { BarChart, Bar, ResponsiveContainer, CartesianGrid, XAxis, YAxis, Tooltip, LineChart, Line } from 'recharts'
 
 const sectionTitle = 'text-lg font-semibold mb-2'
@@ -37,6 +40,7 @@ export default function Reports(){
   const [expenses, setExpenses] = useState([])
   const [isLoading, setIsLoading] = useState(true)
   const [savedReports, setSavedReports] = useState([])
+  const [serverSummary, setServerSummary] = useState(null)
 
   // --- Data Fetching Functions ---
   const fetchTransactionsData = useCallback(async () => {
@@ -68,6 +72,17 @@ export default function Reports(){
     fetchSavedReports();
   }, [fetchTransactionsData, fetchSavedReports]);
 
+  // Outside mock mode the monthly summary is aggregated by the backend
+  useEffect(() => {
+    if (isMockMode() || !user || !user.user_id) return
+    let cancelled = false
+    setServerSummary(null)
+    fetchMonthlyReport(selectedMonth, token)
+      .then(summary => { if (!cancelled) setServerSummary(summary) })
+      .catch(error => console.error('Failed to fetch monthly report:', error))
+    return () => { cancelled = true }
+  }, [user, token, selectedMonth]);
+
   const categoryData = useMemo(()=>{
     const m = {}
     for(const e of expenses){ 
@@ -107,7 +122,9 @@ export default function Reports(){
     }
   }, [incomes, expenses])
 
-  const monthlySummary = useMemo(() => {
+  const localSummary = useMemo(() => {
+    if (!isMockMode()) return { income: 0, expenses: 0, savings: 0, categories: {}, biggest: null, trend: 0 }
+
     // Helper to check if a date belongs to the selected month
     const dateMatchesMonth = (dateValue) => {
       const monthKey = getMonthKey(dateValue)
@@ -152,6 +169,8 @@ export default function Reports(){
     }
   }, [incomes, expenses, selectedMonth])
 
+  const monthlySummary = serverSummary || localSummary
+
   const monthOptions = useMemo(() => {
     const keys = new Set()
     
@@ -171,7 +190,19 @@ export default function Reports(){
     return Array.from(keys).sort().reverse()
   }, [incomes, expenses])
 
-  const exportData = (format) => {
+  const exportData = async (format) => {
+    if(format === 'csv' && !isMockMode()){
+      // The backend streams every transaction straight from the database
+      try {
+        const blob = await exportTransactions(user.user_id, { format: 'csv' }, token)
+        triggerDownload(blob, `finance-transactions-${new Date().toISOString().slice(0,10)}.csv`)
+      } catch (error) {
+        console.error('Failed to export transactions:', error)
+        setImportMessage({ text: 'Export failed ❌', type: 'error' })
+      }
+      return
+    }
+
     const payload = {
       exportedAt: new Date().toISOString(),
       incomes: incomes,
@@ -214,6 +245,14 @@ export default function Reports(){
 
   const saveMonthlyReport = async () => {
     try {
+      if (!isMockMode()) {
+        await saveMonthlyReportOnServer(selectedMonth, token)
+        await fetchSavedReports()
+        setImportMessage({ text: 'Report saved successfully ✅', type: 'success' })
+        setTimeout(() => setImportMessage(null), 3000)
+        return
+      }
+
       const reportData = {
         report_id: `report-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
         user_id: user.user_id,